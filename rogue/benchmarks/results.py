@@ -0,0 +1,76 @@
+import json
+import pathlib
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+import attr
+
+BenchmarkKey = Tuple[str, str, int]
+
+
+@attr.s(frozen=True, kw_only=True)
+class BenchmarkResult:
+    backend: str = attr.ib()
+    benchmark: str = attr.ib()
+    size: int = attr.ib()
+    number_of_entities: int = attr.ib()
+    repeat: int = attr.ib()
+    minimum: Optional[float] = attr.ib()
+    mean: Optional[float] = attr.ib()
+    maximum: Optional[float] = attr.ib()
+    error: Optional[str] = attr.ib(default=None)
+
+    @property
+    def key(self) -> BenchmarkKey:
+        return self.backend, self.benchmark, self.size
+
+
+@attr.s(frozen=True, kw_only=True)
+class BenchmarkComparison:
+    key: BenchmarkKey = attr.ib()
+    baseline: float = attr.ib()
+    current: float = attr.ib()
+
+    @property
+    def ratio(self) -> float:
+        if self.baseline == 0:
+            return float("inf")
+        return self.current / self.baseline
+
+    def is_regression(self, *, threshold: float) -> bool:
+        return self.ratio > 1 + threshold
+
+
+def save_results(*, results: List[BenchmarkResult], metadata: Dict[str, Any], output_file_name: pathlib.Path) -> None:
+    document = {"metadata": metadata, "results": [attr.asdict(result) for result in results]}
+    with open(output_file_name, "w") as output_file:
+        json.dump(document, output_file, indent=2)
+
+
+def load_results(*, input_file_name: pathlib.Path) -> List[BenchmarkResult]:
+    with open(input_file_name) as input_file:
+        document = json.load(input_file)
+    return [BenchmarkResult(**result) for result in document["results"]]
+
+
+def compare_results(
+    *, baseline_results: List[BenchmarkResult], current_results: List[BenchmarkResult]
+) -> List[BenchmarkComparison]:
+    """
+    Compare the best time of every benchmark that succeeded both in the baseline and in the current run
+    """
+
+    baseline_minimums = {result.key: result.minimum for result in baseline_results if result.minimum is not None}
+
+    comparisons: List[BenchmarkComparison] = []
+    for result in current_results:
+        baseline = baseline_minimums.get(result.key)
+        if baseline is None or result.minimum is None:
+            continue
+        comparisons.append(BenchmarkComparison(key=result.key, baseline=baseline, current=result.minimum))
+    return comparisons
@@ -0,0 +1,257 @@
+"""
+Benchmarks of the systems, the action processing and the loader over generated worlds.
+
+The ECS backend is selected on import, so the suite only measures the backend of the current process.
+Use `rogue benchmark` to run it for several backends and to compare the results against a baseline.
+"""
+
+import builtins
+import os
+import pathlib
+import random
+import tempfile
+import time
+from typing import (
+    Any,
+    Callable,
+    Generator,
+    List,
+    Optional,
+    Tuple,
+)
+
+import click
+from loguru import logger
+
+from rogue.benchmarks.results import BenchmarkResult, save_results
+from rogue.cli.game import create_game_systems
+from rogue.generic.ecs import (
+    ROGUE_ECS_BACKEND,
+    EntityComponentDatabase,
+    query,
+    process_systems,
+)
+from rogue.io.generators import (
+    compute_number_of_rooms,
+    compute_room_config_extent,
+    generate_room_config,
+    save_room_config,
+)
+from rogue.io.loaders import load_rogue_ecdb_from_input_yaml
+from rogue.components import ComponentUnion, TypeComponent
+from rogue.systems import (
+    SystemUnion,
+    process_system,
+    process_action,
+    process_actions,
+    batch_actions_of_systems,
+    MovementSystem,
+    EnemyAISystem,
+    CollisionDetectionSystem,
+)
+
+DEFAULT_WORLD_SIZES = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+DEFAULT_MAX_RENDER_SIZE = 1_000
+
+Benchmark = Callable[[], Any]
+
+
+def _time_benchmark(*, benchmark: Benchmark, repeat: int) -> Tuple[float, float, float]:
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        benchmark()
+        timings.append(time.perf_counter() - start)
+    return min(timings), sum(timings) / len(timings), max(timings)
+
+
+def _run_benchmark(
+    *, name: str, size: int, number_of_entities: int, repeat: int, create_benchmark: Callable[[], Benchmark]
+) -> BenchmarkResult:
+    logger.info(f"Running {name} on a world with {number_of_entities} entities using {ROGUE_ECS_BACKEND} ECS")
+    minimum: Optional[float] = None
+    mean: Optional[float] = None
+    maximum: Optional[float] = None
+    error: Optional[str] = None
+    try:
+        minimum, mean, maximum = _time_benchmark(benchmark=create_benchmark(), repeat=repeat)
+    except Exception as exception:  # pylint: disable=broad-except
+        # Benchmarks of optional dependencies (e.g. renderers) are reported instead of aborting the whole suite
+        error = f"{type(exception).__name__}: {exception}"
+        logger.warning(f"{name} failed with {error}")
+
+    return BenchmarkResult(
+        backend=ROGUE_ECS_BACKEND,
+        benchmark=name,
+        size=size,
+        number_of_entities=number_of_entities,
+        repeat=repeat,
+        minimum=minimum,
+        mean=mean,
+        maximum=maximum,
+        error=error,
+    )
+
+
+def _create_loader_benchmark(*, input_file_name: pathlib.Path) -> Callable[[], Benchmark]:
+    def create_benchmark() -> Benchmark:
+        return lambda: load_rogue_ecdb_from_input_yaml(input_file_name=input_file_name)
+
+    return create_benchmark
+
+
+def _create_system_benchmark(
+    *, ecdb: EntityComponentDatabase[ComponentUnion], system: SystemUnion
+) -> Callable[[], Benchmark]:
+    def create_benchmark() -> Benchmark:
+        return lambda: list(process_system(ecdb=ecdb, system=system))
+
+    return create_benchmark
+
+
+def _create_process_action_benchmark(*, ecdb: EntityComponentDatabase[ComponentUnion]) -> Callable[[], Benchmark]:
+    def create_benchmark() -> Benchmark:
+        actions = list(process_system(ecdb=ecdb, system=MovementSystem.create()))
+
+        def benchmark() -> None:
+            new_ecdb = ecdb
+            for action in actions:
+                new_ecdb = process_action(new_ecdb, action)
+
+        return benchmark
+
+    return create_benchmark
+
+
+def _create_process_actions_benchmark(*, ecdb: EntityComponentDatabase[ComponentUnion]) -> Callable[[], Benchmark]:
+    def create_benchmark() -> Benchmark:
+        actions = list(process_system(ecdb=ecdb, system=MovementSystem.create()))
+        return lambda: process_actions(ecdb=ecdb, actions=actions)
+
+    return create_benchmark
+
+
+def _create_tick_benchmark(*, ecdb: EntityComponentDatabase[ComponentUnion]) -> Callable[[], Benchmark]:
+    def create_benchmark() -> Benchmark:
+        systems = create_game_systems(hero_control_system=None)
+        return lambda: process_systems(
+            ecdb=ecdb,
+            systems=systems,
+            process_system=batch_actions_of_systems(process_system),
+            process_action=process_action,
+        )
+
+    return create_benchmark
+
+
+def _create_pygcurse_render_benchmark(
+    *, ecdb: EntityComponentDatabase[ComponentUnion], height: int, width: int
+) -> Callable[[], Benchmark]:
+    def create_benchmark() -> Benchmark:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        from rogue.systems import PygcurseRenderSystem  # pylint: disable=import-outside-toplevel
+
+        render_system = PygcurseRenderSystem.create_from_height_and_width(height=height, width=width)
+        return lambda: render_system(ecdb=ecdb)
+
+    return create_benchmark
+
+
+def _create_panda3d_render_benchmark(
+    *, ecdb: EntityComponentDatabase[ComponentUnion], height: int, width: int
+) -> Callable[[], Benchmark]:
+    def create_benchmark() -> Benchmark:
+        from panda3d.core import loadPrcFileData  # pylint: disable=import-outside-toplevel
+        from rogue.systems import Panda3dRenderSystem  # pylint: disable=import-outside-toplevel
+
+        loadPrcFileData("", "window-type offscreen")
+        loadPrcFileData("", "audio-library-name null")
+
+        # Panda3D allows a single ShowBase per process, destroy the one created for the previous world size
+        existing_base = getattr(builtins, "base", None)
+        if existing_base is not None:
+            existing_base.destroy()
+
+        render_system = Panda3dRenderSystem.create_from_height_and_width(height=height, width=width)
+        return lambda: render_system(ecdb=ecdb)
+
+    return create_benchmark
+
+
+def _count_entities(*, ecdb: EntityComponentDatabase[ComponentUnion]) -> int:
+    return len(list(query(ecdb=ecdb, component_types=[TypeComponent])))
+
+
+def run_benchmark_suite(
+    *, sizes: List[int], repeat: int, seed: int, max_render_size: int, working_directory: pathlib.Path
+) -> Generator[BenchmarkResult, None, None]:
+
+    for size in sizes:
+        room_config = generate_room_config(number_of_rooms=compute_number_of_rooms(number_of_entities=size), seed=seed)
+        input_file_name = working_directory / f"world_{size}.yaml"
+        save_room_config(room_config=room_config, output_file_name=input_file_name)
+
+        ecdb = load_rogue_ecdb_from_input_yaml(input_file_name=input_file_name)
+        number_of_entities = _count_entities(ecdb=ecdb)
+
+        benchmarks: List[Tuple[str, Callable[[], Benchmark]]] = [
+            ("loader", _create_loader_benchmark(input_file_name=input_file_name)),
+            ("movement_system", _create_system_benchmark(ecdb=ecdb, system=MovementSystem.create())),
+            ("enemy_ai_system", _create_system_benchmark(ecdb=ecdb, system=EnemyAISystem.create())),
+            (
+                "enemy_ai_system_batched",
+                _create_system_benchmark(ecdb=ecdb, system=EnemyAISystem.create(batched=True, seed=seed)),
+            ),
+            (
+                "collision_detection_system",
+                _create_system_benchmark(ecdb=ecdb, system=CollisionDetectionSystem.create()),
+            ),
+            ("process_action", _create_process_action_benchmark(ecdb=ecdb)),
+            ("process_actions", _create_process_actions_benchmark(ecdb=ecdb)),
+            ("tick", _create_tick_benchmark(ecdb=ecdb)),
+        ]
+        if size <= max_render_size:
+            height, width = compute_room_config_extent(room_config)
+            benchmarks.extend(
+                [
+                    (
+                        "pygcurse_render_system",
+                        _create_pygcurse_render_benchmark(ecdb=ecdb, height=height, width=width),
+                    ),
+                    ("panda3d_render_system", _create_panda3d_render_benchmark(ecdb=ecdb, height=height, width=width)),
+                ]
+            )
+
+        for name, create_benchmark in benchmarks:
+            random.seed(seed)
+            yield _run_benchmark(
+                name=name,
+                size=size,
+                number_of_entities=number_of_entities,
+                repeat=repeat,
+                create_benchmark=create_benchmark,
+            )
+
+
+@click.command()
+@click.option("--sizes", type=str, default=",".join(str(size) for size in DEFAULT_WORLD_SIZES))
+@click.option("--repeat", type=int, default=3)
+@click.option("--seed", type=int, default=0)
+@click.option("--max_render_size", type=int, default=DEFAULT_MAX_RENDER_SIZE)
+@click.option("--output", type=pathlib.Path, required=True)
+def main(*, sizes: str, repeat: int, seed: int, max_render_size: int, output: pathlib.Path) -> None:
+    with tempfile.TemporaryDirectory() as working_directory:
+        results = list(
+            run_benchmark_suite(
+                sizes=[int(size) for size in sizes.split(",")],
+                repeat=repeat,
+                seed=seed,
+                max_render_size=max_render_size,
+                working_directory=pathlib.Path(working_directory),
+            )
+        )
+    save_results(results=results, metadata={"backend": ROGUE_ECS_BACKEND, "seed": seed}, output_file_name=output)
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=missing-kwoa
@@ -0,0 +1,140 @@
+"""
+Systems and game loop shared by the commands, the interactive ones only differ by their hero control and render systems.
+"""
+
+from typing import Callable, Optional
+
+from rogue.generic.ecs import (
+    EntityComponentDatabase,
+    Systems,
+    create_systems,
+    add_system,
+    process_systems,
+)
+from rogue.components import ComponentUnion
+from rogue.systems import (
+    SystemUnion,
+    process_system,
+    process_action,
+    MovementSystem,
+    EnemyAISystem,
+    CollisionDetectionSystem,
+)
+from rogue.systems.common.changes import ChangeTracker
+from rogue.systems.common.system import ProcessSystem, ProcessAction, batch_actions_of_systems
+from rogue.systems.common.instrumentation import SystemsProfiler
+from rogue.systems.common.coalescing import ActionCoalescer
+from rogue.systems.common.scheduling import SystemScheduler
+from rogue.exceptions import QuitGameException
+from rogue.cli.game_loop import FixedTimestepLoop
+
+Render = Callable[[EntityComponentDatabase[ComponentUnion], EntityComponentDatabase[ComponentUnion], float], None]
+
+
+def create_game_systems(
+    *, hero_control_system: Optional[SystemUnion], seed: Optional[int] = None
+) -> Systems[SystemUnion]:
+    """
+    The systems of a game, without a hero control system for the headless runs
+    """
+
+    systems: Systems[SystemUnion] = create_systems()
+    if hero_control_system is not None:
+        systems = add_system(systems=systems, priority=0, system=hero_control_system)
+    systems = add_system(systems=systems, priority=0, system=EnemyAISystem.create(batched=True, seed=seed))
+    systems = add_system(systems=systems, priority=1, system=CollisionDetectionSystem.create())
+    systems = add_system(systems=systems, priority=2, system=MovementSystem.create())
+    return systems
+
+
+class GameTick:
+    """
+    Process the systems once per call. The actions of every system are coalesced and committed in a single
+    transaction, the systems of a priority run concurrently on `threads` threads (in order if 0) and are profiled if
+    `profile`. `wrap_process_action` wraps the processing of the committed actions, e.g. to record them.
+    """
+
+    def __init__(
+        self,
+        *,
+        systems: Systems[SystemUnion],
+        threads: int,
+        profile: bool,
+        wrap_process_action: Optional[Callable[[ProcessAction], ProcessAction]] = None,
+    ):
+        self.systems = systems
+        self.coalescer = ActionCoalescer()
+        # Run the systems of the same priority that don't conflict concurrently
+        self.scheduler = SystemScheduler(number_of_threads=threads) if threads > 0 else None
+        self.profiler: Optional[SystemsProfiler] = None
+        tick_process_system: ProcessSystem = process_system
+        tick_process_action: ProcessAction = process_action
+        if profile:
+            self.profiler = SystemsProfiler()
+            self.profiler.log_summary_at_exit()
+            self.coalescer.log_summary_at_exit()
+            tick_process_system, tick_process_action = self.profiler.wrap(
+                process_system=process_system, process_action=process_action
+            )
+        self._process_system = batch_actions_of_systems(self.coalescer.wrap_process_system(tick_process_system))
+        self._process_action = (
+            wrap_process_action(tick_process_action) if wrap_process_action is not None else tick_process_action
+        )
+
+    def __call__(self, ecdb: EntityComponentDatabase[ComponentUnion]) -> EntityComponentDatabase[ComponentUnion]:
+        try:
+            if self.scheduler is not None:
+                return self.scheduler.process_systems(
+                    ecdb=ecdb,
+                    systems=self.systems,
+                    process_system=self._process_system,
+                    process_action=self._process_action,
+                )
+            return process_systems(
+                ecdb=ecdb,
+                systems=self.systems,
+                process_system=self._process_system,
+                process_action=self._process_action,
+            )
+        finally:
+            if self.profiler is not None:
+                self.profiler.end_tick()
+
+    def shutdown(self) -> None:
+        if self.scheduler is not None:
+            self.scheduler.shutdown()
+
+
+def run_game(
+    *,
+    ecdb: EntityComponentDatabase[ComponentUnion],
+    systems: Systems[SystemUnion],
+    render: Render,
+    tick_rate: float,
+    fps: float,
+    threads: int,
+    profile: bool,
+    change_tracker: Optional[ChangeTracker] = None,
+    should_stop: Callable[[], bool] = lambda: False,
+) -> None:
+    """
+    Run the game loop until the game is quit or `should_stop` returns True.
+    The actions of every tick are recorded by `change_tracker`, if any, so that the render system redraws only them.
+    """
+
+    tick = GameTick(
+        systems=systems,
+        threads=threads,
+        profile=profile,
+        wrap_process_action=change_tracker.wrap_process_action if change_tracker is not None else None,
+    )
+    loop: FixedTimestepLoop[EntityComponentDatabase[ComponentUnion]] = FixedTimestepLoop(tick_rate=tick_rate, fps=fps)
+    if profile:
+        loop.log_summary_at_exit()
+
+    try:
+        loop.run(state=ecdb, tick=tick, render=render, should_stop=should_stop)
+    except QuitGameException:
+        return
+    finally:
+        tick.shutdown()
@@ -0,0 +1,150 @@
+"""
+Fixed timestep game loop.
+
+The simulation advances in ticks of a fixed duration while rendering runs at its own target frame rate.
+When the simulation falls behind, it catches up with up to `max_ticks_per_frame` ticks before the next frame,
+frames whose deadline passed meanwhile are skipped. The renderer receives the last two states and how far the clock is
+between them, so it can interpolate.
+"""
+
+import atexit
+import math
+import statistics
+import time
+from collections import deque
+from typing import (
+    Callable,
+    Deque,
+    Generic,
+    TypeVar,
+)
+
+from loguru import logger
+
+from rogue.exceptions import IgnoreTimeStepException
+
+State = TypeVar("State")
+
+DEFAULT_TICK_RATE = 20.0
+DEFAULT_FPS = 60.0
+DEFAULT_MAX_TICKS_PER_FRAME = 5
+DEFAULT_WINDOW_SIZE = 1000
+
+
+class LoopStatistics:
+    def __init__(self, *, window_size: int = DEFAULT_WINDOW_SIZE):
+        self.number_of_ticks = 0
+        self.number_of_ignored_ticks = 0
+        self.number_of_late_ticks = 0
+        self.number_of_dropped_ticks = 0
+        self.number_of_frames = 0
+        self.number_of_skipped_frames = 0
+        self.frame_intervals: Deque[float] = deque(maxlen=window_size)
+
+    @property
+    def frame_interval_jitter(self) -> float:
+        """
+        Standard deviation of the time between consecutive frames
+        """
+
+        if len(self.frame_intervals) < 2:
+            return 0.0
+        return statistics.pstdev(self.frame_intervals)
+
+    def summary(self) -> str:
+        mean_frame_interval = statistics.fmean(self.frame_intervals) if len(self.frame_intervals) > 0 else 0.0
+        return (
+            f"Ticks: {self.number_of_ticks} ({self.number_of_ignored_ticks} ignored, "
+            f"{self.number_of_late_ticks} late, {self.number_of_dropped_ticks} dropped), "
+            f"frames: {self.number_of_frames} ({self.number_of_skipped_frames} skipped), "
+            f"frame interval: {mean_frame_interval * 1e3:.3f} ms mean, {self.frame_interval_jitter * 1e3:.3f} ms jitter"
+        )
+
+
+class FixedTimestepLoop(Generic[State]):
+    """
+    A tick is late when it starts more than a tick interval after its deadline.
+    Ticks that can't be caught up within `max_ticks_per_frame` are dropped.
+    """
+
+    def __init__(
+        self,
+        *,
+        tick_rate: float = DEFAULT_TICK_RATE,
+        fps: float = DEFAULT_FPS,
+        max_ticks_per_frame: int = DEFAULT_MAX_TICKS_PER_FRAME,
+        clock: Callable[[], float] = time.perf_counter,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if tick_rate <= 0 or fps <= 0:
+            raise ValueError("tick_rate and fps have to be positive")
+        self.tick_interval = 1.0 / tick_rate
+        self.frame_interval = 1.0 / fps
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self.clock = clock
+        self.sleep = sleep
+        self.statistics = LoopStatistics()
+
+    def log_summary_at_exit(self) -> None:
+        atexit.register(lambda: logger.info(self.statistics.summary()))
+
+    def _run_tick(self, *, state: State, tick: Callable[[State], State]) -> State:
+        self.statistics.number_of_ticks += 1
+        try:
+            return tick(state)
+        except IgnoreTimeStepException:
+            self.statistics.number_of_ignored_ticks += 1
+            return state
+
+    def run(
+        self,
+        *,
+        state: State,
+        tick: Callable[[State], State],
+        render: Callable[[State, State, float], None],
+        should_stop: Callable[[], bool] = lambda: False,
+    ) -> State:
+        """
+        Run until `tick` raises (QuitGameException ends the game) or `should_stop` returns True.
+        `render` is called with the previous state, the current state and the fraction of the tick interval
+        that passed since the current state was computed.
+        """
+
+        previous_state = state
+        start_time = self.clock()
+        next_tick_time = start_time
+        next_frame_time = start_time
+        last_frame_time = math.nan
+
+        while not should_stop():
+            now = self.clock()
+
+            number_of_ticks = 0
+            while now >= next_tick_time and number_of_ticks < self.max_ticks_per_frame:
+                if now - next_tick_time > self.tick_interval:
+                    self.statistics.number_of_late_ticks += 1
+                previous_state, state = state, self._run_tick(state=state, tick=tick)
+                next_tick_time += self.tick_interval
+                number_of_ticks += 1
+                now = self.clock()
+
+            if now >= next_tick_time:
+                number_of_dropped_ticks = math.floor((now - next_tick_time) / self.tick_interval) + 1
+                self.statistics.number_of_dropped_ticks += number_of_dropped_ticks
+                next_tick_time += number_of_dropped_ticks * self.tick_interval
+
+            if now >= next_frame_time:
+                alpha = min(max(1.0 - (next_tick_time - now) / self.tick_interval, 0.0), 1.0)
+                render(previous_state, state, alpha)
+                self.statistics.number_of_frames += 1
+                if not math.isnan(last_frame_time):
+                    self.statistics.frame_intervals.append(now - last_frame_time)
+                last_frame_time = now
+
+                number_of_skipped_frames = math.floor((now - next_frame_time) / self.frame_interval)
+                self.statistics.number_of_skipped_frames += number_of_skipped_frames
+                next_frame_time += (number_of_skipped_frames + 1) * self.frame_interval
+
+            self.sleep(max(0.0, min(next_tick_time, next_frame_time) - self.clock()))
+
+        return state
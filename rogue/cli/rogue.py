@@ -1,10 +1,24 @@
-from typing import Any
+from typing import Any, Optional, Tuple
+import os
 import pathlib
+import sys
 
 import click
 
 from rogue.cli.rogue_pygcurse import rogue_pygcurse
 from rogue.cli.rogue_panda3d import rogue_panda3d
+from rogue.cli.rogue_simulate import rogue_simulate
+from rogue.cli.rogue_replay import rogue_replay
+from rogue.cli.rogue_benchmark import rogue_benchmark
+from rogue.cli.rogue_batch import rogue_batch
+from rogue.cli.game_loop import DEFAULT_TICK_RATE, DEFAULT_FPS
+from rogue.simulation.world import DEFAULT_MAX_EPISODE_TICKS
+from rogue.io.action_log import DEFAULT_KEYFRAME_INTERVAL
+from rogue.benchmarks.suite import DEFAULT_WORLD_SIZES, DEFAULT_MAX_RENDER_SIZE
+from rogue.io.generators import compute_number_of_rooms, generate_room_config, save_room_config
+from rogue.io.level_cache import DEFAULT_LEVEL_CACHE_DIRECTORY
+
+LEVEL_CACHE_HELP = f"Load the level from the compiled levels in {DEFAULT_LEVEL_CACHE_DIRECTORY} and fill it on a miss"
 
 
 @click.group("rogue")
@@ -16,6 +30,12 @@ def rogue() -> None:
 @click.argument("input_file_name", type=pathlib.Path)
 @click.option("--window_height", type=int, default=50)
 @click.option("--window_width", type=int, default=80)
+@click.option("--tick_rate", type=float, default=DEFAULT_TICK_RATE, help="Simulation ticks per second")
+@click.option("--fps", type=float, default=DEFAULT_FPS, help="Target rendered frames per second")
+@click.option("--threads", type=int, default=1, help="Threads for the systems of a priority, 0 runs them in order")
+@click.option("--profile", is_flag=True, help="Record per-system timings and print a summary on exit")
+@click.option("--seed", type=int, default=None, help="Seed of the enemies, random by default")
+@click.option("--level_cache/--no_level_cache", "use_level_cache", default=True, help=LEVEL_CACHE_HELP)
 def pygcurse(**kwargs: Any) -> None:
     rogue_pygcurse(**kwargs)
 
@@ -24,5 +44,132 @@ def pygcurse(**kwargs: Any) -> None:
 @click.argument("input_file_name", type=pathlib.Path)
 @click.option("--height", type=int, default=50)
 @click.option("--width", type=int, default=80)
+@click.option("--tick_rate", type=float, default=DEFAULT_TICK_RATE, help="Simulation ticks per second")
+@click.option("--fps", type=float, default=DEFAULT_FPS, help="Target rendered frames per second")
+@click.option("--threads", type=int, default=1, help="Threads for the systems of a priority, 0 runs them in order")
+@click.option("--interpolate", is_flag=True, help="Interpolate the models between the last two states")
+@click.option("--profile", is_flag=True, help="Record per-system timings and print a summary on exit")
+@click.option("--seed", type=int, default=None, help="Seed of the enemies, random by default")
+@click.option("--level_cache/--no_level_cache", "use_level_cache", default=True, help=LEVEL_CACHE_HELP)
 def panda3d(**kwargs: Any) -> None:
     rogue_panda3d(**kwargs)
+
+
+@rogue.command()
+@click.argument("input_file_name", type=pathlib.Path)
+@click.option("--height", type=int, default=50)
+@click.option("--width", type=int, default=80)
+@click.option("--tick_rate", type=float, default=DEFAULT_TICK_RATE, help="Simulation ticks per second")
+@click.option("--fps", type=float, default=DEFAULT_FPS, help="Target rendered frames per second")
+@click.option("--threads", type=int, default=1, help="Threads for the systems of a priority, 0 runs them in order")
+@click.option("--profile", is_flag=True, help="Record per-system timings and print a summary on exit")
+@click.option("--seed", type=int, default=None, help="Seed of the enemies, random by default")
+@click.option("--level_cache/--no_level_cache", "use_level_cache", default=True, help=LEVEL_CACHE_HELP)
+def terminal(**kwargs: Any) -> None:
+    # termios and tty are only available on Unix
+    from rogue.cli.rogue_terminal import rogue_terminal  # pylint: disable=import-outside-toplevel
+
+    rogue_terminal(**kwargs)
+
+
+@rogue.command()
+@click.argument("input_file_name", type=pathlib.Path)
+@click.option("--ticks", type=int, default=1000)
+@click.option("--seed", type=int, default=0)
+@click.option("--threads", type=int, default=0, help="Threads for the systems of a priority, 0 runs them in order")
+@click.option("--profile", is_flag=True, help="Record per-system timings and print a summary on exit")
+@click.option("--record", type=pathlib.Path, default=None, help="Write the actions of every tick to an action log")
+@click.option("--keyframe_interval", type=int, default=DEFAULT_KEYFRAME_INTERVAL, help="Ticks between keyframes")
+@click.option("--level_cache/--no_level_cache", "use_level_cache", default=True, help=LEVEL_CACHE_HELP)
+def simulate(**kwargs: Any) -> None:
+    report = rogue_simulate(**kwargs)
+    click.echo(f"Ticks:        {report.ticks} ({report.skipped_ticks} skipped)")
+    click.echo(f"Total time:   {report.total_time:.3f} s")
+    click.echo(f"Ticks/sec:    {report.ticks_per_second:.1f}")
+    for percentile, latency in report.latency_percentiles.items():
+        click.echo(f"Latency p{percentile}:  {latency * 1e3:.3f} ms")
+    click.echo(f"Actions:      {report.number_of_actions} ({report.number_of_eliminated_actions} eliminated)")
+    for name, checksum in report.checksums.items():
+        click.echo(f"Checksum {name}: {checksum}")
+
+
+@rogue.command()
+@click.argument("log_file_name", type=pathlib.Path)
+@click.option("--tick", type=int, default=None, help="Tick to seek to, the end of the log by default")
+def replay(**kwargs: Any) -> None:
+    report = rogue_replay(**kwargs)
+    click.echo(f"Tick:         {report.tick} of {report.number_of_ticks}")
+    click.echo(f"Seek time:    {report.seek_time:.3f} s")
+    for name, checksum in report.checksums.items():
+        click.echo(f"Checksum {name}: {checksum}")
+
+
+@rogue.command()
+@click.argument("input_file_name", type=pathlib.Path)
+@click.option("--worlds", type=int, default=64)
+@click.option("--processes", type=int, default=os.cpu_count() or 1, help="Worker processes, 0 steps the worlds here")
+@click.option("--steps", type=int, default=1000)
+@click.option("--seed", type=int, default=0)
+@click.option("--max_episode_ticks", type=int, default=DEFAULT_MAX_EPISODE_TICKS)
+def batch(**kwargs: Any) -> None:
+    report = rogue_batch(**kwargs)
+    click.echo(f"World steps:  {report.steps * report.number_of_worlds}")
+    click.echo(f"Total time:   {report.total_time:.3f} s")
+    click.echo(f"Steps/sec:    {report.world_steps_per_second:.1f}")
+    click.echo(f"Episodes:     {len(report.episode_returns)}")
+    if len(report.episode_returns) > 0:
+        click.echo(f"Mean return:  {sum(report.episode_returns) / len(report.episode_returns):.2f}")
+
+
+@rogue.command()
+@click.argument("output_file_name", type=pathlib.Path)
+@click.option("--number_of_entities", type=int, default=1000)
+@click.option("--seed", type=int, default=0)
+def generate(*, output_file_name: pathlib.Path, number_of_entities: int, seed: int) -> None:
+    number_of_rooms = compute_number_of_rooms(number_of_entities=number_of_entities)
+    room_config = generate_room_config(number_of_rooms=number_of_rooms, seed=seed)
+    save_room_config(room_config=room_config, output_file_name=output_file_name)
+
+
+@rogue.command()
+@click.option("--backend", "backends", type=click.Choice(["immutable", "mutable", "columnar"]), multiple=True)
+@click.option("--sizes", type=str, default=",".join(str(size) for size in DEFAULT_WORLD_SIZES))
+@click.option("--repeat", type=int, default=3)
+@click.option("--seed", type=int, default=0)
+@click.option("--max_render_size", type=int, default=DEFAULT_MAX_RENDER_SIZE)
+@click.option("--output", type=pathlib.Path, default=pathlib.Path("benchmark_results.json"))
+@click.option("--baseline", type=pathlib.Path, default=None)
+@click.option("--threshold", type=float, default=0.1)
+def benchmark(
+    *,
+    backends: Tuple[str, ...],
+    sizes: str,
+    repeat: int,
+    seed: int,
+    max_render_size: int,
+    output: pathlib.Path,
+    baseline: Optional[pathlib.Path],
+    threshold: float,
+) -> None:
+    comparisons = rogue_benchmark(
+        backends=list(backends) or ["immutable", "mutable"],
+        sizes=sizes,
+        repeat=repeat,
+        seed=seed,
+        max_render_size=max_render_size,
+        output=output,
+        baseline=baseline,
+    )
+
+    regressions = 0
+    for comparison in comparisons:
+        backend, name, size = comparison.key
+        is_regression = comparison.is_regression(threshold=threshold)
+        regressions += int(is_regression)
+        click.echo(
+            f"{backend:>10} {name:>28} {size:>8}: {comparison.baseline * 1e3:10.3f} ms -> "
+            f"{comparison.current * 1e3:10.3f} ms ({comparison.ratio:5.2f}x){' REGRESSION' if is_regression else ''}"
+        )
+    if regressions > 0:
+        click.echo(f"{regressions} benchmark(s) regressed by more than {threshold:.0%}")
+        sys.exit(1)
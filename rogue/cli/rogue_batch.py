@@ -0,0 +1,63 @@
+from typing import List
+
+import pathlib
+import time
+
+import attr
+import numpy as np
+from loguru import logger
+
+from rogue.io.loaders import load_room_config
+from rogue.simulation import BatchSimulation
+from rogue.types import HeroCommandEnum
+
+
+@attr.s(frozen=True, kw_only=True)
+class BatchSimulationReport:
+    steps: int = attr.ib()
+    number_of_worlds: int = attr.ib()
+    total_time: float = attr.ib()
+    episode_returns: List[float] = attr.ib()
+
+    @property
+    def world_steps_per_second(self) -> float:
+        if self.total_time == 0:
+            return float("inf")
+        return self.steps * self.number_of_worlds / self.total_time
+
+
+def rogue_batch(
+    *,
+    input_file_name: pathlib.Path,
+    worlds: int,
+    processes: int,
+    steps: int,
+    seed: int,
+    max_episode_ticks: int,
+) -> BatchSimulationReport:
+    """
+    Step `worlds` copies of the level with heroes following uniformly random commands
+    """
+
+    room_config = load_room_config(input_file_name=input_file_name)
+    logger.info(f"Simulating {worlds} worlds of {input_file_name} using {processes} processes")
+
+    rng = np.random.default_rng(seed)
+    episode_returns: List[float] = []
+    with BatchSimulation(
+        room_config=room_config,
+        number_of_worlds=worlds,
+        number_of_processes=processes,
+        seed=seed,
+        max_episode_ticks=max_episode_ticks,
+    ) as batch_simulation:
+        start = time.perf_counter()
+        for _ in range(steps):
+            commands = rng.integers(0, len(HeroCommandEnum), size=worlds)
+            result = batch_simulation.step(commands=commands)
+            episode_returns.extend(result.episode_returns[result.dones].tolist())
+        total_time = time.perf_counter() - start
+
+    return BatchSimulationReport(
+        steps=steps, number_of_worlds=worlds, total_time=total_time, episode_returns=episode_returns
+    )
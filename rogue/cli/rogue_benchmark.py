@@ -0,0 +1,79 @@
+import os
+import pathlib
+import platform
+import subprocess
+import sys
+import tempfile
+from typing import (
+    List,
+    Optional,
+)
+
+from loguru import logger
+
+from rogue.benchmarks.results import (
+    BenchmarkComparison,
+    BenchmarkResult,
+    compare_results,
+    load_results,
+    save_results,
+)
+
+
+def _run_backend_suite(
+    *, backend: str, sizes: str, repeat: int, seed: int, max_render_size: int, working_directory: pathlib.Path
+) -> List[BenchmarkResult]:
+    # The backend is chosen when rogue.generic.ecs is imported, so every backend runs in its own interpreter
+    output_file_name = working_directory / f"{backend}.json"
+    command = [
+        sys.executable,
+        "-m",
+        "rogue.benchmarks.suite",
+        f"--sizes={sizes}",
+        f"--repeat={repeat}",
+        f"--seed={seed}",
+        f"--max_render_size={max_render_size}",
+        f"--output={output_file_name}",
+    ]
+    logger.info(f"Running benchmarks using {backend} ECS")
+    subprocess.run(command, env={**os.environ, "ROGUE_ECS": backend}, stdout=subprocess.DEVNULL, check=True)
+    return load_results(input_file_name=output_file_name)
+
+
+def rogue_benchmark(
+    *,
+    backends: List[str],
+    sizes: str,
+    repeat: int,
+    seed: int,
+    max_render_size: int,
+    output: pathlib.Path,
+    baseline: Optional[pathlib.Path],
+) -> List[BenchmarkComparison]:
+
+    results: List[BenchmarkResult] = []
+    with tempfile.TemporaryDirectory() as working_directory:
+        for backend in backends:
+            results.extend(
+                _run_backend_suite(
+                    backend=backend,
+                    sizes=sizes,
+                    repeat=repeat,
+                    seed=seed,
+                    max_render_size=max_render_size,
+                    working_directory=pathlib.Path(working_directory),
+                )
+            )
+
+    metadata = {
+        "backends": backends,
+        "seed": seed,
+        "repeat": repeat,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+    save_results(results=results, metadata=metadata, output_file_name=output)
+
+    if baseline is None:
+        return []
+    return compare_results(baseline_results=load_results(input_file_name=baseline), current_results=results)
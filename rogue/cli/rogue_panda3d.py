@@ -1,48 +1,73 @@
-from typing import Tuple
+from typing import Optional, Tuple
 
 import pathlib
 
 from rogue.io.loaders import load_rogue_ecdb_from_input_yaml
-from rogue.generic.ecs import Systems, create_systems, add_system, process_systems
+from rogue.io.level_cache import LevelCache
+from rogue.generic.ecs import (
+    EntityComponentDatabase,
+    Systems,
+)
+from rogue.components import ComponentUnion
 from rogue.systems import (
     SystemUnion,
-    process_system,
-    process_action,
-    MovementSystem,
-    EnemyAISystem,
     PynputHeroControlSystem,
-    CollisionDetectionSystem,
     Panda3dRenderSystem,
 )
-from rogue.exceptions import QuitGameException, IgnoreTimeStepException
+from rogue.cli.game import create_game_systems, run_game
 
 
-def create_rogue_systems(*, height: int, width: int) -> Tuple[Systems[SystemUnion], Panda3dRenderSystem]:
+def create_rogue_systems(
+    *, height: int, width: int, seed: Optional[int] = None
+) -> Tuple[Systems[SystemUnion], PynputHeroControlSystem, Panda3dRenderSystem]:
 
-    systems: Systems[SystemUnion] = create_systems()
-    systems = add_system(systems=systems, priority=0, system=PynputHeroControlSystem.create())
-    systems = add_system(systems=systems, priority=0, system=EnemyAISystem.create())
-    systems = add_system(systems=systems, priority=1, system=CollisionDetectionSystem.create())
-    systems = add_system(systems=systems, priority=2, system=MovementSystem.create())
-    render_system = Panda3dRenderSystem.create_from_height_and_width(height=height, width=width)
-    systems = add_system(systems=systems, priority=3, system=render_system)
-    return systems, render_system
+    hero_control_system = PynputHeroControlSystem.create(timeout=0.0)
+    systems = create_game_systems(hero_control_system=hero_control_system, seed=seed)
+    render_system = Panda3dRenderSystem.create_from_height_and_width(height=height, width=width, track_changes=True)
+    return systems, hero_control_system, render_system
 
 
-def rogue_panda3d(*, input_file_name: pathlib.Path, height: int, width: int) -> None:
+def rogue_panda3d(
+    *,
+    input_file_name: pathlib.Path,
+    height: int,
+    width: int,
+    tick_rate: float,
+    fps: float,
+    threads: int,
+    interpolate: bool,
+    profile: bool,
+    seed: Optional[int] = None,
+    use_level_cache: bool = False,
+) -> None:
 
-    ecdb = load_rogue_ecdb_from_input_yaml(input_file_name=input_file_name)
-    systems, render_system = create_rogue_systems(height=height, width=width)
+    ecdb = load_rogue_ecdb_from_input_yaml(
+        input_file_name=input_file_name, level_cache=LevelCache() if use_level_cache else None
+    )
+    systems, hero_control_system, render_system = create_rogue_systems(height=height, width=width, seed=seed)
+    if profile:
+        render_system.app.model_pool.log_summary_at_exit()
 
-    # Render the initial state
-    render_system(ecdb=ecdb)
+    def render(
+        previous_ecdb: EntityComponentDatabase[ComponentUnion],
+        ecdb: EntityComponentDatabase[ComponentUnion],
+        alpha: float,
+    ) -> None:
+        if interpolate:
+            render_system.render_interpolated(previous_ecdb=previous_ecdb, ecdb=ecdb, alpha=alpha)
+        else:
+            render_system(ecdb=ecdb)
 
-    while True:
-        try:
-            ecdb = process_systems(
-                ecdb=ecdb, systems=systems, process_system=process_system, process_action=process_action
-            )
-        except QuitGameException:
-            return
-        except IgnoreTimeStepException:
-            continue
+    with hero_control_system.listener:
+        # Render the initial state
+        render_system(ecdb=ecdb)
+        run_game(
+            ecdb=ecdb,
+            systems=systems,
+            render=render,
+            tick_rate=tick_rate,
+            fps=fps,
+            threads=threads,
+            profile=profile,
+            change_tracker=render_system.change_tracker,
+        )
@@ -0,0 +1,32 @@
+from typing import Dict, Optional
+
+import pathlib
+import time
+
+import attr
+
+from rogue.io.action_log import ActionLogReplayer
+from rogue.io.checksums import compute_ecdb_checksums
+
+
+@attr.s(frozen=True, kw_only=True)
+class ReplayReport:
+    tick: int = attr.ib()
+    number_of_ticks: int = attr.ib()
+    seek_time: float = attr.ib()
+    checksums: Dict[str, str] = attr.ib()
+
+
+def rogue_replay(*, log_file_name: pathlib.Path, tick: Optional[int]) -> ReplayReport:
+
+    with ActionLogReplayer(input_file_name=log_file_name) as replayer:
+        tick = replayer.number_of_ticks if tick is None else tick
+        start = time.perf_counter()
+        ecdb = replayer.seek(tick=tick)
+        seek_time = time.perf_counter() - start
+        return ReplayReport(
+            tick=tick,
+            number_of_ticks=replayer.number_of_ticks,
+            seek_time=seek_time,
+            checksums=compute_ecdb_checksums(ecdb=ecdb),
+        )
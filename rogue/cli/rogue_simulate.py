@@ -0,0 +1,107 @@
+from typing import Dict, List, Optional
+
+import contextlib
+import pathlib
+import random
+import time
+
+import attr
+
+from rogue.io.loaders import load_rogue_ecdb_from_input_yaml
+from rogue.io.level_cache import LevelCache
+from rogue.io.checksums import compute_ecdb_checksums
+from rogue.io.action_log import DEFAULT_KEYFRAME_INTERVAL, ActionLogRecorder
+from rogue.cli.game import GameTick, create_game_systems
+from rogue.exceptions import QuitGameException, IgnoreTimeStepException
+
+LATENCY_PERCENTILES = (50, 90, 99)
+
+
+@attr.s(frozen=True, kw_only=True)
+class SimulationReport:
+    ticks: int = attr.ib()
+    skipped_ticks: int = attr.ib()
+    total_time: float = attr.ib()
+    latency_percentiles: Dict[int, float] = attr.ib()
+    number_of_actions: int = attr.ib()
+    number_of_eliminated_actions: int = attr.ib()
+    checksums: Dict[str, str] = attr.ib()
+
+    @property
+    def ticks_per_second(self) -> float:
+        if self.total_time == 0:
+            return float("inf")
+        return self.ticks / self.total_time
+
+
+def _compute_percentile(*, sorted_values: List[float], percentile: int) -> float:
+    if len(sorted_values) == 0:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(percentile / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def rogue_simulate(
+    *,
+    input_file_name: pathlib.Path,
+    ticks: int,
+    seed: int,
+    threads: int,
+    profile: bool,
+    record: Optional[pathlib.Path] = None,
+    keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL,
+    use_level_cache: bool = False,
+) -> SimulationReport:
+
+    random.seed(seed)
+
+    ecdb = load_rogue_ecdb_from_input_yaml(
+        input_file_name=input_file_name, level_cache=LevelCache() if use_level_cache else None
+    )
+    systems = create_game_systems(hero_control_system=None, seed=seed)
+
+    latencies: List[float] = []
+    skipped_ticks = 0
+
+    with contextlib.ExitStack() as exit_stack:
+        # Log the applied actions of every tick to replay them later
+        recorder: Optional[ActionLogRecorder] = None
+        if record is not None:
+            record_file = exit_stack.enter_context(open(record, "wb"))
+            recorder = ActionLogRecorder(output_file=record_file, ecdb=ecdb, keyframe_interval=keyframe_interval)
+        tick = GameTick(
+            systems=systems,
+            threads=threads,
+            profile=profile,
+            wrap_process_action=recorder.wrap_process_action if recorder is not None else None,
+        )
+        exit_stack.callback(tick.shutdown)
+
+        start = time.perf_counter()
+        for _ in range(ticks):
+            tick_start = time.perf_counter()
+            try:
+                ecdb = tick(ecdb)
+            except QuitGameException:
+                break
+            except IgnoreTimeStepException:
+                skipped_ticks += 1
+            finally:
+                if recorder is not None:
+                    recorder.end_tick(ecdb=ecdb)
+            latencies.append(time.perf_counter() - tick_start)
+        total_time = time.perf_counter() - start
+
+    sorted_latencies = sorted(latencies)
+    return SimulationReport(
+        ticks=len(latencies),
+        skipped_ticks=skipped_ticks,
+        total_time=total_time,
+        latency_percentiles={
+            percentile: _compute_percentile(sorted_values=sorted_latencies, percentile=percentile)
+            for percentile in LATENCY_PERCENTILES
+        },
+        number_of_actions=tick.coalescer.number_of_actions,
+        number_of_eliminated_actions=tick.coalescer.number_of_eliminated_actions,
+        checksums=compute_ecdb_checksums(ecdb=ecdb),
+    )
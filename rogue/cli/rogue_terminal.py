@@ -0,0 +1,129 @@
+from typing import Any, Deque, Dict, Optional, Tuple
+
+import os
+import pathlib
+import sys
+import termios
+import threading
+import tty
+
+from rogue.io.loaders import load_rogue_ecdb_from_input_yaml
+from rogue.io.level_cache import LevelCache
+from rogue.generic.ecs import (
+    EntityComponentDatabase,
+    Systems,
+)
+from rogue.components import ComponentUnion
+from rogue.systems import (
+    SystemUnion,
+    TerminalRenderSystem,
+    ScriptedHeroControlSystem,
+)
+from rogue.cli.game import create_game_systems, run_game
+from rogue.types import HeroCommandEnum
+
+KEY_TO_COMMAND: Dict[bytes, HeroCommandEnum] = {
+    b"\x1b[A": HeroCommandEnum.Up,
+    b"\x1b[B": HeroCommandEnum.Down,
+    b"\x1b[C": HeroCommandEnum.Right,
+    b"\x1b[D": HeroCommandEnum.Left,
+    b"e": HeroCommandEnum.EquipNextWeapon,
+    b"p": HeroCommandEnum.DrinkPotion,
+}
+QUIT_KEYS = (b"q", b"\x1b")
+
+
+class TerminalKeyReader:
+    """
+    Reads the keys typed in the terminal on a background thread and queues their commands in `commands`.
+    The terminal is in cbreak mode while the reader is open, so keys are read without waiting for a new line.
+    """
+
+    def __init__(self, *, commands: Deque[HeroCommandEnum], file_descriptor: Optional[int] = None):
+        self.commands = commands
+        self.file_descriptor = sys.stdin.fileno() if file_descriptor is None else file_descriptor
+        self.quit_event = threading.Event()
+        self._terminal_attributes: Optional[Any] = None
+        self._thread = threading.Thread(target=self._read_keys, daemon=True)
+
+    def __enter__(self) -> "TerminalKeyReader":
+        self._terminal_attributes = termios.tcgetattr(self.file_descriptor)
+        tty.setcbreak(self.file_descriptor)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        if self._terminal_attributes is not None:
+            termios.tcsetattr(self.file_descriptor, termios.TCSADRAIN, self._terminal_attributes)
+
+    def _read_keys(self) -> None:
+        while not self.quit_event.is_set():
+            keys = os.read(self.file_descriptor, 64)
+            if len(keys) == 0 or keys in QUIT_KEYS:
+                self.quit_event.set()
+                return
+            # Several keys may arrive in a single read
+            while len(keys) > 0:
+                length = 3 if keys.startswith(b"\x1b[") else 1
+                key, keys = keys[:length], keys[length:]
+                if key in QUIT_KEYS:
+                    self.quit_event.set()
+                    return
+                command = KEY_TO_COMMAND.get(key)
+                if command is not None:
+                    self.commands.append(command)
+
+
+def create_rogue_systems(
+    *, height: int, width: int, seed: Optional[int] = None
+) -> Tuple[Systems[SystemUnion], ScriptedHeroControlSystem, TerminalRenderSystem]:
+
+    # Turn-based like the other interactive commands, the enemies only move when a key is typed
+    hero_control_system = ScriptedHeroControlSystem.create(upwards=-1, downwards=1, turn_based=True)
+    systems = create_game_systems(hero_control_system=hero_control_system, seed=seed)
+    render_system = TerminalRenderSystem.create_from_height_and_width(height=height, width=width, track_changes=True)
+    return systems, hero_control_system, render_system
+
+
+def rogue_terminal(
+    *,
+    input_file_name: pathlib.Path,
+    height: int,
+    width: int,
+    tick_rate: float,
+    fps: float,
+    threads: int,
+    profile: bool,
+    seed: Optional[int] = None,
+    use_level_cache: bool = False,
+) -> None:
+
+    ecdb = load_rogue_ecdb_from_input_yaml(
+        input_file_name=input_file_name, level_cache=LevelCache() if use_level_cache else None
+    )
+    systems, hero_control_system, render_system = create_rogue_systems(height=height, width=width, seed=seed)
+
+    def render(
+        previous_ecdb: EntityComponentDatabase[ComponentUnion],
+        ecdb: EntityComponentDatabase[ComponentUnion],
+        alpha: float,
+    ) -> None:
+        render_system(ecdb=ecdb)
+
+    with TerminalKeyReader(commands=hero_control_system.commands) as key_reader:
+        try:
+            # Render the initial state
+            render_system(ecdb=ecdb)
+            run_game(
+                ecdb=ecdb,
+                systems=systems,
+                render=render,
+                tick_rate=tick_rate,
+                fps=fps,
+                threads=threads,
+                profile=profile,
+                change_tracker=render_system.change_tracker,
+                should_stop=key_reader.quit_event.is_set,
+            )
+        finally:
+            render_system.close()
@@ -5,7 +5,6 @@ Rogue-specific filter functions
 from typing import cast, Union
 
 
-import pyrsistent
 from pyrsistent.typing import PSet
 
 from rogue.generic.ecs import ComponentTemplate, MapFromComponentTypeToComponent
@@ -18,13 +17,12 @@ def _is_of_type(
     queried_entity_type: Union[TypeEnum, PSet[TypeEnum]],
 ) -> bool:
 
-    if not isinstance(queried_entity_type, pyrsistent.PSet):
-        queried_entity_type = pyrsistent.s(queried_entity_type)
-
     entity_type_component = components[TypeComponent]
 
     actual_entity_type = cast(TypeComponent, entity_type_component).entity_type
 
+    if isinstance(queried_entity_type, TypeEnum):
+        return actual_entity_type == queried_entity_type
     return actual_entity_type in queried_entity_type
 
 
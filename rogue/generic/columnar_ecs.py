@@ -0,0 +1,562 @@
+# pylint: disable=protected-access
+
+"""
+Columnar entity component system backed by NumPy arrays.
+
+Entities are dense integer ids. Components whose fields are all integers (e.g. PositionComponent) are stored
+as one NumPy column per field indexed by the entity id, all other components are stored as Python objects.
+Components with a single Enum field (e.g. TypeComponent) are additionally indexed by the value of that field.
+The database is mutable, like the `mutable` backend, the functions return it to keep the same call signatures.
+"""
+
+from collections.abc import Mapping as AbstractMapping
+from enum import Enum
+import operator
+from typing import (
+    cast,
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+import attr
+import numpy as np
+import pyrsistent
+from pyrsistent.typing import PMap, PVector
+
+ComponentTemplate = TypeVar("ComponentTemplate")
+SystemTemplate = TypeVar("SystemTemplate")
+
+MapFromComponentTypeToComponent = Mapping[Type[ComponentTemplate], ComponentTemplate]
+ComponentColumns = Dict[str, np.ndarray]
+
+COLUMN_DTYPE = np.int64
+ENTITY_ID_DTYPE = np.int64
+
+_INITIAL_CAPACITY = 1024
+
+
+@attr.s(frozen=True, kw_only=True)
+class Entity:
+    unique_id: int = attr.ib()
+
+
+def _get_numeric_field_names(component_type: Type[Any]) -> Optional[Tuple[str, ...]]:
+    """
+    Field names of components that can be stored as columns, i.e. attrs classes with integer fields only
+    """
+
+    if component_type not in _NUMERIC_FIELD_NAMES:
+        field_names: Optional[Tuple[str, ...]] = None
+        if attr.has(component_type):
+            fields = attr.fields(component_type)
+            if len(fields) > 0 and all(field.type is int for field in fields):
+                field_names = tuple(field.name for field in fields)
+        _NUMERIC_FIELD_NAMES[component_type] = field_names
+    return _NUMERIC_FIELD_NAMES[component_type]
+
+
+_NUMERIC_FIELD_NAMES: Dict[Type[Any], Optional[Tuple[str, ...]]] = {}
+
+
+def _get_indexed_field_name(component_type: Type[Any]) -> Optional[str]:
+    """
+    Name of the field of components that are indexed by value, i.e. attrs classes with a single Enum field
+    """
+
+    if component_type not in _INDEXED_FIELD_NAME:
+        field_name: Optional[str] = None
+        if attr.has(component_type):
+            fields = attr.fields(component_type)
+            if len(fields) == 1 and isinstance(fields[0].type, type) and issubclass(fields[0].type, Enum):
+                field_name = fields[0].name
+        _INDEXED_FIELD_NAME[component_type] = field_name
+    return _INDEXED_FIELD_NAME[component_type]
+
+
+_INDEXED_FIELD_NAME: Dict[Type[Any], Optional[str]] = {}
+
+
+class _NumericColumns:
+    def __init__(self, *, field_names: Tuple[str, ...], capacity: int):
+        self.field_names = field_names
+        self.present = np.zeros(capacity, dtype=bool)
+        self.columns: ComponentColumns = {
+            field_name: np.zeros(capacity, dtype=COLUMN_DTYPE) for field_name in field_names
+        }
+
+    def grow(self, capacity: int) -> None:
+        self.present = _grow_array(self.present, capacity)
+        self.columns = {field_name: _grow_array(column, capacity) for field_name, column in self.columns.items()}
+
+
+def _grow_array(array: np.ndarray, capacity: int) -> np.ndarray:
+    grown_array = np.zeros(capacity, dtype=array.dtype)
+    grown_array[: len(array)] = array
+    return grown_array
+
+
+class EntityComponentDatabase(Generic[ComponentTemplate]):
+    def __init__(self) -> None:
+        self._last_unique_id = 0
+        self._alive = np.zeros(_INITIAL_CAPACITY, dtype=bool)
+        self._numeric_columns: Dict[Type[ComponentTemplate], _NumericColumns] = {}
+        self._objects: Dict[Type[ComponentTemplate], Dict[int, ComponentTemplate]] = {}
+        self._value_index: Dict[Type[ComponentTemplate], Dict[Any, Set[int]]] = {}
+
+    @property
+    def capacity(self) -> int:
+        return len(self._alive)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(number_of_entities={int(self._alive.sum())})"
+
+
+class _EntityComponentsView(AbstractMapping):  # type: ignore
+    """
+    Read-only map from component type to component of a single entity, passed to the filter functions
+    """
+
+    def __init__(self, *, ecdb: EntityComponentDatabase[Any], unique_id: int):
+        self._ecdb = ecdb
+        self._unique_id = unique_id
+
+    def __getitem__(self, component_type: Type[Any]) -> Any:
+        component = _get_component(ecdb=self._ecdb, unique_id=self._unique_id, component_type=component_type)
+        if component is None:
+            raise KeyError(component_type)
+        return component
+
+    def __iter__(self) -> Iterator[Type[Any]]:
+        for component_type, numeric_columns in self._ecdb._numeric_columns.items():
+            if numeric_columns.present[self._unique_id]:
+                yield component_type
+        for component_type, objects in self._ecdb._objects.items():
+            if self._unique_id in objects:
+                yield component_type
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+def _ensure_capacity(*, ecdb: EntityComponentDatabase[ComponentTemplate], capacity: int) -> None:
+    if capacity <= ecdb.capacity:
+        return
+    new_capacity = max(capacity, 2 * ecdb.capacity)
+    ecdb._alive = _grow_array(ecdb._alive, new_capacity)
+    for numeric_columns in ecdb._numeric_columns.values():
+        numeric_columns.grow(new_capacity)
+
+
+def _check_entity(*, ecdb: EntityComponentDatabase[ComponentTemplate], unique_id: int) -> None:
+    if not 0 <= unique_id < ecdb._last_unique_id or not ecdb._alive[unique_id]:
+        raise KeyError(f"Entity {unique_id} is not in the database")
+
+
+def _get_numeric_columns(
+    *, ecdb: EntityComponentDatabase[ComponentTemplate], component_type: Type[ComponentTemplate]
+) -> Optional[_NumericColumns]:
+    numeric_columns = ecdb._numeric_columns.get(component_type)
+    if numeric_columns is None:
+        field_names = _get_numeric_field_names(component_type)
+        if field_names is None:
+            return None
+        numeric_columns = _NumericColumns(field_names=field_names, capacity=ecdb.capacity)
+        ecdb._numeric_columns[component_type] = numeric_columns
+    return numeric_columns
+
+
+def _unindex_component(
+    *, ecdb: EntityComponentDatabase[ComponentTemplate], unique_id: int, component: ComponentTemplate
+) -> None:
+    component_type = type(component)
+    field_name = _get_indexed_field_name(component_type)
+    if field_name is not None:
+        ecdb._value_index[component_type][getattr(component, field_name)].discard(unique_id)
+
+
+def _set_component(
+    *, ecdb: EntityComponentDatabase[ComponentTemplate], unique_id: int, component: ComponentTemplate
+) -> None:
+    component_type = type(component)
+    numeric_columns = _get_numeric_columns(ecdb=ecdb, component_type=component_type)
+    if numeric_columns is not None:
+        for field_name, column in numeric_columns.columns.items():
+            column[unique_id] = getattr(component, field_name)
+        numeric_columns.present[unique_id] = True
+        return
+
+    objects = ecdb._objects.setdefault(component_type, {})
+    indexed_field_name = _get_indexed_field_name(component_type)
+    if indexed_field_name is not None:
+        previous_component = objects.get(unique_id)
+        if previous_component is not None:
+            _unindex_component(ecdb=ecdb, unique_id=unique_id, component=previous_component)
+        value_index = ecdb._value_index.setdefault(component_type, {})
+        value_index.setdefault(getattr(component, indexed_field_name), set()).add(unique_id)
+    objects[unique_id] = component
+
+
+def _get_component(
+    *, ecdb: EntityComponentDatabase[ComponentTemplate], unique_id: int, component_type: Type[ComponentTemplate]
+) -> Optional[ComponentTemplate]:
+    numeric_columns = ecdb._numeric_columns.get(component_type)
+    if numeric_columns is not None:
+        if not numeric_columns.present[unique_id]:
+            return None
+        return component_type(
+            **{field_name: int(column[unique_id]) for field_name, column in numeric_columns.columns.items()}
+        )
+    return ecdb._objects.get(component_type, {}).get(unique_id)
+
+
+def create_ecdb() -> EntityComponentDatabase[ComponentTemplate]:
+    return EntityComponentDatabase()
+
+
+def add_entity(
+    *, ecdb: EntityComponentDatabase[ComponentTemplate], components: Iterable[ComponentTemplate]
+) -> Tuple[EntityComponentDatabase[ComponentTemplate], Entity]:
+    unique_id = ecdb._last_unique_id
+    _ensure_capacity(ecdb=ecdb, capacity=unique_id + 1)
+    ecdb._last_unique_id += 1
+    ecdb._alive[unique_id] = True
+    for component in components:
+        _set_component(ecdb=ecdb, unique_id=unique_id, component=component)
+    return ecdb, Entity(unique_id=unique_id)
+
+
+def remove_entity(
+    *, ecdb: EntityComponentDatabase[ComponentTemplate], entity: Entity
+) -> EntityComponentDatabase[ComponentTemplate]:
+    unique_id = entity.unique_id
+    _check_entity(ecdb=ecdb, unique_id=unique_id)
+    ecdb._alive[unique_id] = False
+    for numeric_columns in ecdb._numeric_columns.values():
+        numeric_columns.present[unique_id] = False
+    for objects in ecdb._objects.values():
+        component = objects.pop(unique_id, None)
+        if component is not None:
+            _unindex_component(ecdb=ecdb, unique_id=unique_id, component=component)
+    return ecdb
+
+
+def add_component(
+    *, ecdb: EntityComponentDatabase[ComponentTemplate], entity: Entity, component: ComponentTemplate
+) -> EntityComponentDatabase[ComponentTemplate]:
+    _check_entity(ecdb=ecdb, unique_id=entity.unique_id)
+    _set_component(ecdb=ecdb, unique_id=entity.unique_id, component=component)
+    return ecdb
+
+
+def get_component(
+    *, ecdb: EntityComponentDatabase[ComponentTemplate], entity: Entity, component_type: Type[ComponentTemplate]
+) -> Optional[ComponentTemplate]:
+    _check_entity(ecdb=ecdb, unique_id=entity.unique_id)
+    return _get_component(ecdb=ecdb, unique_id=entity.unique_id, component_type=component_type)
+
+
+def get_components(
+    *,
+    ecdb: EntityComponentDatabase[ComponentTemplate],
+    entity: Entity,
+    component_types: Sequence[Type[ComponentTemplate]],
+) -> Tuple[Optional[ComponentTemplate], ...]:
+    """
+    Components of `entity` of each of `component_types`, checks the entity once for all of them
+    """
+
+    _check_entity(ecdb=ecdb, unique_id=entity.unique_id)
+    return tuple(
+        _get_component(ecdb=ecdb, unique_id=entity.unique_id, component_type=component_type)
+        for component_type in component_types
+    )
+
+
+def remove_component(
+    *, ecdb: EntityComponentDatabase[ComponentTemplate], entity: Entity, component_type: Type[ComponentTemplate]
+) -> EntityComponentDatabase[ComponentTemplate]:
+    _check_entity(ecdb=ecdb, unique_id=entity.unique_id)
+    numeric_columns = ecdb._numeric_columns.get(component_type)
+    if numeric_columns is not None:
+        numeric_columns.present[entity.unique_id] = False
+    else:
+        component = ecdb._objects.get(component_type, {}).pop(entity.unique_id, None)
+        if component is not None:
+            _unindex_component(ecdb=ecdb, unique_id=entity.unique_id, component=component)
+    return ecdb
+
+
+def _compute_mask(
+    *, ecdb: EntityComponentDatabase[ComponentTemplate], component_types: Sequence[Type[ComponentTemplate]]
+) -> np.ndarray:
+    mask: np.ndarray = ecdb._alive[: ecdb._last_unique_id].copy()
+    for component_type in component_types:
+        numeric_columns = ecdb._numeric_columns.get(component_type)
+        if numeric_columns is not None:
+            mask &= numeric_columns.present[: ecdb._last_unique_id]
+        else:
+            objects = ecdb._objects.get(component_type, {})
+            object_mask = np.zeros_like(mask)
+            object_mask[np.fromiter(objects.keys(), dtype=ENTITY_ID_DTYPE, count=len(objects))] = True
+            mask &= object_mask
+    return mask
+
+
+def _materialize_components(
+    *,
+    ecdb: EntityComponentDatabase[ComponentTemplate],
+    unique_ids: np.ndarray,
+    component_type: Type[ComponentTemplate],
+) -> List[ComponentTemplate]:
+    numeric_columns = ecdb._numeric_columns.get(component_type)
+    if numeric_columns is not None:
+        field_names = numeric_columns.field_names
+        values = zip(*(numeric_columns.columns[field_name][unique_ids].tolist() for field_name in field_names))
+        return [component_type(**dict(zip(field_names, row))) for row in values]
+    objects = ecdb._objects.get(component_type, {})
+    return [objects[unique_id] for unique_id in unique_ids.tolist()]
+
+
+def query(
+    *,
+    ecdb: EntityComponentDatabase[ComponentTemplate],
+    component_types: Optional[Sequence[Type[ComponentTemplate]]] = None,
+    filter_function: Optional[Callable[[MapFromComponentTypeToComponent[ComponentTemplate]], bool]] = None,
+) -> Generator[Tuple[Entity, Tuple[ComponentTemplate, ...]], None, None]:
+    """
+    Yield the entities that have all of `component_types` and satisfy `filter_function`.
+    The components are read when the query starts, so actions applied while iterating are not observed.
+    """
+
+    component_types = component_types or []
+    unique_ids = np.flatnonzero(_compute_mask(ecdb=ecdb, component_types=component_types))
+    components_per_type = [
+        _materialize_components(ecdb=ecdb, unique_ids=unique_ids, component_type=component_type)
+        for component_type in component_types
+    ]
+
+    for index, unique_id in enumerate(unique_ids.tolist()):
+        if filter_function is not None and not filter_function(_EntityComponentsView(ecdb=ecdb, unique_id=unique_id)):
+            continue
+        yield Entity(unique_id=unique_id), tuple(components[index] for components in components_per_type)
+
+
+def query_entities_by_component_value(
+    *, ecdb: EntityComponentDatabase[ComponentTemplate], component_type: Type[ComponentTemplate], values: Iterable[Any]
+) -> List[Entity]:
+    """
+    Entities whose component of type `component_type` has one of `values`, in the order of their ids.
+    `component_type` has to have a single field. Components with a single Enum field are looked up in the index,
+    other components are scanned.
+    """
+
+    values = set(values)
+    field_name = _get_indexed_field_name(component_type)
+    if field_name is not None:
+        value_index = ecdb._value_index.get(component_type, {})
+        unique_ids = sorted(unique_id for value in values for unique_id in value_index.get(value, ()))
+        return [Entity(unique_id=unique_id) for unique_id in unique_ids]
+
+    fields = attr.fields(cast(Type[Any], component_type))
+    if len(fields) != 1:
+        raise TypeError(f"{component_type} has to have a single field to be queried by value")
+    return [
+        entity
+        for entity, (component,) in query(ecdb=ecdb, component_types=[component_type])
+        if getattr(component, fields[0].name) in values
+    ]
+
+
+def get_unique_entity(
+    *, ecdb: EntityComponentDatabase[ComponentTemplate], component_type: Type[ComponentTemplate], value: Any
+) -> Entity:
+    """
+    The only entity whose component of type `component_type` has `value`, e.g. the hero.
+    Constant time for components that are indexed by value.
+    """
+
+    field_name = _get_indexed_field_name(component_type)
+    if field_name is None:
+        entities = query_entities_by_component_value(ecdb=ecdb, component_type=component_type, values=[value])
+        unique_ids = {entity.unique_id for entity in entities}
+    else:
+        unique_ids = ecdb._value_index.get(component_type, {}).get(value, set())
+    if len(unique_ids) != 1:
+        raise KeyError(f"Expected a single entity with {component_type.__name__} {value}, found {len(unique_ids)}")
+    (unique_id,) = unique_ids
+    return Entity(unique_id=unique_id)
+
+
+def query_columns(
+    *, ecdb: EntityComponentDatabase[ComponentTemplate], component_types: Sequence[Type[ComponentTemplate]]
+) -> Tuple[np.ndarray, Tuple[ComponentColumns, ...]]:
+    """
+    Ids of the entities that have all of `component_types` and copies of the columns of these components.
+    All of `component_types` have to be numeric.
+    """
+
+    unique_ids = np.flatnonzero(_compute_mask(ecdb=ecdb, component_types=component_types))
+    columns_per_type: List[ComponentColumns] = []
+    for component_type in component_types:
+        # Queries don't create the columns, the systems of a stage query the same ECDB from several threads
+        numeric_columns = ecdb._numeric_columns.get(component_type)
+        if numeric_columns is not None:
+            columns_per_type.append(
+                {field_name: column[unique_ids] for field_name, column in numeric_columns.columns.items()}
+            )
+            continue
+        field_names = _get_numeric_field_names(component_type)
+        if field_names is None:
+            raise TypeError(f"{component_type} cannot be stored in columns")
+        # No entity has a component of this type, so `unique_ids` is empty
+        columns_per_type.append({field_name: np.zeros(0, dtype=COLUMN_DTYPE) for field_name in field_names})
+    return unique_ids, tuple(columns_per_type)
+
+
+def add_component_columns(
+    *,
+    ecdb: EntityComponentDatabase[ComponentTemplate],
+    unique_ids: np.ndarray,
+    component_type: Type[ComponentTemplate],
+    columns: Mapping[str, np.ndarray],
+) -> EntityComponentDatabase[ComponentTemplate]:
+    """
+    Set the component of type `component_type` of every entity in `unique_ids` from the columns of its fields
+    """
+
+    numeric_columns = _get_numeric_columns(ecdb=ecdb, component_type=component_type)
+    if numeric_columns is None:
+        raise TypeError(f"{component_type} cannot be stored in columns")
+    if set(columns) != set(numeric_columns.field_names):
+        raise ValueError(f"Expected columns {numeric_columns.field_names}, got {tuple(columns)}")
+    if not np.all(ecdb._alive[unique_ids]):
+        raise KeyError("Some of the entities are not in the database")
+
+    for field_name, column in columns.items():
+        numeric_columns.columns[field_name][unique_ids] = column
+    numeric_columns.present[unique_ids] = True
+    return ecdb
+
+
+def add_entities(
+    *, ecdb: EntityComponentDatabase[ComponentTemplate], number_of_entities: int
+) -> Tuple[EntityComponentDatabase[ComponentTemplate], np.ndarray]:
+    """
+    Add `number_of_entities` entities without components, returns the ids of the new entities
+    """
+
+    first_unique_id = ecdb._last_unique_id
+    _ensure_capacity(ecdb=ecdb, capacity=first_unique_id + number_of_entities)
+    ecdb._last_unique_id += number_of_entities
+    ecdb._alive[first_unique_id : ecdb._last_unique_id] = True
+    return ecdb, np.arange(first_unique_id, ecdb._last_unique_id, dtype=ENTITY_ID_DTYPE)
+
+
+def get_next_unique_id(*, ecdb: EntityComponentDatabase[ComponentTemplate]) -> int:
+    """
+    Id of the next entity added to the database, every smaller id belongs to an entity that was added
+    """
+
+    return ecdb._last_unique_id
+
+
+def add_components(
+    *,
+    ecdb: EntityComponentDatabase[ComponentTemplate],
+    unique_ids: np.ndarray,
+    components: Sequence[ComponentTemplate],
+) -> EntityComponentDatabase[ComponentTemplate]:
+    """
+    Set the component of every entity in `unique_ids` to the component at the same index of `components`,
+    all of `components` have to be of the same type
+    """
+
+    if len(components) == 0:
+        return ecdb
+    if not np.all(ecdb._alive[unique_ids]):
+        raise KeyError("Some of the entities are not in the database")
+    component_type = type(components[0])
+    objects = ecdb._objects.get(component_type)
+    field_name = _get_indexed_field_name(component_type)
+    if _get_numeric_field_names(component_type) is not None or (objects and field_name is not None):
+        # Replaced components have to be unindexed one by one
+        for unique_id, component in zip(unique_ids.tolist(), components):
+            _set_component(ecdb=ecdb, unique_id=unique_id, component=component)
+        return ecdb
+
+    unique_ids_list = unique_ids.tolist()
+    ecdb._objects.setdefault(component_type, {}).update(zip(unique_ids_list, components))
+    if field_name is not None:
+        value_index = ecdb._value_index.setdefault(component_type, {})
+        field = attr.fields_dict(cast(Type[Any], component_type))[field_name]
+        members: List[Enum] = list(cast(Type[Enum], field.type))
+        # Enum members are singletons, so the values are coded by their identity without hashing them
+        member_to_code = {id(member): code for code, member in enumerate(members)}
+        codes = np.fromiter(
+            map(member_to_code.__getitem__, map(id, map(operator.attrgetter(field_name), components))),
+            dtype=np.int64,
+            count=len(components),
+        )
+        for code in np.unique(codes).tolist():
+            value_index.setdefault(members[code], set()).update(unique_ids[codes == code].tolist())
+    return ecdb
+
+
+def query_components(
+    *, ecdb: EntityComponentDatabase[ComponentTemplate], component_type: Type[ComponentTemplate]
+) -> Tuple[np.ndarray, List[ComponentTemplate]]:
+    """
+    Ids of the entities that have a component of type `component_type`, in ascending order, and their components
+    """
+
+    unique_ids = np.flatnonzero(_compute_mask(ecdb=ecdb, component_types=[component_type]))
+    return unique_ids, _materialize_components(ecdb=ecdb, unique_ids=unique_ids, component_type=component_type)
+
+
+@attr.s(frozen=True, kw_only=True)
+class Systems(Generic[SystemTemplate]):
+    priority_to_systems: PMap[int, PVector[SystemTemplate]] = attr.ib()
+
+
+def create_systems() -> Systems[SystemTemplate]:
+    return Systems(priority_to_systems=pyrsistent.pmap())
+
+
+def add_system(*, systems: Systems[SystemTemplate], priority: int, system: SystemTemplate) -> Systems[SystemTemplate]:
+    priority_systems = systems.priority_to_systems.get(priority, pyrsistent.pvector())
+    return Systems(priority_to_systems=systems.priority_to_systems.set(priority, priority_systems.append(system)))
+
+
+def process_systems(
+    *,
+    ecdb: EntityComponentDatabase[ComponentTemplate],
+    systems: Systems[SystemTemplate],
+    process_system: Callable[..., Iterable[Any]],
+    process_action: Callable[
+        [EntityComponentDatabase[ComponentTemplate], Any], EntityComponentDatabase[ComponentTemplate]
+    ],
+) -> EntityComponentDatabase[ComponentTemplate]:
+    """
+    Run the systems in the order of their priorities and apply the actions of every system before running the next one.
+    The actions of a system are collected before they are applied, so the system never observes its own changes.
+    """
+
+    for priority in sorted(systems.priority_to_systems):
+        for system in systems.priority_to_systems[priority]:
+            actions = list(process_system(ecdb=ecdb, system=system))
+            for action in actions:
+                ecdb = process_action(ecdb, action)
+    return ecdb
@@ -1,9 +1,13 @@
 # pylint: disable=unused-import
 
 import os
+from typing import TYPE_CHECKING
 
 ROGUE_ECS_BACKEND = os.environ.get("ROGUE_ECS", "immutable")
-if ROGUE_ECS_BACKEND == "immutable":
+
+# Every backend has the same API but its own types of databases and entities, the code is type checked against the
+# immutable backend and the portable implementations of the extensions
+if TYPE_CHECKING or ROGUE_ECS_BACKEND == "immutable":
     from ecs import (
         Entity,
         ComponentTemplate,
@@ -39,5 +43,57 @@ elif ROGUE_ECS_BACKEND == "mutable":
         add_system,
         process_systems,
     )
+elif ROGUE_ECS_BACKEND == "columnar":
+    from rogue.generic.columnar_ecs import (
+        Entity,
+        ComponentTemplate,
+        MapFromComponentTypeToComponent,
+        EntityComponentDatabase,
+        create_ecdb,
+        add_entity,
+        remove_entity,
+        add_component,
+        get_component,
+        remove_component,
+        query,
+        Systems,
+        create_systems,
+        add_system,
+        process_systems,
+    )
 else:
     raise ImportError("Couldn't import ECS")
+
+# Column access, bulk operations, indexed value queries and unique entity lookups are native to the columnar backend,
+# the other backends get portable (per-entity) implementations so that code written against them still runs everywhere.
+# SUPPORTS_COLUMNS tells whether columns are fast.
+SUPPORTS_COLUMNS = ROGUE_ECS_BACKEND == "columnar"
+
+if TYPE_CHECKING or ROGUE_ECS_BACKEND != "columnar":
+    from rogue.generic.portable_ecs import (  # pylint: disable=cyclic-import
+        COLUMN_DTYPE,
+        ComponentColumns,
+        query_columns,
+        add_component_columns,
+        add_entities,
+        get_next_unique_id,
+        add_components,
+        query_components,
+        query_entities_by_component_value,
+        get_unique_entity,
+        get_components,
+    )
+else:
+    from rogue.generic.columnar_ecs import (
+        COLUMN_DTYPE,
+        ComponentColumns,
+        query_columns,
+        add_component_columns,
+        add_entities,
+        get_next_unique_id,
+        add_components,
+        query_components,
+        query_entities_by_component_value,
+        get_unique_entity,
+        get_components,
+    )
@@ -0,0 +1,179 @@
+"""
+Portable implementations of the column access, the bulk operations and the value queries of the columnar backend
+on top of the per-entity API, so that code written against them runs with every backend.
+"""
+
+from typing import (
+    cast,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
+
+import attr
+import numpy as np
+
+from rogue.generic.ecs import (
+    ComponentTemplate,
+    Entity,
+    EntityComponentDatabase,
+    add_entity,
+    add_component,
+    get_component,
+    remove_entity,
+    query,
+)
+
+ComponentColumns = Dict[str, np.ndarray]
+
+COLUMN_DTYPE = np.int64
+ENTITY_ID_DTYPE = np.int64
+
+# The last entity found by get_unique_entity for every (component type, value). Every action makes a new version of
+# the immutable database, so the entity is carried from a version to the next and validated on every lookup
+_UNIQUE_ENTITIES: Dict[Tuple[Type[Any], Any], Entity] = {}
+
+
+def query_columns(
+    *, ecdb: EntityComponentDatabase[ComponentTemplate], component_types: Sequence[Type[ComponentTemplate]]
+) -> Tuple[np.ndarray, Tuple[ComponentColumns, ...]]:
+    entities_and_components = list(query(ecdb=ecdb, component_types=component_types))
+    unique_ids = np.array([entity.unique_id for entity, _ in entities_and_components], dtype=ENTITY_ID_DTYPE)
+    columns_per_type = tuple(
+        {
+            field.name: np.array(
+                [getattr(components[index], field.name) for _, components in entities_and_components],
+                dtype=COLUMN_DTYPE,
+            )
+            for field in attr.fields(cast(Type[Any], component_type))
+        }
+        for index, component_type in enumerate(component_types)
+    )
+    return unique_ids, columns_per_type
+
+
+def add_component_columns(
+    *,
+    ecdb: EntityComponentDatabase[ComponentTemplate],
+    unique_ids: np.ndarray,
+    component_type: Type[ComponentTemplate],
+    columns: Mapping[str, np.ndarray],
+) -> EntityComponentDatabase[ComponentTemplate]:
+    field_names = list(columns)
+    rows = zip(*(columns[field_name].tolist() for field_name in field_names))
+    components = [component_type(**dict(zip(field_names, row))) for row in rows]
+    return add_components(ecdb=ecdb, unique_ids=unique_ids, components=components)
+
+
+def add_entities(
+    *, ecdb: EntityComponentDatabase[ComponentTemplate], number_of_entities: int
+) -> Tuple[EntityComponentDatabase[ComponentTemplate], np.ndarray]:
+    unique_ids = np.zeros(number_of_entities, dtype=ENTITY_ID_DTYPE)
+    for index in range(number_of_entities):
+        ecdb, entity = add_entity(ecdb=ecdb, components=[])
+        unique_ids[index] = entity.unique_id
+    return ecdb, unique_ids
+
+
+def get_next_unique_id(*, ecdb: EntityComponentDatabase[ComponentTemplate]) -> int:
+    """
+    Id of the next entity added to the database, found by adding an entity. The persistent database is left as is,
+    the mutable one is changed in place so the entity is removed again and its id is skipped.
+    """
+
+    probed_ecdb, entity = add_entity(ecdb=ecdb, components=[])
+    if probed_ecdb is not ecdb:
+        return int(entity.unique_id)
+    remove_entity(ecdb=ecdb, entity=entity)
+    return int(entity.unique_id) + 1
+
+
+def add_components(
+    *,
+    ecdb: EntityComponentDatabase[ComponentTemplate],
+    unique_ids: np.ndarray,
+    components: Sequence[ComponentTemplate],
+) -> EntityComponentDatabase[ComponentTemplate]:
+    for unique_id, component in zip(unique_ids.tolist(), components):
+        ecdb = add_component(ecdb=ecdb, entity=Entity(unique_id=unique_id), component=component)
+    return ecdb
+
+
+def query_components(
+    *, ecdb: EntityComponentDatabase[ComponentTemplate], component_type: Type[ComponentTemplate]
+) -> Tuple[np.ndarray, List[ComponentTemplate]]:
+    entities_and_components = sorted(
+        query(ecdb=ecdb, component_types=[component_type]),
+        key=lambda entity_and_components: entity_and_components[0].unique_id,
+    )
+    unique_ids = np.array([entity.unique_id for entity, _ in entities_and_components], dtype=ENTITY_ID_DTYPE)
+    return unique_ids, [component for _, (component,) in entities_and_components]
+
+
+def _iterate_entities_by_component_value(
+    *, ecdb: EntityComponentDatabase[ComponentTemplate], component_type: Type[ComponentTemplate], values: Iterable[Any]
+) -> Iterator[Entity]:
+    values = set(values)
+    fields = attr.fields(cast(Type[Any], component_type))
+    if len(fields) != 1:
+        raise TypeError(f"{component_type} has to have a single field to be queried by value")
+    for entity, (component,) in query(ecdb=ecdb, component_types=[component_type]):
+        if getattr(component, fields[0].name) in values:
+            yield entity
+
+
+def query_entities_by_component_value(
+    *, ecdb: EntityComponentDatabase[ComponentTemplate], component_type: Type[ComponentTemplate], values: Iterable[Any]
+) -> List[Entity]:
+    return list(_iterate_entities_by_component_value(ecdb=ecdb, component_type=component_type, values=values))
+
+
+def get_components(
+    *,
+    ecdb: EntityComponentDatabase[ComponentTemplate],
+    entity: Entity,
+    component_types: Sequence[Type[ComponentTemplate]],
+) -> Tuple[Optional[ComponentTemplate], ...]:
+    return tuple(
+        get_component(ecdb=ecdb, entity=entity, component_type=component_type) for component_type in component_types
+    )
+
+
+def _has_component_value(
+    *, ecdb: EntityComponentDatabase[ComponentTemplate], entity: Entity, component_type: Type[Any], value: Any
+) -> bool:
+    try:
+        component = get_component(ecdb=ecdb, entity=entity, component_type=component_type)
+    except KeyError:
+        return False
+    return component is not None and getattr(component, attr.fields(component_type)[0].name) == value
+
+
+def get_unique_entity(
+    *, ecdb: EntityComponentDatabase[ComponentTemplate], component_type: Type[ComponentTemplate], value: Any
+) -> Entity:
+    """
+    The entity found by the previous lookup, in this database or in an earlier version of it, is returned as long as
+    it still has `value`, which makes repeated lookups constant time. Otherwise, the database is scanned up to the
+    first entity with `value`. Without an index, the entity isn't checked to be the only one with `value`.
+    """
+
+    key = (component_type, value)
+    entity = _UNIQUE_ENTITIES.get(key)
+    if entity is not None and _has_component_value(
+        ecdb=ecdb, entity=entity, component_type=component_type, value=value
+    ):
+        return entity
+
+    entity = next(_iterate_entities_by_component_value(ecdb=ecdb, component_type=component_type, values=[value]), None)
+    if entity is None:
+        raise KeyError(f"Expected an entity with {component_type.__name__} {value}")
+    _UNIQUE_ENTITIES[key] = entity
+    return entity
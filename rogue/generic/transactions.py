@@ -0,0 +1,52 @@
+"""
+Transactions apply many changes to an ECDB and publish a single new version of it.
+
+The changes go through the public functions of the backend, so the intermediate versions of the immutable database
+are never seen by the systems and the mutable and columnar databases are changed in place.
+"""
+
+from typing import (
+    Generic,
+    Mapping,
+    Type,
+)
+
+import numpy as np
+
+from rogue.generic.ecs import (
+    ComponentTemplate,
+    Entity,
+    EntityComponentDatabase,
+    add_component,
+    add_component_columns,
+    remove_component,
+    remove_entity,
+)
+
+
+class Transaction(Generic[ComponentTemplate]):
+    def __init__(self, *, ecdb: EntityComponentDatabase[ComponentTemplate]):
+        self._ecdb = ecdb
+
+    def add_component(self, *, entity: Entity, component: ComponentTemplate) -> None:
+        self._ecdb = add_component(ecdb=self._ecdb, entity=entity, component=component)
+
+    def remove_component(self, *, entity: Entity, component_type: Type[ComponentTemplate]) -> None:
+        self._ecdb = remove_component(ecdb=self._ecdb, entity=entity, component_type=component_type)
+
+    def remove_entity(self, *, entity: Entity) -> None:
+        self._ecdb = remove_entity(ecdb=self._ecdb, entity=entity)
+
+    def add_component_columns(
+        self, *, unique_ids: np.ndarray, component_type: Type[ComponentTemplate], columns: Mapping[str, np.ndarray],
+    ) -> None:
+        self._ecdb = add_component_columns(
+            ecdb=self._ecdb, unique_ids=unique_ids, component_type=component_type, columns=columns
+        )
+
+    def commit(self) -> EntityComponentDatabase[ComponentTemplate]:
+        return self._ecdb
+
+
+def begin_transaction(*, ecdb: EntityComponentDatabase[ComponentTemplate]) -> Transaction[ComponentTemplate]:
+    return Transaction(ecdb=ecdb)
@@ -0,0 +1,475 @@
+"""
+Binary log of the actions of every tick, with periodic keyframes of the whole state, and its replay.
+
+Every change of the state goes through process_action, so the state after any tick is the state of the nearest
+keyframe before it with the actions of the ticks in between applied. Seeking never runs the systems.
+
+The log starts with HEADER and is a sequence of records, each one is a RECORD_HEADER (kind, tick, length of the
+payload) followed by its payload, large payloads are compressed. The payload of a keyframe record of tick t is the
+state before tick t, the payload of a tick record of tick t the actions applied during tick t. Integers are
+little-endian, entity ids are 32-bit, the fields of the components are 32-bit signed integers and columns are stored
+as the narrowest integers that hold their values.
+"""
+
+import enum
+import mmap
+import pathlib
+import struct
+import zlib
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Generator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
+
+import attr
+import numpy as np
+import pyrsistent
+
+from rogue.generic.ecs import (
+    COLUMN_DTYPE,
+    Entity,
+    EntityComponentDatabase,
+    create_ecdb,
+    add_entity,
+    remove_entity,
+    get_component,
+    query,
+)
+from rogue.components import (
+    ComponentUnion,
+    PositionComponent,
+    VelocityComponent,
+    SizeComponent,
+    TypeComponent,
+    MoneyComponent,
+    HealthComponent,
+    DamageComponent,
+    InventoryComponent,
+    EquipmentComponent,
+)
+from rogue.systems import process_action as apply_action
+from rogue.systems.common.actions import (
+    ActionUnion,
+    AddComponentAction,
+    AddComponentColumnsAction,
+    RemoveComponentAction,
+    RemoveEntityAction,
+    TransactionAction,
+)
+from rogue.systems.common.system import ProcessAction
+
+MAGIC = b"ROGUELOG"
+VERSION = 2
+HEADER = struct.Struct("<8sH")
+RECORD_HEADER = struct.Struct("<BII")
+
+DEFAULT_KEYFRAME_INTERVAL = 1000
+# Set in the kind of the records whose payload is compressed with zlib, the ones of at least COMPRESSION_THRESHOLD bytes
+COMPRESSED_FLAG = 0x80
+COMPRESSION_THRESHOLD = 256
+COMPRESSION_LEVEL = 1
+
+# The index of a component type is its code in the log, append new component types only
+LOGGED_COMPONENT_TYPES: List[Type[ComponentUnion]] = [
+    PositionComponent,
+    VelocityComponent,
+    SizeComponent,
+    TypeComponent,
+    MoneyComponent,
+    HealthComponent,
+    DamageComponent,
+    InventoryComponent,
+    EquipmentComponent,
+]
+COMPONENT_TYPE_TO_CODE: Dict[Type[ComponentUnion], int] = {
+    component_type: code for code, component_type in enumerate(LOGGED_COMPONENT_TYPES)
+}
+
+_UINT8 = struct.Struct("<B")
+_UINT32 = struct.Struct("<I")
+_ENTITY_ID_DTYPE = np.dtype("<u4")
+# Columns are stored with the narrowest of these types that holds their values, the index is the code in the log
+_COLUMN_DTYPES: Tuple[np.dtype, ...] = (np.dtype("<i1"), np.dtype("<i2"), np.dtype("<i4"), np.dtype("<i8"))
+
+
+class RecordKindEnum(enum.IntEnum):
+    Keyframe = 0
+    Tick = 1
+
+
+class OpcodeEnum(enum.IntEnum):
+    RemoveEntity = 0
+    AddComponent = 1
+    RemoveComponent = 2
+    AddComponentColumns = 3
+    Transaction = 4
+
+
+@attr.s(frozen=True, kw_only=True)
+class _ComponentCodec:
+    """
+    Components with integer and enum fields are packed with `fields_struct`,
+    the ones with a single set of entities (inventory, equipment) as the number of entities and their ids
+    """
+
+    component_type: Type[Any] = attr.ib()
+    field_names: Tuple[str, ...] = attr.ib()
+    # Enum of every field, None for integers
+    field_enums: Tuple[Optional[Type[enum.Enum]], ...] = attr.ib()
+    fields_struct: Optional[struct.Struct] = attr.ib()
+
+    @classmethod
+    def create(cls, *, component_type: Type[ComponentUnion]) -> "_ComponentCodec":
+        fields = attr.fields(component_type)
+        field_names = tuple(field.name for field in fields)
+        field_enums = tuple(
+            field.type if isinstance(field.type, type) and issubclass(field.type, enum.Enum) else None
+            for field in fields
+        )
+        is_numeric = all(field.type is int or field_enum is not None for field, field_enum in zip(fields, field_enums))
+        if not is_numeric and len(fields) != 1:
+            raise TypeError(f"{component_type} can't be logged")
+        fields_struct = struct.Struct("<" + "q" * len(fields)) if is_numeric else None
+        return cls(
+            component_type=component_type, field_names=field_names, field_enums=field_enums, fields_struct=fields_struct
+        )
+
+    def encode(self, component: ComponentUnion, output: bytearray) -> None:
+        if self.fields_struct is not None:
+            values = (
+                getattr(component, name) if field_enum is None else getattr(component, name).value
+                for name, field_enum in zip(self.field_names, self.field_enums)
+            )
+            output += self.fields_struct.pack(*values)
+            return
+        unique_ids = sorted(entity.unique_id for entity in getattr(component, self.field_names[0]))
+        output += _UINT32.pack(len(unique_ids))
+        output += np.asarray(unique_ids, dtype=_ENTITY_ID_DTYPE).tobytes()
+
+    def decode(self, data: Any, offset: int) -> Tuple[ComponentUnion, int]:
+        component: ComponentUnion
+        if self.fields_struct is not None:
+            values = self.fields_struct.unpack_from(data, offset)
+            fields: Dict[str, Any] = {
+                name: value if field_enum is None else field_enum(value)
+                for name, field_enum, value in zip(self.field_names, self.field_enums, values)
+            }
+            component = self.component_type(**fields)
+            return component, offset + self.fields_struct.size
+        (number_of_entities,) = _UINT32.unpack_from(data, offset)
+        offset += _UINT32.size
+        unique_ids = np.frombuffer(data, dtype=_ENTITY_ID_DTYPE, count=number_of_entities, offset=offset)
+        entities = pyrsistent.pset(Entity(unique_id=unique_id) for unique_id in unique_ids.tolist())
+        component = self.component_type(**{self.field_names[0]: entities})
+        return component, offset + number_of_entities * _ENTITY_ID_DTYPE.itemsize
+
+
+_CODECS: List[_ComponentCodec] = [
+    _ComponentCodec.create(component_type=component_type) for component_type in LOGGED_COMPONENT_TYPES
+]
+
+
+def _encode_component(component: ComponentUnion, output: bytearray) -> None:
+    code = COMPONENT_TYPE_TO_CODE[type(component)]
+    output += _UINT8.pack(code)
+    _CODECS[code].encode(component, output)
+
+
+def _decode_component(data: Any, offset: int) -> Tuple[ComponentUnion, int]:
+    (code,) = _UINT8.unpack_from(data, offset)
+    codec: _ComponentCodec = _CODECS[code]
+    return codec.decode(data, offset + _UINT8.size)
+
+
+def _encode_column(column: np.ndarray, output: bytearray) -> None:
+    minimum, maximum = (int(column.min()), int(column.max())) if len(column) > 0 else (0, 0)
+    for code, dtype in enumerate(_COLUMN_DTYPES):
+        if np.iinfo(dtype).min <= minimum and maximum <= np.iinfo(dtype).max:
+            break
+    else:
+        raise ValueError(f"Column values in [{minimum}, {maximum}] can't be logged")
+    output += _UINT8.pack(code) + column.astype(dtype).tobytes()
+
+
+def _decode_column(data: Any, offset: int, length: int) -> Tuple[np.ndarray, int]:
+    (code,) = _UINT8.unpack_from(data, offset)
+    dtype = _COLUMN_DTYPES[code]
+    column = np.frombuffer(data, dtype=dtype, count=length, offset=offset + _UINT8.size).astype(np.int64)
+    return column, offset + _UINT8.size + length * dtype.itemsize
+
+
+def encode_action(action: ActionUnion, output: bytearray) -> None:
+    if isinstance(action, AddComponentAction):
+        output += _UINT8.pack(OpcodeEnum.AddComponent) + _UINT32.pack(action.entity.unique_id)
+        _encode_component(action.component, output)
+    elif isinstance(action, RemoveComponentAction):
+        output += _UINT8.pack(OpcodeEnum.RemoveComponent) + _UINT32.pack(action.entity.unique_id)
+        output += _UINT8.pack(COMPONENT_TYPE_TO_CODE[action.component_type])
+    elif isinstance(action, RemoveEntityAction):
+        output += _UINT8.pack(OpcodeEnum.RemoveEntity) + _UINT32.pack(action.entity.unique_id)
+    elif isinstance(action, AddComponentColumnsAction):
+        code = COMPONENT_TYPE_TO_CODE[action.component_type]
+        output += _UINT8.pack(OpcodeEnum.AddComponentColumns) + _UINT8.pack(code) + _UINT32.pack(len(action.unique_ids))
+        # The ids are mostly increasing, their differences are small
+        _encode_column(np.diff(np.asarray(action.unique_ids, dtype=np.int64), prepend=0), output)
+        for field_name in _CODECS[code].field_names:
+            _encode_column(np.asarray(action.columns[field_name], dtype=np.int64), output)
+    elif isinstance(action, TransactionAction):
+        output += _UINT8.pack(OpcodeEnum.Transaction) + _UINT32.pack(len(action.actions))
+        for nested_action in action.actions:
+            encode_action(nested_action, output)
+    else:
+        raise ValueError(f"Unrecognized Action: {action}")
+
+
+def decode_action(data: Any, offset: int) -> Tuple[ActionUnion, int]:
+    (opcode,) = _UINT8.unpack_from(data, offset)
+    offset += _UINT8.size
+    if opcode == OpcodeEnum.Transaction:
+        (number_of_actions,) = _UINT32.unpack_from(data, offset)
+        offset += _UINT32.size
+        actions = []
+        for _ in range(number_of_actions):
+            nested_action, offset = decode_action(data, offset)
+            actions.append(nested_action)
+        return TransactionAction(actions=tuple(actions)), offset
+
+    if opcode == OpcodeEnum.AddComponentColumns:
+        (code,) = _UINT8.unpack_from(data, offset)
+        (number_of_entities,) = _UINT32.unpack_from(data, offset + _UINT8.size)
+        offset += _UINT8.size + _UINT32.size
+        unique_id_differences, offset = _decode_column(data, offset, number_of_entities)
+        columns = {}
+        for field_name in _CODECS[code].field_names:
+            column, offset = _decode_column(data, offset, number_of_entities)
+            columns[field_name] = column.astype(COLUMN_DTYPE)
+        action = AddComponentColumnsAction(
+            unique_ids=np.cumsum(unique_id_differences), component_type=LOGGED_COMPONENT_TYPES[code], columns=columns
+        )
+        return action, offset
+
+    (unique_id,) = _UINT32.unpack_from(data, offset)
+    offset += _UINT32.size
+    entity = Entity(unique_id=unique_id)
+    if opcode == OpcodeEnum.AddComponent:
+        component, offset = _decode_component(data, offset)
+        return AddComponentAction(entity=entity, component=component), offset
+    if opcode == OpcodeEnum.RemoveComponent:
+        (code,) = _UINT8.unpack_from(data, offset)
+        return RemoveComponentAction(entity=entity, component_type=LOGGED_COMPONENT_TYPES[code]), offset + _UINT8.size
+    if opcode == OpcodeEnum.RemoveEntity:
+        return RemoveEntityAction(entity=entity), offset
+    raise ValueError(f"Unrecognized opcode: {opcode}")
+
+
+def decode_actions(data: Any) -> List[ActionUnion]:
+    actions = []
+    offset = 0
+    while offset < len(data):
+        action, offset = decode_action(data, offset)
+        actions.append(action)
+    return actions
+
+
+def encode_keyframe(*, ecdb: EntityComponentDatabase[ComponentUnion]) -> bytes:
+    """
+    Every entity with a TypeComponent and all of its components
+    """
+
+    entities = sorted(
+        (entity for entity, _ in query(ecdb=ecdb, component_types=[TypeComponent])),
+        key=lambda entity: entity.unique_id,
+    )
+    output = bytearray(_UINT32.pack(len(entities)))
+    for entity in entities:
+        components = [
+            component
+            for component in (
+                get_component(ecdb=ecdb, entity=entity, component_type=component_type)
+                for component_type in LOGGED_COMPONENT_TYPES
+            )
+            if component is not None
+        ]
+        output += _UINT32.pack(entity.unique_id) + _UINT8.pack(len(components))
+        for component in components:
+            _encode_component(component, output)
+    return bytes(output)
+
+
+def decode_keyframe(data: Any) -> EntityComponentDatabase[ComponentUnion]:
+    (number_of_entities,) = _UINT32.unpack_from(data, 0)
+    offset = _UINT32.size
+    unique_id_to_components: Dict[int, List[ComponentUnion]] = {}
+    for _ in range(number_of_entities):
+        unique_id, number_of_components = struct.unpack_from("<IB", data, offset)
+        offset += _UINT32.size + _UINT8.size
+        components = []
+        for _ in range(number_of_components):
+            component, offset = _decode_component(data, offset)
+            components.append(component)
+        unique_id_to_components[unique_id] = components
+
+    # Entities get consecutive ids, the removed ones are added and removed again to keep the ids of the others
+    ecdb: EntityComponentDatabase[ComponentUnion] = create_ecdb()
+    removed_entities = []
+    for unique_id in range(max(unique_id_to_components, default=-1) + 1):
+        ecdb, entity = add_entity(ecdb=ecdb, components=unique_id_to_components.get(unique_id, []))
+        if unique_id not in unique_id_to_components:
+            removed_entities.append(entity)
+    for entity in removed_entities:
+        ecdb = remove_entity(ecdb=ecdb, entity=entity)
+    return ecdb
+
+
+class ActionLogRecorder:
+    """
+    Writes the actions applied by the wrapped process_action to `output_file`, one record per tick,
+    and a keyframe every `keyframe_interval` ticks. Call end_tick after every tick, including the ignored ones.
+    """
+
+    def __init__(
+        self,
+        *,
+        output_file: BinaryIO,
+        ecdb: EntityComponentDatabase[ComponentUnion],
+        keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL,
+    ):
+        if keyframe_interval <= 0:
+            raise ValueError("keyframe_interval has to be positive")
+        self.output_file = output_file
+        self.keyframe_interval = keyframe_interval
+        self.number_of_ticks = 0
+        self.number_of_bytes = 0
+        self._tick_actions = bytearray()
+        self._write(HEADER.pack(MAGIC, VERSION))
+        self._write_record(kind=RecordKindEnum.Keyframe, payload=encode_keyframe(ecdb=ecdb))
+
+    def _write(self, data: bytes) -> None:
+        self.output_file.write(data)
+        self.number_of_bytes += len(data)
+
+    def _write_record(self, *, kind: RecordKindEnum, payload: bytes) -> None:
+        flags = 0
+        if len(payload) >= COMPRESSION_THRESHOLD:
+            payload = zlib.compress(payload, COMPRESSION_LEVEL)
+            flags = COMPRESSED_FLAG
+        self._write(RECORD_HEADER.pack(kind | flags, self.number_of_ticks, len(payload)) + payload)
+
+    def wrap_process_action(self, process_action: ProcessAction) -> ProcessAction:
+        def recorded_process_action(
+            ecdb: EntityComponentDatabase[ComponentUnion], action: ActionUnion
+        ) -> EntityComponentDatabase[ComponentUnion]:
+            ecdb = process_action(ecdb, action)
+            # Only the actions that were applied
+            encode_action(action, self._tick_actions)
+            return ecdb
+
+        return recorded_process_action
+
+    def end_tick(self, *, ecdb: EntityComponentDatabase[ComponentUnion]) -> None:
+        self._write_record(kind=RecordKindEnum.Tick, payload=bytes(self._tick_actions))
+        self._tick_actions.clear()
+        self.number_of_ticks += 1
+        if self.number_of_ticks % self.keyframe_interval == 0:
+            self._write_record(kind=RecordKindEnum.Keyframe, payload=encode_keyframe(ecdb=ecdb))
+
+    def flush(self) -> None:
+        self.output_file.flush()
+
+
+class ActionLogReplayer:
+    """
+    Reconstructs the state after any tick of a log written by ActionLogRecorder, by applying the actions of the ticks
+    after the nearest keyframe with `process_action`. A log that was cut short is read up to its last whole record.
+    """
+
+    def __init__(self, *, input_file_name: pathlib.Path, process_action: ProcessAction = apply_action):
+        self.process_action = process_action
+        with open(input_file_name, "rb") as input_file:
+            self._data: Any = mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version = HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{input_file_name} is not an action log of version {VERSION}")
+
+        # Offset, length and whether it is compressed of every payload
+        self._keyframe_ticks: List[int] = []
+        self._keyframes: List[Tuple[int, int, bool]] = []
+        self._ticks: List[Tuple[int, int, bool]] = []
+        offset = HEADER.size
+        while offset + RECORD_HEADER.size <= len(self._data):
+            kind, tick, length = RECORD_HEADER.unpack_from(self._data, offset)
+            offset += RECORD_HEADER.size
+            if offset + length > len(self._data):
+                break
+            payload = (offset, length, bool(kind & COMPRESSED_FLAG))
+            if kind & ~COMPRESSED_FLAG == RecordKindEnum.Keyframe:
+                self._keyframe_ticks.append(tick)
+                self._keyframes.append(payload)
+            else:
+                self._ticks.append(payload)
+            offset += length
+
+    def close(self) -> None:
+        self._data.close()
+
+    def __enter__(self) -> "ActionLogReplayer":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    @property
+    def number_of_ticks(self) -> int:
+        return len(self._ticks)
+
+    def _get_payload(self, record: Tuple[int, int, bool]) -> bytes:
+        offset, length, is_compressed = record
+        payload = bytes(self._data[offset : offset + length])
+        return zlib.decompress(payload) if is_compressed else payload
+
+    def get_actions(self, *, tick: int) -> List[ActionUnion]:
+        """
+        Actions applied during `tick`
+        """
+
+        return decode_actions(self._get_payload(self._ticks[tick]))
+
+    def _check_tick(self, tick: int) -> None:
+        if not 0 <= tick <= self.number_of_ticks:
+            raise IndexError(f"Tick {tick} is not in the log of {self.number_of_ticks} ticks")
+
+    def seek(self, *, tick: int) -> EntityComponentDatabase[ComponentUnion]:
+        """
+        State before `tick`, i.e. after `tick` ticks
+        """
+
+        self._check_tick(tick)
+        keyframe_index = int(np.searchsorted(self._keyframe_ticks, tick, side="right")) - 1
+        ecdb = decode_keyframe(self._get_payload(self._keyframes[keyframe_index]))
+        for ecdb_tick in range(self._keyframe_ticks[keyframe_index], tick):
+            for action in self.get_actions(tick=ecdb_tick):
+                ecdb = self.process_action(ecdb, action)
+        return ecdb
+
+    def replay(
+        self, *, start_tick: int = 0, end_tick: Optional[int] = None
+    ) -> Generator[Tuple[int, EntityComponentDatabase[ComponentUnion]], None, None]:
+        """
+        Yield the tick and the state before it for every tick from `start_tick` up to and including `end_tick`,
+        the end of the log by default. The backends that change the ECDB in place yield the same ECDB every time.
+        """
+
+        end_tick = self.number_of_ticks if end_tick is None else end_tick
+        self._check_tick(end_tick)
+        ecdb = self.seek(tick=start_tick)
+        yield start_tick, ecdb
+        for tick in range(start_tick, end_tick):
+            for action in self.get_actions(tick=tick):
+                ecdb = self.process_action(ecdb, action)
+            yield tick + 1, ecdb
@@ -0,0 +1,79 @@
+import hashlib
+from typing import (
+    Any,
+    Dict,
+    List,
+    Type,
+)
+
+import attr
+import pyrsistent
+
+from rogue.generic.ecs import EntityComponentDatabase, Entity, get_component, query
+from rogue.components import (
+    ComponentUnion,
+    PositionComponent,
+    VelocityComponent,
+    SizeComponent,
+    TypeComponent,
+    MoneyComponent,
+    HealthComponent,
+    DamageComponent,
+    InventoryComponent,
+    EquipmentComponent,
+)
+
+CHECKSUMMED_COMPONENT_TYPES: List[Type[ComponentUnion]] = [
+    PositionComponent,
+    VelocityComponent,
+    SizeComponent,
+    TypeComponent,
+    MoneyComponent,
+    HealthComponent,
+    DamageComponent,
+    InventoryComponent,
+    EquipmentComponent,
+]
+
+
+def _canonicalize_value(value: Any) -> str:
+    if isinstance(value, pyrsistent.PSet):
+        # Set iteration order depends on insertion history, sort to make it canonical
+        unique_ids = sorted(entity.unique_id for entity in value)
+        return "{" + ",".join(str(unique_id) for unique_id in unique_ids) + "}"
+    return str(value)
+
+
+def _canonicalize_component(component: ComponentUnion) -> str:
+    fields = attr.asdict(component, recurse=False)
+    return ",".join(f"{name}={_canonicalize_value(value)}" for name, value in sorted(fields.items()))
+
+
+def compute_ecdb_checksums(*, ecdb: EntityComponentDatabase[ComponentUnion]) -> Dict[str, str]:
+    """
+    Compute a checksum per component type and a "total" checksum over the whole database.
+    Checksums only depend on the contents of the database and not on the history that produced it.
+    """
+
+    entities: List[Entity] = sorted(
+        (entity for entity, _ in query(ecdb=ecdb, component_types=[TypeComponent])),
+        key=lambda entity: entity.unique_id,
+    )
+
+    total_hash = hashlib.sha256()
+    component_type_hashes = {component_type: hashlib.sha256() for component_type in CHECKSUMMED_COMPONENT_TYPES}
+    for entity in entities:
+        for component_type, component_type_hash in component_type_hashes.items():
+            component = get_component(ecdb=ecdb, entity=entity, component_type=component_type)
+            if component is None:
+                continue
+            line = f"{entity.unique_id}:{component_type.__name__}:{_canonicalize_component(component)}\n".encode()
+            component_type_hash.update(line)
+            total_hash.update(line)
+
+    checksums = {
+        component_type.__name__: component_type_hash.hexdigest()
+        for component_type, component_type_hash in component_type_hashes.items()
+    }
+    checksums["total"] = total_hash.hexdigest()
+    return checksums
@@ -0,0 +1,134 @@
+"""
+Generators of synthetic room configs in the same format as the yaml configs in `configs`
+"""
+
+import itertools
+import math
+import pathlib
+import random
+from typing import (
+    Any,
+    Dict,
+    List,
+    Tuple,
+)
+
+import yaml
+
+from rogue.io.loaders import RoomConfig
+from rogue.types import TypeEnum, TYPE_ENUM_TO_STRING, ENEMY_TYPES, WEAPON_TYPES
+
+ROOM_HEIGHT = 10
+ROOM_WIDTH = 20
+
+# Leave a gap between the rooms so that the walls of neighbouring rooms never touch
+ROOM_Y_STRIDE = ROOM_HEIGHT + 2
+ROOM_X_STRIDE = ROOM_WIDTH + 2
+
+DEFAULT_ENEMIES_PER_ROOM = 4
+DEFAULT_ITEMS_PER_ROOM = 4
+
+_ENEMY_TYPES = sorted(ENEMY_TYPES, key=lambda entity_type: entity_type.value)
+_ITEM_TYPES = [TypeEnum.Gold, TypeEnum.Potion] + sorted(WEAPON_TYPES, key=lambda entity_type: entity_type.value)
+
+
+def _format_coordinates(*, y_axis: int, x_axis: int) -> str:
+    return f"{y_axis}, {x_axis}"
+
+
+def _generate_item(*, rng: random.Random, entity_type: TypeEnum, coordinates: Tuple[int, int]) -> Dict[str, Any]:
+    y_axis, x_axis = coordinates
+    item: Dict[str, Any] = {
+        "type": TYPE_ENUM_TO_STRING[entity_type],
+        "coordinates": _format_coordinates(y_axis=y_axis, x_axis=x_axis),
+    }
+    if entity_type in {TypeEnum.Gold, TypeEnum.Potion}:
+        item["amount"] = rng.randint(1, 50)
+    return item
+
+
+def _generate_room(
+    *,
+    rng: random.Random,
+    room_y_axis: int,
+    room_x_axis: int,
+    number_of_enemies: int,
+    number_of_items: int,
+    with_hero: bool,
+) -> Dict[str, Any]:
+    interior = list(itertools.product(range(1, ROOM_HEIGHT), range(1, ROOM_WIDTH)))
+    number_of_occupied_cells = number_of_enemies + number_of_items + int(with_hero)
+    if number_of_occupied_cells > len(interior):
+        raise ValueError(f"Cannot place {number_of_occupied_cells} entities in a room with {len(interior)} cells")
+    cells = iter(rng.sample(interior, number_of_occupied_cells))
+
+    items: List[Dict[str, Any]] = []
+    if with_hero:
+        items.append(_generate_item(rng=rng, entity_type=TypeEnum.Hero, coordinates=next(cells)))
+    for _ in range(number_of_enemies):
+        items.append(_generate_item(rng=rng, entity_type=rng.choice(_ENEMY_TYPES), coordinates=next(cells)))
+    for _ in range(number_of_items):
+        items.append(_generate_item(rng=rng, entity_type=rng.choice(_ITEM_TYPES), coordinates=next(cells)))
+    items.append(_generate_item(rng=rng, entity_type=TypeEnum.Door, coordinates=(0, rng.randint(1, ROOM_WIDTH - 1))))
+
+    return {
+        "coordinates": _format_coordinates(y_axis=room_y_axis, x_axis=room_x_axis),
+        "size": f"{ROOM_HEIGHT}, {ROOM_WIDTH}",
+        "items": items,
+    }
+
+
+def compute_number_of_rooms(
+    *,
+    number_of_entities: int,
+    enemies_per_room: int = DEFAULT_ENEMIES_PER_ROOM,
+    items_per_room: int = DEFAULT_ITEMS_PER_ROOM,
+) -> int:
+    # Every room contributes the room itself, a door, the enemies and the items
+    entities_per_room = 2 + enemies_per_room + items_per_room
+    return max(1, (number_of_entities - 1) // entities_per_room)
+
+
+def generate_room_config(
+    *,
+    number_of_rooms: int,
+    seed: int,
+    enemies_per_room: int = DEFAULT_ENEMIES_PER_ROOM,
+    items_per_room: int = DEFAULT_ITEMS_PER_ROOM,
+) -> RoomConfig:
+    """
+    Generate rooms laid out on a square grid, the hero is placed in the first room
+    """
+
+    rng = random.Random(seed)
+    rooms_per_row = math.ceil(math.sqrt(number_of_rooms))
+
+    room_config: List[Dict[str, Any]] = []
+    for room_index in range(number_of_rooms):
+        row, column = divmod(room_index, rooms_per_row)
+        room_config.append(
+            _generate_room(
+                rng=rng,
+                room_y_axis=row * ROOM_Y_STRIDE,
+                room_x_axis=column * ROOM_X_STRIDE,
+                number_of_enemies=enemies_per_room,
+                number_of_items=items_per_room,
+                with_hero=room_index == 0,
+            )
+        )
+    return room_config
+
+
+def compute_room_config_extent(room_config: RoomConfig) -> Tuple[int, int]:
+    """
+    Height and width of the smallest window that fits all of the rooms
+    """
+
+    rooms_per_row = math.ceil(math.sqrt(len(room_config)))
+    number_of_rows = math.ceil(len(room_config) / rooms_per_row)
+    return number_of_rows * ROOM_Y_STRIDE, rooms_per_row * ROOM_X_STRIDE
+
+
+def save_room_config(*, room_config: RoomConfig, output_file_name: pathlib.Path) -> None:
+    with open(output_file_name, "w") as output_file:
+        yaml.safe_dump(room_config, output_file, sort_keys=False)
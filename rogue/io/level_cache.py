@@ -0,0 +1,151 @@
+"""
+Content-addressed cache of the databases built from room configs.
+
+The database of a config is saved as a snapshot named after the hash of the content of the config, the version of
+rogue, the version of the snapshot format and the source of the modules that build the databases, so an edited config,
+a new version or a change of the loaders is a miss (even in a checkout, where the version of rogue doesn't change). The least recently
+used snapshots are evicted when the cache grows beyond its maximum size.
+"""
+
+import hashlib
+import importlib.metadata
+import importlib.util
+import os
+import pathlib
+import struct
+import threading
+from typing import (
+    List,
+    Optional,
+)
+
+from loguru import logger
+
+from rogue.generic.ecs import EntityComponentDatabase
+from rogue.components import ComponentUnion
+from rogue.io import snapshots
+
+DEFAULT_LEVEL_CACHE_DIRECTORY = (
+    pathlib.Path(os.environ.get("XDG_CACHE_HOME", pathlib.Path.home() / ".cache")) / "rogue" / "levels"
+)
+DEFAULT_MAX_LEVEL_CACHE_SIZE = 1 << 30
+SNAPSHOT_SUFFIX = ".snap"
+
+
+def _get_rogue_version() -> str:
+    try:
+        return importlib.metadata.version("rogue")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+ROGUE_VERSION = _get_rogue_version()
+
+# The modules whose code decides the content of the databases built from room configs
+LEVEL_BUILDER_MODULES = (
+    "rogue.io.loaders",
+    "rogue.components",
+    "rogue.types",
+)
+
+
+def _compute_level_builder_digest() -> str:
+    digest = hashlib.sha256()
+    for module_name in LEVEL_BUILDER_MODULES:
+        spec = importlib.util.find_spec(module_name)
+        if spec is None or spec.origin is None:
+            raise ImportError(f"Couldn't find the source of {module_name}")
+        with open(spec.origin, "rb") as source_file:
+            digest.update(source_file.read())
+    return digest.hexdigest()
+
+
+def compute_level_key(*, input_file_name: pathlib.Path) -> str:
+    digest = hashlib.sha256(
+        f"rogue {ROGUE_VERSION} snapshot {snapshots.VERSION} builder {_compute_level_builder_digest()}\n".encode()
+    )
+    with open(input_file_name, "rb") as input_file:
+        for chunk in iter(lambda: input_file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class LevelCache:
+    """
+    Snapshots in `directory`, `max_size` bytes at most. Snapshots are written by background threads, which are
+    joined by wait() (and at the exit of the interpreter).
+    """
+
+    def __init__(
+        self,
+        *,
+        directory: pathlib.Path = DEFAULT_LEVEL_CACHE_DIRECTORY,
+        max_size: int = DEFAULT_MAX_LEVEL_CACHE_SIZE,
+    ):
+        self.directory = directory
+        self.max_size = max_size
+        self._threads: List[threading.Thread] = []
+
+    def get_file_name(self, *, key: str) -> pathlib.Path:
+        return self.directory / f"{key}{SNAPSHOT_SUFFIX}"
+
+    def load(self, *, key: str) -> Optional[EntityComponentDatabase[ComponentUnion]]:
+        file_name = self.get_file_name(key=key)
+        try:
+            ecdb = snapshots.load_ecdb(input_file_name=file_name)
+        except FileNotFoundError:
+            return None
+        except (ValueError, IndexError, struct.error) as error:
+            logger.warning(f"Removing the corrupted level {file_name}: {error}")
+            file_name.unlink(missing_ok=True)
+            return None
+        # The modification time of a snapshot is the time of its last use, for the eviction
+        os.utime(file_name)
+        return ecdb
+
+    def store_in_background(self, *, key: str, ecdb: EntityComponentDatabase[ComponentUnion]) -> None:
+        # Serialized right away, the database may change while the snapshot is written
+        chunks = snapshots.serialize_ecdb(ecdb=ecdb)
+        thread = threading.Thread(target=self._store, kwargs={"key": key, "chunks": chunks}, name="level-cache")
+        thread.start()
+        self._threads.append(thread)
+
+    def wait(self) -> None:
+        for thread in self._threads:
+            thread.join()
+        self._threads.clear()
+
+    def evict(self) -> None:
+        """
+        Remove the least recently used snapshots until the cache fits in `max_size`
+        """
+
+        entries = []
+        for file_name in self.directory.glob(f"*{SNAPSHOT_SUFFIX}"):
+            try:
+                stat = file_name.stat()
+            except FileNotFoundError:
+                # Evicted by another process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, file_name))
+
+        size = sum(file_size for _, file_size, _ in entries)
+        for _, file_size, file_name in sorted(entries):
+            if size <= self.max_size:
+                break
+            file_name.unlink(missing_ok=True)
+            size -= file_size
+
+    def _store(self, *, key: str, chunks: List[bytes]) -> None:
+        file_name = self.get_file_name(key=key)
+        # Written under a unique name and renamed, so that a snapshot is never read while it is written
+        temporary_file_name = file_name.with_name(f"{file_name.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(temporary_file_name, "wb") as output_file:
+                output_file.writelines(chunks)
+            os.replace(temporary_file_name, file_name)
+            self.evict()
+        except OSError as error:
+            logger.warning(f"Couldn't cache the level {key}: {error}")
+            temporary_file_name.unlink(missing_ok=True)
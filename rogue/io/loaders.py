@@ -1,17 +1,33 @@
+import collections
+import operator
 import pathlib
-import pprint
 
 from typing import (
     Any,
+    Counter,
+    DefaultDict,
     Dict,
+    Iterable,
+    Iterator,
     List,
+    Optional,
     Tuple,
+    Type,
 )
 
+import attr
 from loguru import logger
+import numpy as np
 import yaml
 
-from rogue.generic.ecs import EntityComponentDatabase, create_ecdb, add_entity
+from rogue.generic.ecs import (
+    COLUMN_DTYPE,
+    EntityComponentDatabase,
+    create_ecdb,
+    add_entities,
+    add_components,
+    add_component_columns,
+)
 from rogue.components import (
     ComponentUnion,
     PositionComponent,
@@ -23,41 +39,97 @@ from rogue.components import (
     InventoryComponent,
     EquipmentComponent,
 )
+from rogue.io.level_cache import LevelCache, compute_level_key
 from rogue.types import TypeEnum, STRING_TO_TYPE_ENUM, ENEMY_TYPES
 
-RoomConfig = Dict[Any, Any]
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader  # type: ignore
+
+# A list of rooms, each one with its coordinates, size and items
+RoomConfig = List[Dict[str, Any]]
+
+# Number of entities validated and added to the database at once
+BATCH_SIZE = 65536
 
+# Components with integer fields only, added to the database as columns
+NUMERIC_COMPONENT_FIELD_NAMES: Dict[Type[Any], Tuple[str, ...]] = {
+    component_type: tuple(field.name for field in attr.fields(component_type))
+    for component_type in (PositionComponent, SizeComponent, VelocityComponent, MoneyComponent, HealthComponent)
+}
 
-def _load_room_config(*, input_file_name: pathlib.Path) -> RoomConfig:
+
+def load_room_config(*, input_file_name: pathlib.Path) -> RoomConfig:
     with open(input_file_name) as input_file:
         room_config: RoomConfig = yaml.safe_load(input_file)
     return room_config
 
 
-def _parse_coordinates(*, coordinates: str) -> Tuple[int, int]:
-    y_axis, x_axis = (int(number) for number in coordinates.split(","))
-    return y_axis, x_axis
+def _compose_node(*, loader: Any) -> yaml.Node:
+    """
+    Compose the node of the next value from the parser events, as the composer of PyYAML but without aliases
+    """
 
+    event = loader.get_event()
+    if isinstance(event, yaml.ScalarEvent):
+        tag = event.tag
+        if tag is None or tag == "!":
+            tag = loader.resolve(yaml.ScalarNode, event.value, event.implicit)
+        return yaml.ScalarNode(tag, event.value, event.start_mark, event.end_mark, style=event.style)
 
-def _parse_room_coordinates(*, coordinates: str) -> Dict[str, int]:
-    y_axis, x_axis = _parse_coordinates(coordinates=coordinates)
-    return {"y_axis": y_axis, "x_axis": x_axis}
+    if isinstance(event, yaml.SequenceStartEvent):
+        tag = event.tag
+        if tag is None or tag == "!":
+            tag = loader.resolve(yaml.SequenceNode, None, event.implicit)
+        values = []
+        while not loader.check_event(yaml.SequenceEndEvent):
+            values.append(_compose_node(loader=loader))
+        end_mark = loader.get_event().end_mark
+        return yaml.SequenceNode(tag, values, event.start_mark, end_mark, flow_style=event.flow_style)
 
+    if isinstance(event, yaml.MappingStartEvent):
+        tag = event.tag
+        if tag is None or tag == "!":
+            tag = loader.resolve(yaml.MappingNode, None, event.implicit)
+        pairs = []
+        while not loader.check_event(yaml.MappingEndEvent):
+            key = _compose_node(loader=loader)
+            pairs.append((key, _compose_node(loader=loader)))
+        end_mark = loader.get_event().end_mark
+        return yaml.MappingNode(tag, pairs, event.start_mark, end_mark, flow_style=event.flow_style)
 
-def _parse_entity_coordinates(
-    *, coordinates: str, entity_type: TypeEnum, room_height: int, room_width: int, room_y_axis: int, room_x_axis: int
-) -> Dict[str, int]:
-    parsed_y_axis, parsed_x_axis = _parse_coordinates(coordinates=coordinates)
+    raise yaml.composer.ComposerError(None, None, "aliases are not supported in room configs", event.start_mark)
 
-    if entity_type == TypeEnum.Door:
-        assert parsed_y_axis == 0 or parsed_y_axis == room_height or parsed_x_axis == 0 or parsed_x_axis == room_width
-    else:
-        assert 0 < parsed_y_axis < room_height
-        assert 0 < parsed_x_axis < room_width
 
-    y_axis = parsed_y_axis + room_y_axis
-    x_axis = parsed_x_axis + room_x_axis
+def iterate_room_config(*, input_file_name: pathlib.Path) -> Iterator[Dict[str, Any]]:
+    """
+    Parse the rooms of a room config one at a time, the whole config is never in memory
+    """
 
+    with open(input_file_name, "rb") as input_file:
+        loader = SafeLoader(input_file)
+        try:
+            loader.get_event()
+            if loader.check_event(yaml.StreamEndEvent):
+                return
+            loader.get_event()
+            if not loader.check_event(yaml.SequenceStartEvent):
+                raise ValueError(f"{input_file_name} is not a list of rooms")
+            loader.get_event()
+            while not loader.check_event(yaml.SequenceEndEvent):
+                yield loader.construct_document(_compose_node(loader=loader))
+        finally:
+            loader.dispose()
+
+
+def _parse_coordinates(*, coordinates: str) -> Tuple[int, int]:
+    y_axis, x_axis = (int(number) for number in coordinates.split(","))
+    return y_axis, x_axis
+
+
+def _parse_room_coordinates(*, coordinates: str) -> Dict[str, int]:
+    y_axis, x_axis = _parse_coordinates(coordinates=coordinates)
     return {"y_axis": y_axis, "x_axis": x_axis}
 
 
@@ -66,19 +138,23 @@ def _parse_size(*, size: str) -> Dict[str, int]:
     return {"height": height, "width": width}
 
 
+# Components are immutable, the entities that start with the same ones share them
+_STILL_VELOCITY = VelocityComponent.create_from_attributes(y_axis=0, x_axis=0)
+_FULL_HEALTH = HealthComponent.create_from_attributes(amount=100)
+_NO_MONEY = MoneyComponent.create_from_attributes(amount=0)
+_EMPTY_INVENTORY = InventoryComponent.create_from_attributes(entities=[])
+_EMPTY_EQUIPMENT = EquipmentComponent.create_from_attributes(entities=[])
+_TYPE_COMPONENTS = {
+    entity_type: TypeComponent.create_from_attributes(entity_type=entity_type) for entity_type in TypeEnum
+}
+
+
 def _load_entity_specific_components(entity_type: TypeEnum, item: Dict[str, Any]) -> List[ComponentUnion]:
     components: List[ComponentUnion] = []
     if entity_type == TypeEnum.Hero:
-        components.append(VelocityComponent.create_from_attributes(y_axis=0, x_axis=0))
-        components.append(HealthComponent.create_from_attributes(amount=100))
-        components.append(MoneyComponent.create_from_attributes(amount=0))
-        components.append(InventoryComponent.create_from_attributes(entities=[]))
-        components.append(EquipmentComponent.create_from_attributes(entities=[]))
+        components.extend([_STILL_VELOCITY, _FULL_HEALTH, _NO_MONEY, _EMPTY_INVENTORY, _EMPTY_EQUIPMENT])
     elif entity_type in ENEMY_TYPES:
-        components.append(VelocityComponent.create_from_attributes(y_axis=0, x_axis=0))
-        components.append(HealthComponent.create_from_attributes(amount=100))
-        components.append(InventoryComponent.create_from_attributes(entities=[]))
-        components.append(EquipmentComponent.create_from_attributes(entities=[]))
+        components.extend([_STILL_VELOCITY, _FULL_HEALTH, _EMPTY_INVENTORY, _EMPTY_EQUIPMENT])
     elif entity_type == TypeEnum.Gold:
         components.append(MoneyComponent.create_from_attributes(amount=item["amount"]))
     elif entity_type == TypeEnum.Potion:
@@ -86,41 +162,137 @@ def _load_entity_specific_components(entity_type: TypeEnum, item: Dict[str, Any]
     return components
 
 
-def load_rogue_ecdb_from_input_yaml(input_file_name: pathlib.Path) -> EntityComponentDatabase[ComponentUnion]:
+class _EntityBatch:
+    """
+    Components of the entities of consecutive rooms, validated and added to the database at once
+    """
 
-    logger.info(f"Input file: {input_file_name}")
+    def __init__(self) -> None:
+        self.number_of_entities = 0
+        # Indices of the entities in the batch and their components, per component type
+        self.components: DefaultDict[Type[Any], Tuple[List[int], List[ComponentUnion]]] = collections.defaultdict(
+            lambda: ([], [])
+        )
+        # Coordinates of every item relative to its room, the size of the room, whether the item is a door,
+        # and the indices of the room and of the item in the config
+        self.items: List[Tuple[int, int, int, int, bool, int, int]] = []
+
+    def add_entity(self, *, components: Iterable[ComponentUnion]) -> None:
+        for component in components:
+            indices, type_components = self.components[type(component)]
+            indices.append(self.number_of_entities)
+            type_components.append(component)
+        self.number_of_entities += 1
+
+    def validate(self) -> None:
+        if len(self.items) == 0:
+            return
+        y_axis, x_axis, height, width, is_door, room_index, item_index = np.array(self.items, dtype=np.int64).T
+        is_inside = (0 < y_axis) & (y_axis < height) & (0 < x_axis) & (x_axis < width)
+        is_on_wall = (y_axis == 0) | (y_axis == height) | (x_axis == 0) | (x_axis == width)
+        invalid_indices = np.flatnonzero(np.where(is_door.astype(bool), ~is_on_wall, ~is_inside))
+        if len(invalid_indices) > 0:
+            index = invalid_indices[0]
+            raise ValueError(
+                f"Item {item_index[index]} of room {room_index[index]} at {y_axis[index]}, {x_axis[index]} "
+                f"is outside of the room of size {height[index]}, {width[index]} (or not on its wall for doors)"
+            )
+
+    def add_to_ecdb(self, *, ecdb: EntityComponentDatabase[ComponentUnion]) -> EntityComponentDatabase[ComponentUnion]:
+        self.validate()
+        ecdb, unique_ids = add_entities(ecdb=ecdb, number_of_entities=self.number_of_entities)
+        for component_type, (indices, components) in self.components.items():
+            component_unique_ids = unique_ids[indices]
+            field_names = NUMERIC_COMPONENT_FIELD_NAMES.get(component_type)
+            if field_names is None:
+                ecdb = add_components(ecdb=ecdb, unique_ids=component_unique_ids, components=components)
+                continue
+            columns = {
+                field_name: np.fromiter(
+                    map(operator.attrgetter(field_name), components), dtype=COLUMN_DTYPE, count=len(components)
+                )
+                for field_name in field_names
+            }
+            ecdb = add_component_columns(
+                ecdb=ecdb, unique_ids=component_unique_ids, component_type=component_type, columns=columns
+            )
+        return ecdb
 
-    room_config = _load_room_config(input_file_name=input_file_name)
-    logger.info(f"Room Config: {pprint.pformat(room_config)}")
+
+def _load_rogue_ecdb_from_rooms(
+    *, rooms: Iterable[Dict[str, Any]]
+) -> Tuple[EntityComponentDatabase[ComponentUnion], Counter[TypeEnum]]:
 
     ecdb: EntityComponentDatabase[ComponentUnion] = create_ecdb()
-    for room in room_config:
+    entity_type_counts: Counter[TypeEnum] = collections.Counter()
+    batch = _EntityBatch()
+    for room_index, room in enumerate(rooms):
         room_coordinates = _parse_room_coordinates(coordinates=room["coordinates"])
         room_size = _parse_size(size=room["size"])
-        room_components: List[ComponentUnion] = [
-            PositionComponent.create_from_attributes(**room_coordinates),
-            SizeComponent.create_from_attributes(**room_size),
-            TypeComponent.create_from_attributes(entity_type=TypeEnum.Room),
-        ]
-        ecdb, _ = add_entity(ecdb=ecdb, components=room_components)
-        for item in room["items"]:
+        batch.add_entity(
+            components=[
+                PositionComponent.create_from_attributes(**room_coordinates),
+                SizeComponent.create_from_attributes(**room_size),
+                _TYPE_COMPONENTS[TypeEnum.Room],
+            ]
+        )
+        entity_type_counts[TypeEnum.Room] += 1
+        for item_index, item in enumerate(room["items"]):
             entity_type = STRING_TO_TYPE_ENUM[item["type"]]
-            entity_coordinates = _parse_entity_coordinates(
-                coordinates=item["coordinates"],
-                entity_type=entity_type,
-                room_height=room_size["height"],
-                room_width=room_size["width"],
-                room_y_axis=room_coordinates["y_axis"],
-                room_x_axis=room_coordinates["x_axis"],
+            y_axis, x_axis = _parse_coordinates(coordinates=item["coordinates"])
+            batch.items.append(
+                (
+                    y_axis,
+                    x_axis,
+                    room_size["height"],
+                    room_size["width"],
+                    entity_type == TypeEnum.Door,
+                    room_index,
+                    item_index,
+                )
             )
             components: List[ComponentUnion] = [
-                PositionComponent.create_from_attributes(**entity_coordinates),
-                TypeComponent.create_from_attributes(entity_type=entity_type),
+                PositionComponent.create_from_attributes(
+                    y_axis=y_axis + room_coordinates["y_axis"], x_axis=x_axis + room_coordinates["x_axis"]
+                ),
+                _TYPE_COMPONENTS[entity_type],
             ]
+            components.extend(_load_entity_specific_components(entity_type=entity_type, item=item))
+            batch.add_entity(components=components)
+            entity_type_counts[entity_type] += 1
+
+        if batch.number_of_entities >= BATCH_SIZE:
+            ecdb = batch.add_to_ecdb(ecdb=ecdb)
+            batch = _EntityBatch()
+
+    ecdb = batch.add_to_ecdb(ecdb=ecdb)
+    return ecdb, entity_type_counts
+
+
+def load_rogue_ecdb_from_room_config(room_config: RoomConfig) -> EntityComponentDatabase[ComponentUnion]:
+    ecdb, _ = _load_rogue_ecdb_from_rooms(rooms=room_config)
+    return ecdb
+
+
+def load_rogue_ecdb_from_input_yaml(
+    input_file_name: pathlib.Path, level_cache: Optional[LevelCache] = None
+) -> EntityComponentDatabase[ComponentUnion]:
+
+    logger.info(f"Input file: {input_file_name}")
 
-            entity_specific_components = _load_entity_specific_components(entity_type=entity_type, item=item)
-            components.extend(entity_specific_components)
+    if level_cache is not None:
+        key = compute_level_key(input_file_name=input_file_name)
+        cached_ecdb = level_cache.load(key=key)
+        if cached_ecdb is not None:
+            logger.info(f"Loaded the level from the cache: {level_cache.get_file_name(key=key)}")
+            return cached_ecdb
 
-            ecdb, _ = add_entity(ecdb=ecdb, components=components)
+    ecdb, entity_type_counts = _load_rogue_ecdb_from_rooms(rooms=iterate_room_config(input_file_name=input_file_name))
+    logger.info(
+        f"Room Config: {entity_type_counts[TypeEnum.Room]} rooms, {sum(entity_type_counts.values())} entities "
+        f"({', '.join(f'{entity_type.name}: {count}' for entity_type, count in entity_type_counts.most_common())})"
+    )
 
+    if level_cache is not None:
+        level_cache.store_in_background(key=key, ecdb=ecdb)
     return ecdb
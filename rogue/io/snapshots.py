@@ -0,0 +1,325 @@
+"""
+Versioned binary snapshots of an EntityComponentDatabase.
+
+A snapshot starts with HEADER followed by the ids of its entities and one section per component type. A section is
+a SECTION_HEADER (component type, layout and number of components) followed by the ids of the entities that have
+the component and arrays that depend on the layout:
+* Fields: one 64-bit signed integer array per field, for components with integer and enum fields
+* EntitySet: an offset table of number of components + 1 64-bit integers and the 32-bit ids of all of the sets,
+  for components with a single set of entities (InventoryComponent, EquipmentComponent)
+Integers are little-endian and every array starts at a multiple of ALIGNMENT, so loading memory-maps the file and
+passes views of the arrays to the bulk functions of the ECDB.
+"""
+
+import enum
+import mmap
+import operator
+import pathlib
+import struct
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
+
+import attr
+import numpy as np
+import pyrsistent
+
+from rogue.generic.ecs import (
+    Entity,
+    EntityComponentDatabase,
+    create_ecdb,
+    query_columns,
+    add_component_columns,
+    add_entities,
+    get_next_unique_id,
+    add_components,
+    query_components,
+)
+from rogue.generic.transactions import begin_transaction
+from rogue.components import (
+    ComponentUnion,
+    PositionComponent,
+    VelocityComponent,
+    SizeComponent,
+    TypeComponent,
+    MoneyComponent,
+    HealthComponent,
+    DamageComponent,
+    InventoryComponent,
+    EquipmentComponent,
+)
+
+MAGIC = b"ROGUESNP"
+VERSION = 2
+# Magic, version, number of entity ids (the removed entities included), number of entities, number of sections
+HEADER = struct.Struct("<8sHxxIII")
+# Component type, layout, number of components
+SECTION_HEADER = struct.Struct("<BBxxI")
+ALIGNMENT = 8
+
+# The index of a component type is its code in the snapshot, append new component types only
+SNAPSHOT_COMPONENT_TYPES: List[Type[ComponentUnion]] = [
+    PositionComponent,
+    VelocityComponent,
+    SizeComponent,
+    TypeComponent,
+    MoneyComponent,
+    HealthComponent,
+    DamageComponent,
+    InventoryComponent,
+    EquipmentComponent,
+]
+
+_ENTITY_ID_DTYPE = np.dtype("<u4")
+_FIELD_DTYPE = np.dtype("<i8")
+_OFFSET_DTYPE = np.dtype("<i8")
+
+
+class LayoutEnum(enum.IntEnum):
+    Fields = 0
+    EntitySet = 1
+
+
+@attr.s(frozen=True, kw_only=True)
+class _ComponentLayout:
+    component_type: Type[Any] = attr.ib()
+    layout: LayoutEnum = attr.ib()
+    field_names: Tuple[str, ...] = attr.ib()
+    # Enum of every field, None for integers
+    field_enums: Tuple[Optional[Type[enum.Enum]], ...] = attr.ib()
+
+    @classmethod
+    def create(cls, *, component_type: Type[ComponentUnion]) -> "_ComponentLayout":
+        fields = attr.fields(component_type)
+        field_enums = tuple(
+            field.type if isinstance(field.type, type) and issubclass(field.type, enum.Enum) else None
+            for field in fields
+        )
+        if all(field.type is int or field_enum is not None for field, field_enum in zip(fields, field_enums)):
+            layout = LayoutEnum.Fields
+        elif len(fields) == 1:
+            layout = LayoutEnum.EntitySet
+        else:
+            raise TypeError(f"{component_type} can't be stored in a snapshot")
+        return cls(
+            component_type=component_type,
+            layout=layout,
+            field_names=tuple(field.name for field in fields),
+            field_enums=field_enums,
+        )
+
+    @property
+    def is_numeric(self) -> bool:
+        return self.layout == LayoutEnum.Fields and all(field_enum is None for field_enum in self.field_enums)
+
+
+_LAYOUTS: List[_ComponentLayout] = [
+    _ComponentLayout.create(component_type=component_type) for component_type in SNAPSHOT_COMPONENT_TYPES
+]
+
+
+class _SnapshotWriter:
+    def __init__(self) -> None:
+        self.chunks: List[bytes] = []
+        self.size = 0
+
+    def write(self, data: bytes) -> None:
+        self.chunks.append(data)
+        self.size += len(data)
+
+    def align(self) -> None:
+        self.write(bytes(-self.size % ALIGNMENT))
+
+    def write_array(self, array: np.ndarray) -> None:
+        self.align()
+        self.write(array.tobytes())
+
+
+def _get_field_array(*, components: List[Any], field_name: str, field_enum: Optional[Type[enum.Enum]]) -> np.ndarray:
+    values = map(operator.attrgetter(field_name), components)
+    if field_enum is not None:
+        # Enum members are singletons, looking them up by identity avoids hashing every one of them
+        id_to_value = {id(member): member.value for member in field_enum}
+        values = map(id_to_value.__getitem__, map(id, values))
+    return np.fromiter(values, dtype=_FIELD_DTYPE, count=len(components))
+
+
+def _get_section_arrays(
+    *, ecdb: EntityComponentDatabase[ComponentUnion], component_layout: _ComponentLayout
+) -> Tuple[np.ndarray, List[np.ndarray]]:
+    component_type = component_layout.component_type
+    if component_layout.is_numeric:
+        unique_ids, (columns,) = query_columns(ecdb=ecdb, component_types=[component_type])
+        return unique_ids, [columns[field_name].astype(_FIELD_DTYPE) for field_name in component_layout.field_names]
+
+    unique_ids, components = query_components(ecdb=ecdb, component_type=component_type)
+    if component_layout.layout == LayoutEnum.Fields:
+        arrays = [
+            _get_field_array(components=components, field_name=field_name, field_enum=field_enum)
+            for field_name, field_enum in zip(component_layout.field_names, component_layout.field_enums)
+        ]
+        return unique_ids, arrays
+
+    (field_name,) = component_layout.field_names
+    entity_sets = list(map(operator.attrgetter(field_name), components))
+    offsets = np.zeros(len(entity_sets) + 1, dtype=_OFFSET_DTYPE)
+    np.cumsum(np.fromiter(map(len, entity_sets), dtype=_OFFSET_DTYPE, count=len(entity_sets)), out=offsets[1:])
+    values = np.fromiter(
+        (
+            unique_id
+            for entity_set in entity_sets
+            if len(entity_set) > 0
+            for unique_id in sorted(entity.unique_id for entity in entity_set)
+        ),
+        dtype=_ENTITY_ID_DTYPE,
+        count=offsets[-1],
+    )
+    return unique_ids, [offsets, values]
+
+
+def serialize_ecdb(*, ecdb: EntityComponentDatabase[ComponentUnion]) -> List[bytes]:
+    """
+    Chunks of the snapshot of every entity that has a component and all of its components
+    """
+
+    sections = [
+        (code, component_layout, *_get_section_arrays(ecdb=ecdb, component_layout=component_layout))
+        for code, component_layout in enumerate(_LAYOUTS)
+    ]
+    sections = [section for section in sections if len(section[2]) > 0]
+    # Every id handed out so far, removed entities included, so that the loaded database doesn't reuse any of them
+    number_of_ids = get_next_unique_id(ecdb=ecdb)
+    has_component = np.zeros(number_of_ids, dtype=bool)
+    for section in sections:
+        has_component[section[2]] = True
+    entity_ids = np.flatnonzero(has_component)
+
+    writer = _SnapshotWriter()
+    writer.write(HEADER.pack(MAGIC, VERSION, number_of_ids, len(entity_ids), len(sections)))
+    writer.write_array(entity_ids.astype(_ENTITY_ID_DTYPE))
+    for code, component_layout, unique_ids, arrays in sections:
+        writer.align()
+        writer.write(SECTION_HEADER.pack(code, component_layout.layout, len(unique_ids)))
+        writer.write_array(unique_ids.astype(_ENTITY_ID_DTYPE))
+        for array in arrays:
+            writer.write_array(array)
+    return writer.chunks
+
+
+def save_ecdb(*, ecdb: EntityComponentDatabase[ComponentUnion], output_file_name: pathlib.Path) -> None:
+    """
+    Save every entity that has a component and all of its components
+    """
+
+    chunks = serialize_ecdb(ecdb=ecdb)
+    with open(output_file_name, "wb") as output_file:
+        output_file.writelines(chunks)
+
+
+class _SnapshotReader:
+    def __init__(self, data: Any):
+        self.data = data
+        self.offset = 0
+
+    def read_struct(self, struct_format: struct.Struct) -> Tuple[Any, ...]:
+        values = struct_format.unpack_from(self.data, self.offset)
+        self.offset += struct_format.size
+        return values
+
+    def align(self) -> None:
+        self.offset += -self.offset % ALIGNMENT
+
+    def read_array(self, *, dtype: np.dtype, count: int) -> np.ndarray:
+        self.align()
+        array = np.frombuffer(self.data, dtype=dtype, count=count, offset=self.offset)
+        self.offset += count * dtype.itemsize
+        return array
+
+
+def _parse_fields(*, component_layout: _ComponentLayout, row: List[int]) -> Dict[str, Any]:
+    return {
+        field_name: value if field_enum is None else field_enum(value)
+        for field_name, field_enum, value in zip(component_layout.field_names, component_layout.field_enums, row)
+    }
+
+
+def _create_components(*, component_layout: _ComponentLayout, reader: _SnapshotReader, count: int) -> List[Any]:
+    component_type = component_layout.component_type
+    if component_layout.layout == LayoutEnum.Fields:
+        columns = [reader.read_array(dtype=_FIELD_DTYPE, count=count) for _ in component_layout.field_names]
+        # Components are immutable, the ones with the same fields are shared
+        if len(columns) == 1:
+            (column,) = columns
+            values, inverse = np.unique(column, return_inverse=True)
+            rows = values.reshape(-1, 1)
+        else:
+            rows, inverse = np.unique(np.stack(columns, axis=1), axis=0, return_inverse=True)
+        unique_components = [
+            component_type(**_parse_fields(component_layout=component_layout, row=row)) for row in rows.tolist()
+        ]
+        return list(map(unique_components.__getitem__, inverse.reshape(-1).tolist()))
+
+    offsets = reader.read_array(dtype=_OFFSET_DTYPE, count=count + 1)
+    values = reader.read_array(dtype=_ENTITY_ID_DTYPE, count=int(offsets[-1])).tolist()
+    (field_name,) = component_layout.field_names
+    # Most of the sets are empty, they share a single component
+    components = [component_type(**{field_name: pyrsistent.pset()})] * count
+    for index in np.flatnonzero(np.diff(offsets)).tolist():
+        start, end = int(offsets[index]), int(offsets[index + 1])
+        entities = pyrsistent.pset(Entity(unique_id=unique_id) for unique_id in values[start:end])
+        components[index] = component_type(**{field_name: entities})
+    return components
+
+
+def load_ecdb(*, input_file_name: pathlib.Path) -> EntityComponentDatabase[ComponentUnion]:
+    """
+    Load a snapshot saved by save_ecdb, the entities keep their ids
+    """
+
+    with open(input_file_name, "rb") as input_file, mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        reader = _SnapshotReader(memoryview(data))
+        try:
+            return _load_ecdb(reader=reader, input_file_name=input_file_name)
+        finally:
+            # The arrays are views of the mapped file
+            reader.data.release()
+
+
+def _load_ecdb(*, reader: _SnapshotReader, input_file_name: pathlib.Path) -> EntityComponentDatabase[ComponentUnion]:
+    magic, version, number_of_ids, number_of_entities, number_of_sections = reader.read_struct(HEADER)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{input_file_name} is not a snapshot of version {VERSION}")
+
+    ecdb: EntityComponentDatabase[ComponentUnion] = create_ecdb()
+    ecdb, _ = add_entities(ecdb=ecdb, number_of_entities=number_of_ids)
+    alive = np.zeros(number_of_ids, dtype=bool)
+    alive[reader.read_array(dtype=_ENTITY_ID_DTYPE, count=number_of_entities)] = True
+
+    for _ in range(number_of_sections):
+        reader.align()
+        code, _, count = reader.read_struct(SECTION_HEADER)
+        component_layout = _LAYOUTS[code]
+        unique_ids = reader.read_array(dtype=_ENTITY_ID_DTYPE, count=count).astype(np.int64)
+        if component_layout.is_numeric:
+            columns: Dict[str, np.ndarray] = {
+                field_name: reader.read_array(dtype=_FIELD_DTYPE, count=count)
+                for field_name in component_layout.field_names
+            }
+            ecdb = add_component_columns(
+                ecdb=ecdb, unique_ids=unique_ids, component_type=component_layout.component_type, columns=columns
+            )
+        else:
+            components = _create_components(component_layout=component_layout, reader=reader, count=count)
+            ecdb = add_components(ecdb=ecdb, unique_ids=unique_ids, components=components)
+
+    # The ids of the entities are kept by adding the removed ones and removing them again, the last unique id of the
+    # database stays at number_of_ids
+    transaction = begin_transaction(ecdb=ecdb)
+    for unique_id in np.flatnonzero(~alive).tolist():
+        transaction.remove_entity(entity=Entity(unique_id=unique_id))
+    return transaction.commit()
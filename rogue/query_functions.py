@@ -0,0 +1,39 @@
+"""
+Rogue-specific queries, backed by the index of TypeComponent values when the ECS backend maintains one
+"""
+
+from typing import List, Union
+
+from pyrsistent.typing import PSet
+
+from rogue.generic.ecs import (
+    Entity,
+    EntityComponentDatabase,
+    get_unique_entity,
+    query_entities_by_component_value,
+)
+from rogue.components import ComponentUnion, TypeComponent
+from rogue.types import TypeEnum, ENEMY_TYPES, ITEM_TYPES, WEAPON_TYPES
+
+
+def query_entities_of_type(
+    *, ecdb: EntityComponentDatabase[ComponentUnion], entity_type: Union[TypeEnum, PSet[TypeEnum]]
+) -> List[Entity]:
+    entity_types = [entity_type] if isinstance(entity_type, TypeEnum) else entity_type
+    return query_entities_by_component_value(ecdb=ecdb, component_type=TypeComponent, values=entity_types)
+
+
+def get_entity_of_unique_type(*, ecdb: EntityComponentDatabase[ComponentUnion], entity_type: TypeEnum) -> Entity:
+    return get_unique_entity(ecdb=ecdb, component_type=TypeComponent, value=entity_type)
+
+
+def query_enemies(*, ecdb: EntityComponentDatabase[ComponentUnion]) -> List[Entity]:
+    return query_entities_of_type(ecdb=ecdb, entity_type=ENEMY_TYPES)
+
+
+def query_items(*, ecdb: EntityComponentDatabase[ComponentUnion]) -> List[Entity]:
+    return query_entities_of_type(ecdb=ecdb, entity_type=ITEM_TYPES)
+
+
+def query_weapons(*, ecdb: EntityComponentDatabase[ComponentUnion]) -> List[Entity]:
+    return query_entities_of_type(ecdb=ecdb, entity_type=WEAPON_TYPES)
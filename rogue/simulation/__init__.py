@@ -0,0 +1,3 @@
+from rogue.simulation.world import World, WorldStatus, get_world_status, compute_reward
+from rogue.simulation.batch import BatchSimulation, StepResult
+from rogue.simulation.environment import RogueEnvironment, TileEnum, TYPE_TO_CODE, HERO_STATS
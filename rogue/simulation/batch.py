@@ -0,0 +1,175 @@
+"""
+Many independent worlds stepped together, e.g. to train or to evaluate a hero policy.
+
+The worlds are sharded over worker processes, each worker owns a contiguous range of the worlds and steps all of them
+for a single message, so the cost of the communication is paid once per worker and step instead of once per world.
+"""
+
+import multiprocessing
+import multiprocessing.connection
+from typing import Any, List, Optional, Sequence
+
+import attr
+import numpy as np
+
+from rogue.io.loaders import RoomConfig
+from rogue.simulation.world import DEFAULT_MAX_EPISODE_TICKS, World
+from rogue.types import HeroCommandEnum
+
+_STEP = "step"
+_RESET = "reset"
+_CLOSE = "close"
+
+
+@attr.s(frozen=True, kw_only=True, cmp=False)
+class StepResult:
+    rewards: np.ndarray = attr.ib()
+    dones: np.ndarray = attr.ib()
+    # Return of the episodes that ended in this step, NaN for the others
+    episode_returns: np.ndarray = attr.ib()
+
+
+def _create_worlds(*, room_config: RoomConfig, world_seeds: Sequence[int], max_episode_ticks: int) -> List[World]:
+    return [World(room_config=room_config, seed=seed, max_episode_ticks=max_episode_ticks) for seed in world_seeds]
+
+
+def _step_worlds(*, worlds: Sequence[World], commands: np.ndarray) -> StepResult:
+    rewards = np.zeros(len(worlds), dtype=np.float32)
+    dones = np.zeros(len(worlds), dtype=bool)
+    episode_returns = np.full(len(worlds), np.nan, dtype=np.float32)
+    for index, (world, command) in enumerate(zip(worlds, commands.tolist())):
+        rewards[index], dones[index] = world.step(command=HeroCommandEnum(command))
+        if dones[index]:
+            episode_returns[index] = world.episode_return
+            world.reset()
+    return StepResult(rewards=rewards, dones=dones, episode_returns=episode_returns)
+
+
+def _run_worker(
+    connection: multiprocessing.connection.Connection,
+    room_config: RoomConfig,
+    world_seeds: Sequence[int],
+    max_episode_ticks: int,
+) -> None:
+    worlds = _create_worlds(room_config=room_config, world_seeds=world_seeds, max_episode_ticks=max_episode_ticks)
+    while True:
+        message, payload = connection.recv()
+        try:
+            if message == _STEP:
+                connection.send(_step_worlds(worlds=worlds, commands=payload))
+            elif message == _RESET:
+                for world in worlds:
+                    world.reset()
+                connection.send(None)
+            elif message == _CLOSE:
+                connection.close()
+                return
+            else:
+                raise ValueError(f"Unrecognized message: {message}")
+        except Exception as exception:
+            connection.send(exception)
+
+
+class BatchSimulation:
+    """
+    Steps `number_of_worlds` worlds with one call. Worlds whose episode ended are reset in the same step,
+    their done flag is set and the reward is the one of the last step of the ended episode.
+
+    With `number_of_processes` 0 the worlds are stepped in the calling process.
+    """
+
+    def __init__(
+        self,
+        *,
+        room_config: RoomConfig,
+        number_of_worlds: int,
+        number_of_processes: int = 0,
+        seed: int = 0,
+        max_episode_ticks: int = DEFAULT_MAX_EPISODE_TICKS,
+        start_method: Optional[str] = None,
+    ):
+        if number_of_worlds <= 0:
+            raise ValueError("number_of_worlds has to be positive")
+        self.number_of_worlds = number_of_worlds
+        world_seeds = [seed + world_index for world_index in range(number_of_worlds)]
+
+        self.worlds: List[World] = []
+        self.connections: List[multiprocessing.connection.Connection] = []
+        self.processes: List[Any] = []
+        self.shards: List[np.ndarray] = []
+        if number_of_processes == 0:
+            self.worlds = _create_worlds(
+                room_config=room_config, world_seeds=world_seeds, max_episode_ticks=max_episode_ticks
+            )
+            return
+
+        context = multiprocessing.get_context(start_method)
+        shards = np.array_split(np.arange(number_of_worlds), min(number_of_processes, number_of_worlds))
+        for shard in shards:
+            connection, worker_connection = context.Pipe()
+            process = context.Process(  # type: ignore
+                target=_run_worker,
+                args=(worker_connection, room_config, [world_seeds[index] for index in shard], max_episode_ticks),
+                daemon=True,
+            )
+            process.start()
+            worker_connection.close()
+            self.connections.append(connection)
+            self.processes.append(process)
+            self.shards.append(shard)
+
+    def __enter__(self) -> "BatchSimulation":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def _receive(self) -> List[Any]:
+        responses = [connection.recv() for connection in self.connections]
+        for response in responses:
+            if isinstance(response, Exception):
+                raise response
+        return responses
+
+    def step(self, *, commands: Optional[np.ndarray] = None) -> StepResult:
+        """
+        Run a tick in every world with the hero of world i following commands[i], the heroes wait by default
+        """
+
+        if commands is None:
+            commands = np.full(self.number_of_worlds, HeroCommandEnum.Wait, dtype=np.int64)
+        commands = np.asarray(commands)
+        if commands.shape != (self.number_of_worlds,):
+            raise ValueError(f"Expected {self.number_of_worlds} commands, got an array of shape {commands.shape}")
+
+        if len(self.connections) == 0:
+            return _step_worlds(worlds=self.worlds, commands=commands)
+
+        for connection, shard in zip(self.connections, self.shards):
+            connection.send((_STEP, commands[shard]))
+        results: List[StepResult] = self._receive()
+        return StepResult(
+            rewards=np.concatenate([result.rewards for result in results]),
+            dones=np.concatenate([result.dones for result in results]),
+            episode_returns=np.concatenate([result.episode_returns for result in results]),
+        )
+
+    def reset(self) -> None:
+        for world in self.worlds:
+            world.reset()
+        for connection in self.connections:
+            connection.send((_RESET, None))
+        self._receive()
+
+    def close(self) -> None:
+        for connection in self.connections:
+            try:
+                connection.send((_CLOSE, None))
+            except (BrokenPipeError, OSError):
+                pass
+            connection.close()
+        for process in self.processes:
+            process.join()
+        self.connections = []
+        self.processes = []
+        self.shards = []
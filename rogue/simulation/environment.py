@@ -0,0 +1,173 @@
+"""
+Gym-style environment for driving the hero from an agent, without a window.
+
+The observation is a dict of two arrays that are allocated once and updated in place by every step:
+"grid", the uint8 tile or entity code of every cell, and "hero", the HERO_STATS of the hero.
+Only the cells of the entities that changed since the previous step are rewritten, see ChangeTracker.
+Copy the arrays to keep the observation of a step.
+"""
+
+from enum import IntEnum
+from typing import AbstractSet, Any, Dict, List, Optional, Tuple, Type, cast
+
+import numpy as np
+import pyrsistent
+
+from rogue.io.loaders import RoomConfig
+from rogue.generic.ecs import (
+    EntityComponentDatabase,
+    get_components,
+)
+from rogue.components import (
+    ComponentUnion,
+    PositionComponent,
+    SizeComponent,
+    TypeComponent,
+    HealthComponent,
+    MoneyComponent,
+    InventoryComponent,
+    EquipmentComponent,
+)
+from rogue.systems.common.changes import ChangeTracker, Coordinates, RenderedState
+from rogue.systems.control_systems.functions import get_hero_entity
+from rogue.simulation.world import DEFAULT_MAX_EPISODE_TICKS, World
+from rogue.query_functions import query_entities_of_type
+from rogue.types import TypeEnum, HeroCommandEnum
+
+Observation = Dict[str, np.ndarray]
+
+
+class TileEnum(IntEnum):
+    Empty = 0
+    Floor = 1
+    Wall = 2
+
+
+# The code of every entity type follows the tile codes
+TYPE_TO_CODE: Dict[TypeEnum, int] = {entity_type: len(TileEnum) + index for index, entity_type in enumerate(TypeEnum)}
+NUMBER_OF_CODES = len(TileEnum) + len(TypeEnum)
+
+NUMBER_OF_ACTIONS = len(HeroCommandEnum)
+HERO_STATS = ("health", "money", "number_of_items", "number_of_equipped_items", "y_axis", "x_axis")
+
+STATIC_TYPES = pyrsistent.s(TypeEnum.Room, TypeEnum.Door)
+STATIC_COMPONENT_TYPES: List[Type[ComponentUnion]] = [PositionComponent, SizeComponent, TypeComponent]
+HERO_COMPONENT_TYPES: List[Type[ComponentUnion]] = [
+    PositionComponent,
+    HealthComponent,
+    MoneyComponent,
+    InventoryComponent,
+    EquipmentComponent,
+]
+
+
+def _get_static_components(
+    *, ecdb: EntityComponentDatabase[ComponentUnion]
+) -> List[Tuple[TypeEnum, PositionComponent, Optional[SizeComponent]]]:
+    static_components = []
+    for entity in query_entities_of_type(ecdb=ecdb, entity_type=STATIC_TYPES):
+        position_component, size_component, type_component = cast(
+            Tuple[PositionComponent, Optional[SizeComponent], TypeComponent],
+            get_components(ecdb=ecdb, entity=entity, component_types=STATIC_COMPONENT_TYPES),
+        )
+        static_components.append((type_component.entity_type, position_component, size_component))
+    return static_components
+
+
+def compute_grid_shape(*, ecdb: EntityComponentDatabase[ComponentUnion]) -> Tuple[int, int]:
+    """
+    Height and width of the smallest grid that fits all of the rooms and doors
+    """
+
+    height, width = 1, 1
+    for _, position_component, size_component in _get_static_components(ecdb=ecdb):
+        room_height, room_width = (size_component.height, size_component.width) if size_component else (0, 0)
+        height = max(height, position_component.y_axis + room_height + 1)
+        width = max(width, position_component.x_axis + room_width + 1)
+    return height, width
+
+
+def render_static_grid(*, ecdb: EntityComponentDatabase[ComponentUnion], grid: np.ndarray) -> None:
+    grid.fill(TileEnum.Empty)
+    static_components = _get_static_components(ecdb=ecdb)
+    for entity_type, position_component, size_component in static_components:
+        if entity_type != TypeEnum.Room or size_component is None:
+            continue
+        y_axis, x_axis = position_component.y_axis, position_component.x_axis
+        grid[y_axis : y_axis + size_component.height + 1, x_axis : x_axis + size_component.width + 1] = TileEnum.Wall
+        grid[y_axis + 1 : y_axis + size_component.height, x_axis + 1 : x_axis + size_component.width] = TileEnum.Floor
+    # Doors are drawn over the walls
+    for entity_type, position_component, size_component in static_components:
+        if entity_type == TypeEnum.Door:
+            grid[position_component.y_axis, position_component.x_axis] = TYPE_TO_CODE[entity_type]
+
+
+class RogueEnvironment:
+    """
+    reset and step follow the Gym API: reset returns the observation and an info dict, step returns the observation,
+    the reward, whether the episode terminated (the level was cleared), whether it was truncated
+    (after `max_episode_ticks` ticks) and an info dict. Actions are the values of HeroCommandEnum.
+    The same seed passed to reset followed by the same actions gives the same observations.
+
+    The grid is sized to the level of `room_config`, entities outside of it are not observed.
+    """
+
+    def __init__(self, *, room_config: RoomConfig, seed: int = 0, max_episode_ticks: int = DEFAULT_MAX_EPISODE_TICKS):
+        self.world = World(room_config=room_config, seed=seed, max_episode_ticks=max_episode_ticks, track_changes=True)
+        self.grid_shape = compute_grid_shape(ecdb=self.world.ecdb)
+        self.static_grid = np.zeros(self.grid_shape, dtype=np.uint8)
+        self.grid = np.zeros(self.grid_shape, dtype=np.uint8)
+        self.hero_stats = np.zeros(len(HERO_STATS), dtype=np.int32)
+        self.observation: Observation = {"grid": self.grid, "hero": self.hero_stats}
+
+    def _update_cells(self, *, change_tracker: ChangeTracker, dirty_cells: AbstractSet[Coordinates]) -> None:
+        height, width = self.grid_shape
+        for coordinates in dirty_cells:
+            y_axis, x_axis = coordinates
+            if not (0 <= y_axis < height and 0 <= x_axis < width):
+                continue
+            self.grid[y_axis, x_axis] = self._get_cell_code(change_tracker=change_tracker, coordinates=coordinates)
+
+    def _get_cell_code(self, *, change_tracker: ChangeTracker, coordinates: Coordinates) -> int:
+        # The entity with the highest id is observed when several share a cell, as the render systems draw them
+        code = int(self.static_grid[coordinates])
+        for entity in change_tracker.get_entities_at(coordinates):
+            _, type_component = cast(RenderedState, change_tracker.get_rendered_state(entity))
+            if type_component.entity_type not in STATIC_TYPES:
+                code = TYPE_TO_CODE[type_component.entity_type]
+        return code
+
+    def _update_hero_stats(self) -> None:
+        ecdb = self.world.ecdb
+        position_component, health_component, money_component, inventory_component, equipment_component = cast(
+            Tuple[PositionComponent, HealthComponent, MoneyComponent, InventoryComponent, EquipmentComponent],
+            get_components(ecdb=ecdb, entity=get_hero_entity(ecdb=ecdb), component_types=HERO_COMPONENT_TYPES),
+        )
+        self.hero_stats[:] = (
+            health_component.amount,
+            money_component.amount,
+            len(inventory_component.entities),
+            len(equipment_component.entities),
+            position_component.y_axis,
+            position_component.x_axis,
+        )
+
+    def _update_observation(self) -> None:
+        change_tracker = cast(ChangeTracker, self.world.change_tracker)
+        change_set = change_tracker.compute_change_set(ecdb=self.world.ecdb)
+        if change_set.is_full:
+            render_static_grid(ecdb=self.world.ecdb, grid=self.static_grid)
+            self.grid[:] = self.static_grid
+        self._update_cells(change_tracker=change_tracker, dirty_cells=change_set.dirty_cells)
+        self._update_hero_stats()
+
+    def reset(self, *, seed: Optional[int] = None) -> Tuple[Observation, Dict[str, Any]]:
+        self.world.reset(seed=seed)
+        self._update_observation()
+        return self.observation, {}
+
+    def step(self, action: int) -> Tuple[Observation, float, bool, bool, Dict[str, Any]]:
+        reward, done = self.world.step(command=HeroCommandEnum(action))
+        self._update_observation()
+        terminated = self.world.status.is_cleared
+        return self.observation, reward, terminated, done and not terminated, {}
@@ -0,0 +1,162 @@
+"""
+A single game run step by step by a scripted or learned hero, with the reward and end of every step.
+"""
+
+from typing import Optional, Tuple, cast
+
+import attr
+import numpy as np
+
+from rogue.io.loaders import RoomConfig, load_rogue_ecdb_from_room_config
+from rogue.generic.ecs import (
+    EntityComponentDatabase,
+    Systems,
+    create_systems,
+    add_system,
+    get_component,
+    process_systems,
+)
+from rogue.components import ComponentUnion, MoneyComponent, PositionComponent
+from rogue.systems import (
+    SystemUnion,
+    process_system,
+    process_action,
+    MovementSystem,
+    EnemyAISystem,
+    CollisionDetectionSystem,
+    ScriptedHeroControlSystem,
+)
+from rogue.systems.common.system import ProcessAction, batch_actions_of_systems
+from rogue.systems.common.coalescing import ActionCoalescer
+from rogue.systems.common.changes import ChangeTracker
+from rogue.systems.control_systems.functions import get_hero_entity
+from rogue.query_functions import query_enemies, query_entities_of_type
+from rogue.exceptions import IgnoreTimeStepException
+from rogue.types import TypeEnum, HeroCommandEnum
+
+DEFAULT_MAX_EPISODE_TICKS = 1000
+DEFEATED_ENEMY_REWARD = 10.0
+
+# As in the games, the actions of every system are coalesced and committed in a single transaction
+_tick_process_system = batch_actions_of_systems(ActionCoalescer().wrap_process_system(process_system))
+
+
+@attr.s(frozen=True, kw_only=True)
+class WorldStatus:
+    money: int = attr.ib()
+    number_of_enemies: int = attr.ib()
+    number_of_gold: int = attr.ib()
+
+    @property
+    def is_cleared(self) -> bool:
+        return self.number_of_enemies == 0 and self.number_of_gold == 0
+
+
+def get_world_status(*, ecdb: EntityComponentDatabase[ComponentUnion]) -> WorldStatus:
+    hero_money_component = cast(
+        MoneyComponent, get_component(ecdb=ecdb, entity=get_hero_entity(ecdb=ecdb), component_type=MoneyComponent)
+    )
+    # Gold that was picked up has no position anymore
+    number_of_gold = len(
+        [
+            entity
+            for entity in query_entities_of_type(ecdb=ecdb, entity_type=TypeEnum.Gold)
+            if get_component(ecdb=ecdb, entity=entity, component_type=PositionComponent) is not None
+        ]
+    )
+    return WorldStatus(
+        money=hero_money_component.amount,
+        number_of_enemies=len(query_enemies(ecdb=ecdb)),
+        number_of_gold=number_of_gold,
+    )
+
+
+def compute_reward(*, previous_status: WorldStatus, status: WorldStatus) -> float:
+    """
+    The money picked up plus DEFEATED_ENEMY_REWARD per defeated enemy
+    """
+
+    defeated_enemies = previous_status.number_of_enemies - status.number_of_enemies
+    return float(status.money - previous_status.money) + DEFEATED_ENEMY_REWARD * defeated_enemies
+
+
+def create_world_systems(
+    *, hero_control_system: ScriptedHeroControlSystem, seed: Optional[int] = None
+) -> Systems[SystemUnion]:
+
+    systems: Systems[SystemUnion] = create_systems()
+    systems = add_system(systems=systems, priority=0, system=hero_control_system)
+    systems = add_system(systems=systems, priority=0, system=EnemyAISystem.create(batched=True, seed=seed))
+    systems = add_system(systems=systems, priority=1, system=CollisionDetectionSystem.create())
+    systems = add_system(systems=systems, priority=2, system=MovementSystem.create())
+    return systems
+
+
+class World:
+    """
+    An episode ends when the level is cleared of enemies and gold, or after `max_episode_ticks` ticks.
+    Every episode starts from `room_config` with its own seed derived from `seed` and the number of the episode.
+    The enemies move using that seed only, so episodes are reproducible whatever the state of the `random` module.
+
+    With `track_changes` the actions of every episode are recorded by `change_tracker`, e.g. to update observations.
+    """
+
+    def __init__(
+        self,
+        *,
+        room_config: RoomConfig,
+        seed: int,
+        max_episode_ticks: int = DEFAULT_MAX_EPISODE_TICKS,
+        track_changes: bool = False,
+    ):
+        self.room_config = room_config
+        self.seed = seed
+        self.max_episode_ticks = max_episode_ticks
+        self.track_changes = track_changes
+        self.number_of_episodes = 0
+        self.reset()
+
+    def reset(self, *, seed: Optional[int] = None) -> None:
+        """
+        Start the next episode, a new `seed` restarts the sequence of episode seeds
+        """
+
+        if seed is not None:
+            self.seed = seed
+            self.number_of_episodes = 0
+        episode_seed = int(np.random.SeedSequence([self.seed, self.number_of_episodes]).generate_state(1)[0])
+        self.ecdb = load_rogue_ecdb_from_room_config(self.room_config)
+        self.change_tracker = ChangeTracker() if self.track_changes else None
+        self.process_action: ProcessAction = process_action
+        if self.change_tracker is not None:
+            self.process_action = self.change_tracker.wrap_process_action(process_action)
+        self.hero_control_system = ScriptedHeroControlSystem.create()
+        self.systems = create_world_systems(hero_control_system=self.hero_control_system, seed=episode_seed)
+        self.status = get_world_status(ecdb=self.ecdb)
+        self.number_of_ticks = 0
+        self.episode_return = 0.0
+        self.number_of_episodes += 1
+
+    def step(self, *, command: HeroCommandEnum) -> Tuple[float, bool]:
+        """
+        Run a tick with the hero following `command`, return the reward of the tick and whether the episode ended
+        """
+
+        self.hero_control_system.commands.append(command)
+        try:
+            self.ecdb = process_systems(
+                ecdb=self.ecdb,
+                systems=self.systems,
+                process_system=_tick_process_system,
+                process_action=self.process_action,
+            )
+        except IgnoreTimeStepException:
+            pass
+        self.hero_control_system.commands.clear()
+        self.number_of_ticks += 1
+
+        status = get_world_status(ecdb=self.ecdb)
+        reward = compute_reward(previous_status=self.status, status=status)
+        self.status = status
+        self.episode_return += reward
+        return reward, status.is_cleared or self.number_of_ticks >= self.max_episode_ticks
@@ -1,4 +1,10 @@
-from rogue.systems.common.system import SystemUnion, process_system, process_action
+from rogue.systems.common.system import (
+    SystemUnion,
+    process_system,
+    process_action,
+    process_actions,
+    batch_actions_of_systems,
+)
 from .collision_detection_system import CollisionDetectionSystem
 from .enemy_ai_system import EnemyAISystem
 from .movement_system import MovementSystem
@@ -6,3 +12,5 @@ from .pygame_hero_control_system import PygameHeroControlSystem
 from .pygcurse_render_system import PygcurseRenderSystem
 from .panda3d_render_system import Panda3dRenderSystem
 from .pynput_hero_control_system import PynputHeroControlSystem
+from .scripted_hero_control_system import ScriptedHeroControlSystem
+from .terminal_render_system import TerminalRenderSystem
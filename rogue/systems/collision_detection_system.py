@@ -1,6 +1,8 @@
 from typing import (
     cast,
+    Dict,
     Optional,
+    Set,
     Tuple,
     Generator,
     List,
@@ -16,6 +18,7 @@ from rogue.generic.ecs import (
     EntityComponentDatabase,
     get_component,
     query,
+    query_columns,
     Entity,
 )
 from rogue.components import (
@@ -38,7 +41,7 @@ from rogue.systems.common.constants import ZERO_VELOCITY_COMPONENT
 from rogue.types import TypeEnum, ITEM_TYPES, ENEMY_TYPES
 
 Coordinates = Tuple[int, int]
-Grid = PMap[Coordinates, Entity]
+Cells = Dict[Coordinates, Entity]
 
 
 def get_entity_type(*, ecdb: EntityComponentDatabase[ComponentUnion], entity: Entity) -> TypeEnum:
@@ -47,47 +50,127 @@ def get_entity_type(*, ecdb: EntityComponentDatabase[ComponentUnion], entity: En
 
 
 def _populate_grid_entity(
-    *, grid: Grid, entity: Entity, position_component: PositionComponent, size_component: Optional[SizeComponent],
-) -> Grid:
+    *, cells: Cells, entity: Entity, position_component: PositionComponent, size_component: Optional[SizeComponent],
+) -> None:
     if size_component is not None:
 
         for y_coordinate in range(position_component.y_axis, position_component.y_axis + size_component.height + 1):
             for x_coordinate in [position_component.x_axis, position_component.x_axis + size_component.width]:
-                grid_position = (y_coordinate, x_coordinate)
-                grid = grid.set(grid_position, entity)
+                cells[(y_coordinate, x_coordinate)] = entity
 
         for x_coordinate in range(position_component.x_axis, position_component.x_axis + size_component.width + 1):
             for y_coordinate in [position_component.y_axis, position_component.y_axis + size_component.height]:
-                grid_position = (y_coordinate, x_coordinate)
-                grid = grid.set(grid_position, entity)
+                cells[(y_coordinate, x_coordinate)] = entity
     else:
-        grid_position = (position_component.y_axis, position_component.x_axis)
-        grid = grid.set(grid_position, entity)
+        cells[(position_component.y_axis, position_component.x_axis)] = entity
 
-    return grid
 
+@attr.s(frozen=True, kw_only=True)
+class Mover:
+    entity: Entity = attr.ib()
+    coordinates: Coordinates = attr.ib()
+    velocity: Coordinates = attr.ib()
 
-def _populate_grid(*, ecdb: EntityComponentDatabase[ComponentUnion]) -> Grid:
-    grid: Grid = pyrsistent.pmap()
 
-    component_types: List[Type[ComponentUnion]] = [
-        PositionComponent,
+def _query_movers(*, ecdb: EntityComponentDatabase[ComponentUnion]) -> List[Mover]:
+    component_types: List[Type[ComponentUnion]] = [PositionComponent, VelocityComponent]
+    unique_ids, (position_columns, velocity_columns) = query_columns(ecdb=ecdb, component_types=component_types)
+    return [
+        Mover(entity=Entity(unique_id=unique_id), coordinates=(y_axis, x_axis), velocity=(y_velocity, x_velocity))
+        for unique_id, y_axis, x_axis, y_velocity, x_velocity in zip(
+            unique_ids.tolist(),
+            position_columns["y_axis"].tolist(),
+            position_columns["x_axis"].tolist(),
+            velocity_columns["y_axis"].tolist(),
+            velocity_columns["x_axis"].tolist(),
+        )
     ]
-    for entity, (position_component,) in query(ecdb=ecdb, component_types=component_types):
-        size_component = get_component(ecdb=ecdb, entity=entity, component_type=SizeComponent)
 
-        grid = _populate_grid_entity(
-            grid=grid, entity=entity, position_component=position_component, size_component=size_component,
+
+class CollisionGrid:
+    """
+    Occupancy grid kept across ticks.
+
+    The cells of the entities that cannot move (rooms, doors and items) are written once, when the grid is first
+    synchronized. After that, only the cells of the movers (entities with a VelocityComponent) whose position
+    changed or who were removed since the previous tick are updated.
+    Items leave the grid when a mover steps on them, cells whose entity lost its position are dropped when reached.
+    A grid follows the versions of a single database, it is never rebuilt for another one.
+    """
+
+    def __init__(self) -> None:
+        self.cells: Cells = {}
+        self._mover_coordinates: Dict[Entity, Coordinates] = {}
+        self._is_populated = False
+
+    def _populate_static_cells(self, *, ecdb: EntityComponentDatabase[ComponentUnion]) -> None:
+        component_types: List[Type[ComponentUnion]] = [PositionComponent]
+        for entity, (position_component,) in query(ecdb=ecdb, component_types=component_types):
+            if get_component(ecdb=ecdb, entity=entity, component_type=VelocityComponent) is not None:
+                continue
+            size_component = get_component(ecdb=ecdb, entity=entity, component_type=SizeComponent)
+            _populate_grid_entity(
+                cells=self.cells, entity=entity, position_component=position_component, size_component=size_component,
+            )
+        self._is_populated = True
+
+    def _vacate(self, *, entity: Entity, coordinates: Coordinates) -> None:
+        if self.cells.get(coordinates) == entity:
+            del self.cells[coordinates]
+
+    def synchronize(self, *, ecdb: EntityComponentDatabase[ComponentUnion], movers: List[Mover]) -> None:
+        if not self._is_populated:
+            self._populate_static_cells(ecdb=ecdb)
+
+        mover_coordinates = {mover.entity: mover.coordinates for mover in movers}
+        for entity, coordinates in self._mover_coordinates.items():
+            if mover_coordinates.get(entity) != coordinates:
+                self._vacate(entity=entity, coordinates=coordinates)
+        for entity, coordinates in mover_coordinates.items():
+            if self._mover_coordinates.get(entity) != coordinates:
+                self.cells[coordinates] = entity
+        self._mover_coordinates = mover_coordinates
+
+    def drop_stale_cell(
+        self, *, ecdb: EntityComponentDatabase[ComponentUnion], entity: Entity, coordinates: Coordinates
+    ) -> bool:
+        """
+        Remove the cell of an entity that cannot move if the entity is not at `coordinates` anymore
+        """
+
+        if entity in self._mover_coordinates:
+            return False
+        if get_component(ecdb=ecdb, entity=entity, component_type=SizeComponent) is not None:
+            return False
+        position_component = cast(
+            Optional[PositionComponent], get_component(ecdb=ecdb, entity=entity, component_type=PositionComponent)
         )
-    print(grid)
+        if position_component is not None and (position_component.y_axis, position_component.x_axis) == coordinates:
+            return False
+        self._vacate(entity=entity, coordinates=coordinates)
+        return True
+
+
+@attr.s(frozen=True, kw_only=True)
+class Grid:
+    """
+    View of the collision grid during a single tick, the moves resolved in this tick are kept in an overlay
+    so that the persistent cells are only updated from the actual positions on the next tick
+    """
 
-    return grid
+    cells: Cells = attr.ib()
+    overlay: PMap[Coordinates, Optional[Entity]] = attr.ib(default=pyrsistent.pmap())
+
+    def get(self, coordinates: Coordinates) -> Optional[Entity]:
+        if coordinates in self.overlay:
+            return self.overlay[coordinates]
+        return self.cells.get(coordinates)
 
 
 def _move_entity(*, grid: Grid, entity: Entity, coordinates: Coordinates, new_coordinates: Coordinates) -> Grid:
-    grid = grid.remove(coordinates)
-    grid = grid.set(new_coordinates, entity)
-    return grid
+    overlay = grid.overlay.set(coordinates, None)
+    overlay = overlay.set(new_coordinates, entity)
+    return evolve(grid, overlay=overlay)
 
 
 def _pick_up_gold(
@@ -166,25 +249,32 @@ def _handle_enemy(
 
 
 def _resolve_collisions(
-    *, ecdb: EntityComponentDatabase[ComponentUnion], grid: Grid,
+    *, ecdb: EntityComponentDatabase[ComponentUnion], collision_grid: CollisionGrid, movers: List[Mover],
 ) -> Generator[ActionUnion, None, None]:
 
-    for coordinates in list(grid):
-        entity = grid[coordinates]
-
-        velocity_component = cast(
-            Optional[VelocityComponent], get_component(ecdb=ecdb, entity=entity, component_type=VelocityComponent)
-        )
+    grid = Grid(cells=collision_grid.cells)
+    # Enemies defeated by the hero earlier in the tick don't move anymore
+    removed_entities: Set[Entity] = set()
+    for mover in movers:
+        entity = mover.entity
+        if entity in removed_entities:
+            continue
+        coordinates = mover.coordinates
 
-        if velocity_component is None:
+        y_velocity, x_velocity = mover.velocity
+        if y_velocity == 0 and x_velocity == 0:
             continue
 
         y_axis, x_axis = coordinates
-        new_coordinates = y_axis + velocity_component.y_axis, x_axis + velocity_component.x_axis
+        new_coordinates = y_axis + y_velocity, x_axis + x_velocity
 
-        if new_coordinates in grid:
-            other_entity = grid[new_coordinates]
+        other_entity = grid.get(new_coordinates)
+        if other_entity is not None and collision_grid.drop_stale_cell(
+            ecdb=ecdb, entity=other_entity, coordinates=new_coordinates
+        ):
+            other_entity = None
 
+        if other_entity is not None:
             entity_type = get_entity_type(ecdb=ecdb, entity=entity)
             other_entity_type = get_entity_type(ecdb=ecdb, entity=other_entity)
 
@@ -209,6 +299,7 @@ def _resolve_collisions(
                     enemy_entity=other_entity,
                     enemy_coordinates=new_coordinates,
                 )
+                removed_entities.update(action.entity for action in actions if isinstance(action, RemoveEntityAction))
                 yield from actions
             else:
                 yield AddComponentAction(entity=entity, component=ZERO_VELOCITY_COMPONENT)
@@ -218,14 +309,24 @@ def _resolve_collisions(
 
 @attr.s(frozen=True, kw_only=True)
 class CollisionDetectionSystem(YieldChangesSystemTrait):
+    """
+    Resolves the moves of the entities with a VelocityComponent in the order of their ids.
+    The occupancy grid is kept in `collision_grid` and updated incrementally, see CollisionGrid.
+    Although the system is frozen, the grid is mutable state of the world it first ran on: a system is not reusable
+    across worlds (e.g. a new level), create a new one with create() for each world.
+    """
+
+    collision_grid: CollisionGrid = attr.ib(cmp=False)
+
     @classmethod
     def create(cls) -> "CollisionDetectionSystem":
-        return cls()
+        return cls(collision_grid=CollisionGrid())
 
     def __call__(self, *, ecdb: EntityComponentDatabase[ComponentUnion]) -> Generator[ActionUnion, None, None]:
 
-        grid = _populate_grid(ecdb=ecdb)
+        movers = _query_movers(ecdb=ecdb)
+        self.collision_grid.synchronize(ecdb=ecdb, movers=movers)
 
         yield from _resolve_collisions(
-            ecdb=ecdb, grid=grid,
+            ecdb=ecdb, collision_grid=self.collision_grid, movers=movers,
         )
@@ -1,6 +1,7 @@
-from typing import Type, Union
+from typing import Generator, Iterable, Mapping, Tuple, Type, Union
 
 import attr
+import numpy as np
 
 from rogue.generic.ecs import Entity
 from rogue.components import ComponentUnion
@@ -23,4 +24,38 @@ class RemoveComponentAction:
     component_type: Type[ComponentUnion] = attr.ib()
 
 
-ActionUnion = Union[RemoveEntityAction, AddComponentAction, RemoveComponentAction]
+@attr.s(frozen=True, kw_only=True, cmp=False)
+class AddComponentColumnsAction:
+    """
+    Set the component of type `component_type` of every entity in `unique_ids` from the columns of its fields
+    """
+
+    unique_ids: np.ndarray = attr.ib()
+    component_type: Type[ComponentUnion] = attr.ib()
+    columns: Mapping[str, np.ndarray] = attr.ib()
+
+
+@attr.s(frozen=True, kw_only=True)
+class TransactionAction:
+    """
+    Apply all of `actions` in a single transaction
+    """
+
+    actions: Tuple["ActionUnion", ...] = attr.ib()
+
+
+ActionUnion = Union[
+    RemoveEntityAction, AddComponentAction, RemoveComponentAction, AddComponentColumnsAction, TransactionAction
+]
+
+
+def flatten_actions(actions: Iterable[ActionUnion]) -> Generator[ActionUnion, None, None]:
+    """
+    Yield `actions` in order with the actions of every TransactionAction inlined
+    """
+
+    for action in actions:
+        if isinstance(action, TransactionAction):
+            yield from flatten_actions(action.actions)
+        else:
+            yield action
@@ -0,0 +1,191 @@
+"""
+Change sets of the rendered state of the world.
+
+A render system only needs the position and the type of every entity. ChangeTracker records which entities the
+actions of a tick touched and, when a render system asks for it, diffs only those entities against the state it
+rendered last. The cost of a frame then follows the number of changed entities rather than the size of the world.
+Entities are expected to be created by the loader, before the first frame.
+"""
+
+from typing import (
+    AbstractSet,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    cast,
+)
+
+import attr
+
+from rogue.generic.ecs import (
+    Entity,
+    EntityComponentDatabase,
+    get_components,
+    query,
+)
+from rogue.components import ComponentUnion, PositionComponent, TypeComponent
+from rogue.systems.common.actions import (
+    ActionUnion,
+    AddComponentAction,
+    AddComponentColumnsAction,
+    RemoveComponentAction,
+    RemoveEntityAction,
+    flatten_actions,
+)
+
+Coordinates = Tuple[int, int]
+RenderedState = Tuple[PositionComponent, TypeComponent]
+
+# rogue.systems.common.system.ProcessAction, which can't be imported here because system imports the render systems
+ProcessAction = Callable[
+    [EntityComponentDatabase[ComponentUnion], ActionUnion], EntityComponentDatabase[ComponentUnion]
+]
+
+RENDERED_COMPONENT_TYPES: List[Type[ComponentUnion]] = [PositionComponent, TypeComponent]
+
+
+def _get_coordinates(rendered_state: RenderedState) -> Coordinates:
+    position_component, _ = rendered_state
+    return position_component.y_axis, position_component.x_axis
+
+
+def _get_rendered_state(*, ecdb: EntityComponentDatabase[ComponentUnion], entity: Entity) -> Optional[RenderedState]:
+    try:
+        position_component, type_component = cast(
+            Tuple[Optional[PositionComponent], Optional[TypeComponent]],
+            get_components(ecdb=ecdb, entity=entity, component_types=RENDERED_COMPONENT_TYPES),
+        )
+    except KeyError:
+        return None
+    if position_component is None or type_component is None:
+        return None
+    return position_component, type_component
+
+
+@attr.s(frozen=True, kw_only=True)
+class ChangeSet:
+    """
+    Entities added to, removed from or changed in the rendered state since the previous change set.
+    A full change set is produced for the first frame, every entity in it is added.
+    """
+
+    is_full: bool = attr.ib()
+    added: FrozenSet[Entity] = attr.ib()
+    removed: FrozenSet[Entity] = attr.ib()
+    changed: FrozenSet[Entity] = attr.ib()
+    dirty_cells: FrozenSet[Coordinates] = attr.ib()
+
+    def __len__(self) -> int:
+        return len(self.added) + len(self.removed) + len(self.changed)
+
+
+class ChangeTracker:
+    def __init__(self) -> None:
+        self._rendered_states: Dict[Entity, RenderedState] = {}
+        self._cells: Dict[Coordinates, Set[Entity]] = {}
+        self._touched_entities: Set[Entity] = set()
+        self._is_initialized = False
+
+    def record(self, action: ActionUnion) -> None:
+        for flat_action in flatten_actions([action]):
+            if isinstance(flat_action, AddComponentAction):
+                if type(flat_action.component) in RENDERED_COMPONENT_TYPES:
+                    self._touched_entities.add(flat_action.entity)
+            elif isinstance(flat_action, RemoveComponentAction):
+                if flat_action.component_type in RENDERED_COMPONENT_TYPES:
+                    self._touched_entities.add(flat_action.entity)
+            elif isinstance(flat_action, RemoveEntityAction):
+                self._touched_entities.add(flat_action.entity)
+            elif isinstance(flat_action, AddComponentColumnsAction):
+                if flat_action.component_type in RENDERED_COMPONENT_TYPES:
+                    self._touched_entities.update(
+                        Entity(unique_id=unique_id) for unique_id in flat_action.unique_ids.tolist()
+                    )
+
+    def wrap_process_action(self, process_action: ProcessAction) -> ProcessAction:
+        def tracked_process_action(
+            ecdb: EntityComponentDatabase[ComponentUnion], action: ActionUnion
+        ) -> EntityComponentDatabase[ComponentUnion]:
+            self.record(action)
+            return process_action(ecdb, action)
+
+        return tracked_process_action
+
+    def get_rendered_state(self, entity: Entity) -> Optional[RenderedState]:
+        return self._rendered_states.get(entity)
+
+    def get_entities_at(self, coordinates: Coordinates) -> List[Entity]:
+        """
+        Rendered entities at `coordinates`, ordered by unique id
+        """
+
+        return sorted(self._cells.get(coordinates, ()), key=lambda entity: entity.unique_id)
+
+    def _set_rendered_state(self, *, entity: Entity, rendered_state: Optional[RenderedState]) -> None:
+        previous_rendered_state = self._rendered_states.pop(entity, None)
+        if previous_rendered_state is not None:
+            self._cells[_get_coordinates(previous_rendered_state)].discard(entity)
+        if rendered_state is not None:
+            self._rendered_states[entity] = rendered_state
+            self._cells.setdefault(_get_coordinates(rendered_state), set()).add(entity)
+
+    def _compute_full_change_set(self, *, ecdb: EntityComponentDatabase[ComponentUnion]) -> ChangeSet:
+        self._rendered_states.clear()
+        self._cells.clear()
+        for entity, components in query(ecdb=ecdb, component_types=RENDERED_COMPONENT_TYPES):
+            self._set_rendered_state(entity=entity, rendered_state=cast(RenderedState, components))
+        self._is_initialized = True
+        return ChangeSet(
+            is_full=True,
+            added=frozenset(self._rendered_states),
+            removed=frozenset(),
+            changed=frozenset(),
+            dirty_cells=frozenset(self._cells),
+        )
+
+    def compute_change_set(self, *, ecdb: EntityComponentDatabase[ComponentUnion]) -> ChangeSet:
+        """
+        Diff the entities touched since the previous call against their rendered state and make `ecdb` the new
+        rendered state
+        """
+
+        touched_entities: AbstractSet[Entity] = self._touched_entities
+        self._touched_entities = set()
+        if not self._is_initialized:
+            return self._compute_full_change_set(ecdb=ecdb)
+
+        added: Set[Entity] = set()
+        removed: Set[Entity] = set()
+        changed: Set[Entity] = set()
+        dirty_cells: Set[Coordinates] = set()
+        for entity in touched_entities:
+            previous_rendered_state = self._rendered_states.get(entity)
+            rendered_state = _get_rendered_state(ecdb=ecdb, entity=entity)
+            if previous_rendered_state == rendered_state:
+                continue
+
+            if previous_rendered_state is None:
+                added.add(entity)
+            elif rendered_state is None:
+                removed.add(entity)
+            else:
+                changed.add(entity)
+
+            if previous_rendered_state is not None:
+                dirty_cells.add(_get_coordinates(previous_rendered_state))
+            if rendered_state is not None:
+                dirty_cells.add(_get_coordinates(rendered_state))
+            self._set_rendered_state(entity=entity, rendered_state=rendered_state)
+
+        return ChangeSet(
+            is_full=False,
+            added=frozenset(added),
+            removed=frozenset(removed),
+            changed=frozenset(changed),
+            dirty_cells=frozenset(dirty_cells),
+        )
@@ -0,0 +1,133 @@
+"""
+Coalescing of the actions of a system before they reach the ECDB.
+
+Only the last write to the same (entity, component type) is kept, writes to an entity that is removed right after
+them are dropped and writes that would store the value that is already in the ECDB are skipped.
+AddComponentColumnsAction and RemoveEntityAction are barriers: the writes are never moved across them, and the ones
+after the first barrier are always kept, since the ECDB doesn't tell their previous value anymore.
+"""
+
+import atexit
+from typing import (
+    Dict,
+    Generator,
+    List,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+
+from loguru import logger
+
+from rogue.generic.ecs import Entity, EntityComponentDatabase, get_component
+from rogue.components import ComponentUnion
+from rogue.systems.common.actions import (
+    ActionUnion,
+    AddComponentAction,
+    RemoveComponentAction,
+    RemoveEntityAction,
+    flatten_actions,
+)
+from rogue.systems.common.system import ProcessSystem, SystemUnion
+
+_ComponentKey = Tuple[Entity, Type[ComponentUnion]]
+_ComponentWrite = Union[AddComponentAction, RemoveComponentAction]
+
+
+def _get_key(action: _ComponentWrite) -> _ComponentKey:
+    if isinstance(action, AddComponentAction):
+        return action.entity, type(action.component)
+    return action.entity, action.component_type
+
+
+def _is_identical(*, ecdb: EntityComponentDatabase[ComponentUnion], action: _ComponentWrite) -> bool:
+    entity, component_type = _get_key(action)
+    try:
+        current_component = get_component(ecdb=ecdb, entity=entity, component_type=component_type)
+    except KeyError:
+        # Keep the writes to missing entities, applying them reports the error
+        return False
+    if isinstance(action, AddComponentAction):
+        return bool(current_component == action.component)
+    return current_component is None
+
+
+class ActionCoalescer:
+    """
+    Counts the actions it receives and the actions it eliminates over the whole run
+    """
+
+    def __init__(self) -> None:
+        self.number_of_actions = 0
+        self.number_of_overwritten_actions = 0
+        self.number_of_actions_on_removed_entities = 0
+        self.number_of_identical_actions = 0
+
+    @property
+    def number_of_eliminated_actions(self) -> int:
+        return (
+            self.number_of_overwritten_actions
+            + self.number_of_actions_on_removed_entities
+            + self.number_of_identical_actions
+        )
+
+    def coalesce(
+        self, *, ecdb: EntityComponentDatabase[ComponentUnion], actions: Sequence[ActionUnion]
+    ) -> List[ActionUnion]:
+        """
+        Coalesce `actions` that are about to be applied to `ecdb` in order
+        """
+
+        coalesced_actions: List[ActionUnion] = []
+        pending_writes: Dict[_ComponentKey, _ComponentWrite] = {}
+        # Whether `ecdb` still holds the values that the pending writes replace
+        is_ecdb_current = True
+
+        def flush() -> None:
+            for action in pending_writes.values():
+                if is_ecdb_current and _is_identical(ecdb=ecdb, action=action):
+                    self.number_of_identical_actions += 1
+                else:
+                    coalesced_actions.append(action)
+            pending_writes.clear()
+
+        for action in flatten_actions(actions):
+            self.number_of_actions += 1
+            if isinstance(action, (AddComponentAction, RemoveComponentAction)):
+                key = _get_key(action)
+                if pending_writes.pop(key, None) is not None:
+                    self.number_of_overwritten_actions += 1
+                pending_writes[key] = action
+                continue
+
+            if isinstance(action, RemoveEntityAction):
+                for key in [key for key in pending_writes if key[0] == action.entity]:
+                    del pending_writes[key]
+                    self.number_of_actions_on_removed_entities += 1
+            flush()
+            coalesced_actions.append(action)
+            is_ecdb_current = False
+        flush()
+
+        return coalesced_actions
+
+    def wrap_process_system(self, process_system: ProcessSystem) -> ProcessSystem:
+        def coalesced_process_system(
+            *, ecdb: EntityComponentDatabase[ComponentUnion], system: SystemUnion
+        ) -> Generator[ActionUnion, None, None]:
+            actions = list(process_system(ecdb=ecdb, system=system))
+            yield from self.coalesce(ecdb=ecdb, actions=actions)
+
+        return coalesced_process_system
+
+    def summary(self) -> str:
+        return (
+            f"Eliminated {self.number_of_eliminated_actions} of {self.number_of_actions} actions: "
+            f"{self.number_of_overwritten_actions} overwritten, "
+            f"{self.number_of_actions_on_removed_entities} on removed entities, "
+            f"{self.number_of_identical_actions} identical"
+        )
+
+    def log_summary_at_exit(self) -> None:
+        atexit.register(lambda: logger.info(self.summary()))
@@ -0,0 +1,159 @@
+"""
+Symbols and colors of the character based render systems, and the cells of the static layer and the hero info
+"""
+
+from typing import (
+    cast,
+    Dict,
+    Generator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
+
+import pyrsistent
+
+from rogue.generic.ecs import (
+    EntityComponentDatabase,
+    get_component,
+    get_components,
+    Entity,
+)
+from rogue.components import (
+    ComponentUnion,
+    PositionComponent,
+    TypeComponent,
+    SizeComponent,
+    InventoryComponent,
+    MoneyComponent,
+    EquipmentComponent,
+    HealthComponent,
+)
+from rogue.systems.common.changes import Coordinates
+from rogue.query_functions import query_entities_of_type
+from rogue.types import TypeEnum, TYPE_ENUM_TO_STRING
+
+DEFAULT_COLOR = "grey"
+HERO_COLOR = "purple"
+ENEMY_COLOR = "red"
+WEAPON_COLOR = "green"
+GOLD_COLOR = "gold"
+POTION_COLOR = "blue"
+HEALTH_COLOR = "green"
+INVENTORY_COLOR = "purple"
+EQUIPMENT_COLOR = "red"
+
+
+EMPTY = " "
+VERTICAL_WALL = "|"
+HORIZONTAL_WALL = "-"
+ROOM_FLOOR = "."
+
+HERO_INFO_WIDTH = 30
+HERO_INFO_HEIGHT = 25
+
+STATIC_TYPES = pyrsistent.s(TypeEnum.Room, TypeEnum.Door)
+STATIC_COMPONENT_TYPES: List[Type[ComponentUnion]] = [PositionComponent, SizeComponent, TypeComponent]
+
+# Unique id, position, size (rooms only) and type of every room and door
+LevelKey = Tuple[Tuple[int, PositionComponent, Optional[SizeComponent], TypeEnum], ...]
+Glyph = Tuple[str, str]
+HeroInfoLines = Tuple[Glyph, ...]
+
+HERO_INFO_COMPONENT_TYPES: List[Type[ComponentUnion]] = [
+    MoneyComponent,
+    HealthComponent,
+    InventoryComponent,
+    EquipmentComponent,
+]
+
+
+def type_to_appearance(item_type: TypeEnum) -> Glyph:
+    item_type_to_appearance = {
+        TypeEnum.Hero: ("#", HERO_COLOR),
+        # Enemies
+        TypeEnum.Hobgoblin: ("H", ENEMY_COLOR),
+        TypeEnum.IceMonster: ("I", ENEMY_COLOR),
+        TypeEnum.Orc: ("O", ENEMY_COLOR),
+        # Weapons
+        TypeEnum.Dagger: ("D", WEAPON_COLOR),
+        TypeEnum.Sword: ("S", WEAPON_COLOR),
+        TypeEnum.Mace: ("M", WEAPON_COLOR),
+        TypeEnum.DoubleSword: ("&", WEAPON_COLOR),
+        # Items
+        TypeEnum.Gold: ("$", GOLD_COLOR),
+        TypeEnum.Potion: ("!", POTION_COLOR),
+        # Doors
+        TypeEnum.Door: ("+", DEFAULT_COLOR),
+    }
+    symbol, color = item_type_to_appearance[item_type]
+    return symbol, color
+
+
+def get_room_background(
+    *, position_component: PositionComponent, size_component: SizeComponent
+) -> Generator[Tuple[Coordinates, str], None, None]:
+    height, width = size_component.height, size_component.width
+    y_axis_start, x_axis_start = position_component.y_axis, position_component.x_axis
+
+    # Walls
+    for y_axis in range(y_axis_start + 1, y_axis_start + height):
+        yield (y_axis, x_axis_start), VERTICAL_WALL
+        yield (y_axis, x_axis_start + width), VERTICAL_WALL
+    for x_axis in range(x_axis_start, x_axis_start + width + 1):
+        yield (y_axis_start, x_axis), HORIZONTAL_WALL
+        yield (y_axis_start + height, x_axis), HORIZONTAL_WALL
+
+    # Inside of the Room
+    for y_axis in range(y_axis_start + 1, y_axis_start + height):
+        for x_axis in range(x_axis_start + 1, x_axis_start + width):
+            yield (y_axis, x_axis), ROOM_FLOOR
+
+
+def get_level_key(*, ecdb: EntityComponentDatabase[ComponentUnion]) -> LevelKey:
+    level_key = []
+    for entity in query_entities_of_type(ecdb=ecdb, entity_type=STATIC_TYPES):
+        position_component, size_component, type_component = cast(
+            Tuple[PositionComponent, Optional[SizeComponent], TypeComponent],
+            get_components(ecdb=ecdb, entity=entity, component_types=STATIC_COMPONENT_TYPES),
+        )
+        level_key.append((entity.unique_id, position_component, size_component, type_component.entity_type))
+    return tuple(sorted(level_key, key=lambda static_entity: static_entity[0]))
+
+
+def get_static_cells(*, level_key: LevelKey) -> Dict[Coordinates, Glyph]:
+    cells: Dict[Coordinates, Glyph] = {}
+    # Rooms first, the doors are in their walls
+    for _, position_component, size_component, _ in level_key:
+        if size_component is not None:
+            for coordinates, symbol in get_room_background(
+                position_component=position_component, size_component=size_component
+            ):
+                cells[coordinates] = symbol, DEFAULT_COLOR
+    for _, position_component, size_component, entity_type in level_key:
+        if size_component is None:
+            cells[position_component.y_axis, position_component.x_axis] = type_to_appearance(entity_type)
+    return cells
+
+
+def get_hero_info_lines(*, ecdb: EntityComponentDatabase[ComponentUnion], entity: Entity) -> HeroInfoLines:
+    money_component, health_component, inventory_component, equipment_component = cast(
+        Tuple[MoneyComponent, HealthComponent, InventoryComponent, EquipmentComponent],
+        get_components(ecdb=ecdb, entity=entity, component_types=HERO_INFO_COMPONENT_TYPES),
+    )
+
+    lines = [
+        (f"Gold:   {money_component.amount}", GOLD_COLOR),
+        (f"Health: {health_component.amount}", HEALTH_COLOR),
+        ("Inventory:", INVENTORY_COLOR),
+    ]
+    for item in inventory_component.entities:
+        type_component = cast(TypeComponent, get_component(ecdb=ecdb, entity=item, component_type=TypeComponent))
+        lines.append((f"    {TYPE_ENUM_TO_STRING[type_component.entity_type]}", INVENTORY_COLOR))
+
+    lines.append(("Equipment:", EQUIPMENT_COLOR))
+    for item in equipment_component.entities:
+        type_component = cast(TypeComponent, get_component(ecdb=ecdb, entity=item, component_type=TypeComponent))
+        lines.append((f"    {TYPE_ENUM_TO_STRING[type_component.entity_type]}", EQUIPMENT_COLOR))
+    return tuple(lines)
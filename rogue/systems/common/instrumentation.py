@@ -0,0 +1,200 @@
+"""
+Opt-in instrumentation of the tick pipeline.
+
+SystemsProfiler wraps process_system and process_action before they are handed to process_systems, so nothing is
+measured (and nothing is paid for) unless the wrapped functions are used.
+"""
+
+import atexit
+import threading
+import time
+from collections import defaultdict, deque
+from typing import (
+    DefaultDict,
+    Deque,
+    Dict,
+    Generator,
+    List,
+    Tuple,
+)
+
+import attr
+from loguru import logger
+
+from rogue.generic.ecs import EntityComponentDatabase
+from rogue.components import ComponentUnion
+from rogue.systems.common.actions import ActionUnion, flatten_actions
+from rogue.systems.common.system import SystemUnion, ProcessAction, ProcessSystem
+
+DEFAULT_WINDOW_SIZE = 1000
+
+METRICS = ("wall_time", "number_of_actions", "number_of_mutations", "mutation_time")
+
+
+@attr.s(frozen=True, kw_only=True)
+class SystemTickStatistics:
+    wall_time: float = attr.ib()
+    number_of_actions: int = attr.ib()
+    number_of_mutations: int = attr.ib()
+    mutation_time: float = attr.ib()
+
+
+@attr.s(kw_only=True)
+class _SystemTickAccumulator:
+    wall_time: float = attr.ib(default=0.0)
+    number_of_actions: int = attr.ib(default=0)
+    number_of_mutations: int = attr.ib(default=0)
+    mutation_time: float = attr.ib(default=0.0)
+
+    def freeze(self) -> SystemTickStatistics:
+        return SystemTickStatistics(
+            wall_time=self.wall_time,
+            number_of_actions=self.number_of_actions,
+            number_of_mutations=self.number_of_mutations,
+            mutation_time=self.mutation_time,
+        )
+
+
+def _get_system_name(system: SystemUnion) -> str:
+    return type(system).__name__
+
+
+class SystemsProfiler:
+    """
+    Records wall time, number of yielded actions and number of applied actions (ECDB mutations) per system per tick.
+    The statistics of the last `window_size` ticks are kept for histograms, totals are kept for the whole run.
+
+    Applied actions are attributed to the system that yielded them, so every action nested in a TransactionAction
+    (e.g. made by batch_actions_of_systems) counts as a mutation. The mutation time of an action is attributed to the
+    system of its first nested action. Systems may be processed concurrently by SystemScheduler.
+    """
+
+    def __init__(self, *, window_size: int = DEFAULT_WINDOW_SIZE):
+        self.window_size = window_size
+        self.number_of_ticks = 0
+        self._current_tick: DefaultDict[str, _SystemTickAccumulator] = defaultdict(_SystemTickAccumulator)
+        self._history: DefaultDict[str, Deque[SystemTickStatistics]] = defaultdict(
+            lambda: deque(maxlen=self.window_size)
+        )
+        self._totals: DefaultDict[str, _SystemTickAccumulator] = defaultdict(_SystemTickAccumulator)
+        # The actions yielded during the current tick and the names of their systems, by id of the action.
+        # The actions are kept so that their ids aren't reused before the end of the tick
+        self._yielded_actions: Dict[int, Tuple[ActionUnion, str]] = {}
+        self._lock = threading.Lock()
+
+    def wrap_process_system(self, process_system: ProcessSystem) -> ProcessSystem:
+        def profiled_process_system(
+            *, ecdb: EntityComponentDatabase[ComponentUnion], system: SystemUnion
+        ) -> Generator[ActionUnion, None, None]:
+            system_name = _get_system_name(system)
+            wall_time = 0.0
+
+            actions = process_system(ecdb=ecdb, system=system)
+            try:
+                while True:
+                    start = time.perf_counter()
+                    try:
+                        action = next(actions)
+                    except StopIteration:
+                        wall_time += time.perf_counter() - start
+                        return
+                    wall_time += time.perf_counter() - start
+                    with self._lock:
+                        self._current_tick[system_name].number_of_actions += 1
+                        for flat_action in flatten_actions([action]):
+                            self._yielded_actions[id(flat_action)] = (flat_action, system_name)
+                    yield action
+            finally:
+                with self._lock:
+                    self._current_tick[system_name].wall_time += wall_time
+
+        return profiled_process_system
+
+    def wrap_process_action(self, process_action: ProcessAction) -> ProcessAction:
+        def profiled_process_action(
+            ecdb: EntityComponentDatabase[ComponentUnion], action: ActionUnion
+        ) -> EntityComponentDatabase[ComponentUnion]:
+            start = time.perf_counter()
+            ecdb = process_action(ecdb, action)
+            mutation_time = time.perf_counter() - start
+            with self._lock:
+                for flat_action in flatten_actions([action]):
+                    yielded_action = self._yielded_actions.get(id(flat_action))
+                    if yielded_action is None:
+                        continue
+                    accumulator = self._current_tick[yielded_action[1]]
+                    accumulator.number_of_mutations += 1
+                    accumulator.mutation_time += mutation_time
+                    mutation_time = 0.0
+            return ecdb
+
+        return profiled_process_action
+
+    def wrap(
+        self, *, process_system: ProcessSystem, process_action: ProcessAction
+    ) -> Tuple[ProcessSystem, ProcessAction]:
+        return self.wrap_process_system(process_system), self.wrap_process_action(process_action)
+
+    def end_tick(self) -> None:
+        """
+        Called once the actions of the tick are applied, while no system is processed
+        """
+
+        for system_name, accumulator in self._current_tick.items():
+            self._history[system_name].append(accumulator.freeze())
+            totals = self._totals[system_name]
+            totals.wall_time += accumulator.wall_time
+            totals.number_of_actions += accumulator.number_of_actions
+            totals.number_of_mutations += accumulator.number_of_mutations
+            totals.mutation_time += accumulator.mutation_time
+        self._current_tick.clear()
+        self._yielded_actions.clear()
+        self.number_of_ticks += 1
+
+    @property
+    def system_names(self) -> List[str]:
+        return sorted(self._history)
+
+    def get_statistics(self, *, system_name: str) -> List[SystemTickStatistics]:
+        return list(self._history[system_name])
+
+    def get_histogram(
+        self, *, system_name: str, metric: str, number_of_bins: int = 10
+    ) -> Tuple[List[int], List[float]]:
+        """
+        Histogram of `metric` over the rolling window, returns the counts and the `number_of_bins + 1` bin edges
+        """
+
+        if metric not in METRICS:
+            raise ValueError(f"Unrecognized metric: {metric}")
+
+        values: List[float] = [getattr(statistics, metric) for statistics in self._history[system_name]]
+        if len(values) == 0:
+            return [0] * number_of_bins, [0.0] * (number_of_bins + 1)
+
+        low, high = min(values), max(values)
+        bin_width = (high - low) / number_of_bins or 1.0
+        edges = [low + bin_index * bin_width for bin_index in range(number_of_bins + 1)]
+        counts = [0] * number_of_bins
+        for value in values:
+            counts[min(number_of_bins - 1, int((value - low) / bin_width))] += 1
+        return counts, edges
+
+    def get_totals(self) -> Dict[str, SystemTickStatistics]:
+        return {system_name: accumulator.freeze() for system_name, accumulator in self._totals.items()}
+
+    def summary(self) -> str:
+        lines = [f"Profiled {self.number_of_ticks} ticks"]
+        for system_name, totals in sorted(self.get_totals().items(), key=lambda item: -item[1].wall_time):
+            ticks = max(1, self.number_of_ticks)
+            lines.append(
+                f"{system_name:>28}: "
+                f"{totals.wall_time / ticks * 1e3:9.3f} ms/tick in system, "
+                f"{totals.mutation_time / ticks * 1e3:9.3f} ms/tick applying actions, "
+                f"{totals.number_of_actions / ticks:9.1f} actions/tick, "
+                f"{totals.number_of_mutations / ticks:9.1f} mutations/tick"
+            )
+        return "\n".join(lines)
+
+    def log_summary_at_exit(self) -> None:
+        atexit.register(lambda: logger.info(f"\n{self.summary()}"))
@@ -0,0 +1,119 @@
+"""
+Concurrent processing of the systems that share a priority.
+
+Systems declare the component types they read and write with the READ_COMPONENT_TYPES and WRITTEN_COMPONENT_TYPES
+class attributes of their trait. Two systems conflict when one of them writes a component type the other one reads,
+or when either of them does not declare what it writes. The systems of a priority are split, in the order they were
+added, into stages of systems that don't conflict with each other. The systems of a stage observe the same ECDB and
+run concurrently, their actions are applied in the order the systems were added, so the result is the same as running
+them one after another.
+"""
+
+import concurrent.futures
+from typing import (
+    Any,
+    Callable,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Type,
+)
+
+from rogue.generic.ecs import EntityComponentDatabase, Systems
+from rogue.components import ComponentUnion
+from rogue.systems.common.actions import ActionUnion
+from rogue.systems.common.system import SystemUnion, ProcessAction
+
+ComponentTypes = Optional[FrozenSet[Type[ComponentUnion]]]
+
+
+def _intersect(*, first: ComponentTypes, second: ComponentTypes) -> bool:
+    # None stands for every component type
+    if first is None:
+        return second is None or len(second) > 0
+    if second is None:
+        return len(first) > 0
+    return not first.isdisjoint(second)
+
+
+def systems_conflict(*, first: SystemUnion, second: SystemUnion) -> bool:
+    if first.WRITTEN_COMPONENT_TYPES is None or second.WRITTEN_COMPONENT_TYPES is None:
+        return True
+    return _intersect(first=first.WRITTEN_COMPONENT_TYPES, second=second.READ_COMPONENT_TYPES) or _intersect(
+        first=second.WRITTEN_COMPONENT_TYPES, second=first.READ_COMPONENT_TYPES
+    )
+
+
+def plan_stages(*, systems: Iterable[SystemUnion]) -> List[List[SystemUnion]]:
+    """
+    Split `systems` into consecutive stages of systems that don't conflict with each other.
+    Systems are never reordered, a system that conflicts with the current stage starts the next one.
+    """
+
+    stages: List[List[SystemUnion]] = []
+    for system in systems:
+        if len(stages) > 0 and not any(systems_conflict(first=system, second=other) for other in stages[-1]):
+            stages[-1].append(system)
+        else:
+            stages.append([system])
+    return stages
+
+
+def _collect_actions(
+    process_system: Callable[..., Iterable[ActionUnion]],
+    ecdb: EntityComponentDatabase[ComponentUnion],
+    system: SystemUnion,
+) -> List[ActionUnion]:
+    return list(process_system(ecdb=ecdb, system=system))
+
+
+class SystemScheduler:
+    """
+    Runs the systems of a stage on a thread pool, the first system of a stage runs on the calling thread.
+
+    A system that raises (e.g. IgnoreTimeStepException) still lets the other systems of its stage finish,
+    the exception of the first system of the stage that raised is propagated.
+    """
+
+    def __init__(self, *, number_of_threads: int):
+        self.thread_pool = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, number_of_threads))
+
+    def shutdown(self) -> None:
+        self.thread_pool.shutdown()
+
+    def _process_stage(
+        self,
+        *,
+        ecdb: EntityComponentDatabase[ComponentUnion],
+        stage: Sequence[SystemUnion],
+        process_system: Callable[..., Iterable[ActionUnion]],
+    ) -> List[List[ActionUnion]]:
+        first_system, *other_systems = stage
+        futures = [self.thread_pool.submit(_collect_actions, process_system, ecdb, system) for system in other_systems]
+        try:
+            first_actions = _collect_actions(process_system, ecdb, first_system)
+        finally:
+            # The ECDB must not change while the other systems still read it
+            concurrent.futures.wait(futures)
+        return [first_actions] + [future.result() for future in futures]
+
+    def process_systems(
+        self,
+        *,
+        ecdb: EntityComponentDatabase[ComponentUnion],
+        systems: Systems[SystemUnion],
+        process_system: Callable[..., Iterable[Any]],
+        process_action: ProcessAction,
+    ) -> EntityComponentDatabase[ComponentUnion]:
+        """
+        Drop-in replacement of process_systems
+        """
+
+        for priority in sorted(systems.priority_to_systems):
+            for stage in plan_stages(systems=systems.priority_to_systems[priority]):
+                for actions in self._process_stage(ecdb=ecdb, stage=stage, process_system=process_system):
+                    for action in actions:
+                        ecdb = process_action(ecdb, action)
+        return ecdb
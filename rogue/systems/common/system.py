@@ -1,17 +1,21 @@
-from typing import Union, Generator
+from typing import Callable, Iterable, Union, Generator
 
 from rogue.generic.ecs import (
     EntityComponentDatabase,
     remove_entity,
     add_component,
     remove_component,
+    add_component_columns,
 )
+from rogue.generic.transactions import Transaction, begin_transaction
 from rogue.components import ComponentUnion
 from rogue.systems.common.actions import (
     ActionUnion,
     RemoveEntityAction,
     AddComponentAction,
     RemoveComponentAction,
+    AddComponentColumnsAction,
+    TransactionAction,
 )
 
 from rogue.systems.collision_detection_system import CollisionDetectionSystem
@@ -20,7 +24,9 @@ from rogue.systems.movement_system import MovementSystem
 from rogue.systems.pygame_hero_control_system import PygameHeroControlSystem
 from rogue.systems.pygcurse_render_system import PygcurseRenderSystem
 from rogue.systems.pynput_hero_control_system import PynputHeroControlSystem
+from rogue.systems.scripted_hero_control_system import ScriptedHeroControlSystem
 from rogue.systems.panda3d_render_system import Panda3dRenderSystem
+from rogue.systems.terminal_render_system import TerminalRenderSystem
 from rogue.systems.common.traits import NoReturnSystemTrait, YieldChangesSystemTrait
 
 SystemUnion = Union[
@@ -31,8 +37,15 @@ SystemUnion = Union[
     CollisionDetectionSystem,
     PynputHeroControlSystem,
     Panda3dRenderSystem,
+    ScriptedHeroControlSystem,
+    TerminalRenderSystem,
 ]
 
+ProcessAction = Callable[
+    [EntityComponentDatabase[ComponentUnion], ActionUnion], EntityComponentDatabase[ComponentUnion]
+]
+ProcessSystem = Callable[..., Generator[ActionUnion, None, None]]
+
 
 def process_action(
     ecdb: EntityComponentDatabase[ComponentUnion], action: ActionUnion
@@ -43,11 +56,48 @@ def process_action(
         ecdb = remove_component(ecdb=ecdb, entity=action.entity, component_type=action.component_type)
     elif isinstance(action, RemoveEntityAction):
         ecdb = remove_entity(ecdb=ecdb, entity=action.entity)
+    elif isinstance(action, AddComponentColumnsAction):
+        ecdb = add_component_columns(
+            ecdb=ecdb, unique_ids=action.unique_ids, component_type=action.component_type, columns=action.columns
+        )
+    elif isinstance(action, TransactionAction):
+        ecdb = process_actions(ecdb=ecdb, actions=action.actions)
     else:
         raise ValueError(f"Unrecognized Action: {action}")
     return ecdb
 
 
+def _apply_action(*, transaction: Transaction[ComponentUnion], action: ActionUnion) -> None:
+    if isinstance(action, AddComponentAction):
+        transaction.add_component(entity=action.entity, component=action.component)
+    elif isinstance(action, RemoveComponentAction):
+        transaction.remove_component(entity=action.entity, component_type=action.component_type)
+    elif isinstance(action, RemoveEntityAction):
+        transaction.remove_entity(entity=action.entity)
+    elif isinstance(action, AddComponentColumnsAction):
+        transaction.add_component_columns(
+            unique_ids=action.unique_ids, component_type=action.component_type, columns=action.columns
+        )
+    elif isinstance(action, TransactionAction):
+        for nested_action in action.actions:
+            _apply_action(transaction=transaction, action=nested_action)
+    else:
+        raise ValueError(f"Unrecognized Action: {action}")
+
+
+def process_actions(
+    *, ecdb: EntityComponentDatabase[ComponentUnion], actions: Iterable[ActionUnion]
+) -> EntityComponentDatabase[ComponentUnion]:
+    """
+    Apply `actions` in order in a single transaction
+    """
+
+    transaction = begin_transaction(ecdb=ecdb)
+    for action in actions:
+        _apply_action(transaction=transaction, action=action)
+    return transaction.commit()
+
+
 def process_system(
     *, ecdb: EntityComponentDatabase[ComponentUnion], system: SystemUnion,
 ) -> Generator[ActionUnion, None, None]:
@@ -57,3 +107,19 @@ def process_system(
         yield from system(ecdb=ecdb)
     else:
         raise ValueError(f"System of type {type(system)} does not support any of the system traits!")
+
+
+def batch_actions_of_systems(process_system_function: ProcessSystem) -> ProcessSystem:
+    """
+    Wrap `process_system_function` to yield all of the actions of a system as a single TransactionAction,
+    so that process_systems commits them at once. Systems still observe the changes of the previous systems.
+    """
+
+    def batched_process_system(
+        *, ecdb: EntityComponentDatabase[ComponentUnion], system: SystemUnion
+    ) -> Generator[ActionUnion, None, None]:
+        actions = tuple(process_system_function(ecdb=ecdb, system=system))
+        if len(actions) > 0:
+            yield TransactionAction(actions=actions)
+
+    return batched_process_system
@@ -1,5 +1,5 @@
 import abc
-from typing import Generator
+from typing import ClassVar, FrozenSet, Generator, Optional, Type
 
 import attr
 
@@ -9,14 +9,25 @@ from rogue.systems.common.actions import ActionUnion
 
 
 @attr.s(frozen=True, kw_only=True)
-class NoReturnSystemTrait(abc.ABC):
+class SystemTrait:
+    """
+    Component types a system reads and writes, None when it may read or write any of them (or remove entities).
+    Used to decide which systems of the same priority may run concurrently.
+    """
+
+    READ_COMPONENT_TYPES: ClassVar[Optional[FrozenSet[Type[ComponentUnion]]]] = None
+    WRITTEN_COMPONENT_TYPES: ClassVar[Optional[FrozenSet[Type[ComponentUnion]]]] = None
+
+
+@attr.s(frozen=True, kw_only=True)
+class NoReturnSystemTrait(SystemTrait, abc.ABC):
     @abc.abstractmethod
     def __call__(self, *, ecdb: EntityComponentDatabase[ComponentUnion]) -> None:
         ...
 
 
 @attr.s(frozen=True, kw_only=True)
-class YieldChangesSystemTrait:
+class YieldChangesSystemTrait(SystemTrait):
     @abc.abstractmethod
     def __call__(self, *, ecdb: EntityComponentDatabase[ComponentUnion]) -> Generator[ActionUnion, None, None]:
         ...
@@ -5,10 +5,9 @@ from typing import (
 
 from toolz import first
 
-from rogue.filter_functions import is_hero
+from rogue.query_functions import get_entity_of_unique_type
 from rogue.generic.ecs import (
     EntityComponentDatabase,
-    query,
     Entity,
     get_component,
 )
@@ -19,6 +18,7 @@ from rogue.components import (
     EquipmentComponent,
     TypeComponent,
     HealthComponent,
+    VelocityComponent,
 )
 from rogue.systems.common.actions import (
     ActionUnion,
@@ -26,11 +26,14 @@ from rogue.systems.common.actions import (
 )
 from rogue.types import WEAPON_TYPES, TypeEnum
 
+HERO_CONTROL_READ_COMPONENT_TYPES = frozenset([TypeComponent, InventoryComponent, EquipmentComponent, HealthComponent])
+HERO_CONTROL_WRITTEN_COMPONENT_TYPES = frozenset(
+    [VelocityComponent, InventoryComponent, EquipmentComponent, HealthComponent]
+)
+
 
 def get_hero_entity(*, ecdb: EntityComponentDatabase[ComponentUnion]) -> Entity:
-    hero_entity: Entity
-    hero_entity, _ = first(query(ecdb=ecdb, filter_function=is_hero))
-    return hero_entity
+    return get_entity_of_unique_type(ecdb=ecdb, entity_type=TypeEnum.Hero)
 
 
 def maybe_equip_next_weapon(
@@ -1,29 +1,44 @@
 import random
-from typing import Generator
+from typing import Generator, Optional
 
 import attr
+import numpy as np
 
-from rogue.filter_functions import is_enemy
 from rogue.generic.ecs import (
+    COLUMN_DTYPE,
     EntityComponentDatabase,
-    query,
 )
 from rogue.components import (
     ComponentUnion,
+    TypeComponent,
     VelocityComponent,
 )
 from rogue.systems.common.actions import (
     ActionUnion,
     AddComponentAction,
+    AddComponentColumnsAction,
 )
 from rogue.systems.common.traits import YieldChangesSystemTrait
+from rogue.query_functions import query_enemies
 
 
 @attr.s(frozen=True, kw_only=True)
 class EnemyAISystem(YieldChangesSystemTrait):
+    """
+    Moves every enemy in a random direction.
+    The batched mode draws the directions of all of the enemies at once from `rng` and writes their velocities
+    with a single action, the default mode draws them one by one from the `random` module.
+    """
+
+    READ_COMPONENT_TYPES = frozenset([TypeComponent])
+    WRITTEN_COMPONENT_TYPES = frozenset([VelocityComponent])
+
+    batched: bool = attr.ib(default=False)
+    rng: Optional[np.random.Generator] = attr.ib(default=None, cmp=False)
+
     @classmethod
-    def create(cls) -> "EnemyAISystem":
-        return cls()
+    def create(cls, *, batched: bool = False, seed: Optional[int] = None) -> "EnemyAISystem":
+        return cls(batched=batched, rng=np.random.default_rng(seed) if batched else None)
 
     RANDOM_VALUE_TO_YX = {
         0: (0, 1),
@@ -32,10 +47,36 @@ class EnemyAISystem(YieldChangesSystemTrait):
         3: (-1, 0),
     }
 
+    # RANDOM_VALUE_TO_YX as an array, indexing it with an array of random values gives the velocities of all enemies
+    RANDOM_VALUE_TO_YX_TABLE = np.array([yx for _, yx in sorted(RANDOM_VALUE_TO_YX.items())], dtype=COLUMN_DTYPE)
+
     def __call__(self, *, ecdb: EntityComponentDatabase[ComponentUnion]) -> Generator[ActionUnion, None, None]:
-        for entity, _ in query(ecdb=ecdb, filter_function=is_enemy):
+        if self.batched:
+            yield from self._move_enemies_batched(ecdb=ecdb)
+            return
+
+        for entity in query_enemies(ecdb=ecdb):
             random_value = random.randint(0, len(EnemyAISystem.RANDOM_VALUE_TO_YX) - 1)
             y_axis, x_axis = EnemyAISystem.RANDOM_VALUE_TO_YX[random_value]
 
             velocity_component = VelocityComponent.create_from_attributes(y_axis=y_axis, x_axis=x_axis)
             yield AddComponentAction(entity=entity, component=velocity_component)
+
+    def _move_enemies_batched(
+        self, *, ecdb: EntityComponentDatabase[ComponentUnion]
+    ) -> Generator[ActionUnion, None, None]:
+
+        if self.rng is None:
+            raise ValueError("Batched EnemyAISystem requires a random number generator")
+
+        unique_ids = np.array([entity.unique_id for entity in query_enemies(ecdb=ecdb)], dtype=np.int64)
+        if len(unique_ids) == 0:
+            return
+
+        random_values = self.rng.integers(0, len(EnemyAISystem.RANDOM_VALUE_TO_YX), size=len(unique_ids))
+        velocities = EnemyAISystem.RANDOM_VALUE_TO_YX_TABLE[random_values]
+        yield AddComponentColumnsAction(
+            unique_ids=unique_ids,
+            component_type=VelocityComponent,
+            columns={"y_axis": velocities[:, 0], "x_axis": velocities[:, 1]},
+        )
@@ -5,11 +5,14 @@ from typing import (
 )
 
 import attr
+import numpy as np
 
 from rogue.generic.functions import evolve
 from rogue.generic.ecs import (
+    SUPPORTS_COLUMNS,
     EntityComponentDatabase,
     query,
+    query_columns,
 )
 from rogue.components import (
     ComponentUnion,
@@ -20,17 +23,53 @@ from rogue.systems.common.traits import YieldChangesSystemTrait
 from rogue.systems.common.actions import (
     ActionUnion,
     AddComponentAction,
+    AddComponentColumnsAction,
 )
 from rogue.systems.common.constants import ZERO_VELOCITY_COMPONENT
 
 
 @attr.s(frozen=True, kw_only=True)
 class MovementSystem(YieldChangesSystemTrait):
+    READ_COMPONENT_TYPES = frozenset([PositionComponent, VelocityComponent])
+    WRITTEN_COMPONENT_TYPES = frozenset([PositionComponent, VelocityComponent])
+
     @classmethod
     def create(cls) -> "MovementSystem":
         return cls()
 
     def __call__(self, *, ecdb: EntityComponentDatabase[ComponentUnion]) -> Generator[ActionUnion, None, None]:
+        if SUPPORTS_COLUMNS:
+            yield from self._move_columns(ecdb=ecdb)
+        else:
+            yield from self._move_entities(ecdb=ecdb)
+
+    @staticmethod
+    def _move_columns(*, ecdb: EntityComponentDatabase[ComponentUnion]) -> Generator[ActionUnion, None, None]:
+        """
+        Move all of the entities at once, yields one action per component type instead of two actions per entity
+        """
+
+        component_types: List[Type[ComponentUnion]] = [PositionComponent, VelocityComponent]
+        unique_ids, (position_columns, velocity_columns) = query_columns(ecdb=ecdb, component_types=component_types)
+        if len(unique_ids) == 0:
+            return
+
+        yield AddComponentColumnsAction(
+            unique_ids=unique_ids,
+            component_type=PositionComponent,
+            columns={
+                "y_axis": position_columns["y_axis"] + velocity_columns["y_axis"],
+                "x_axis": position_columns["x_axis"] + velocity_columns["x_axis"],
+            },
+        )
+        yield AddComponentColumnsAction(
+            unique_ids=unique_ids,
+            component_type=VelocityComponent,
+            columns={field_name: np.zeros_like(column) for field_name, column in velocity_columns.items()},
+        )
+
+    @staticmethod
+    def _move_entities(*, ecdb: EntityComponentDatabase[ComponentUnion]) -> Generator[ActionUnion, None, None]:
 
         component_types: List[Type[ComponentUnion]] = [PositionComponent, VelocityComponent]
         for entity, (position_component, velocity_component) in query(ecdb=ecdb, component_types=component_types):
@@ -1,21 +1,38 @@
-from collections import deque
+import atexit
+from collections import defaultdict, deque
 import itertools
 from pathlib import Path
 from typing import (
+    AbstractSet,
+    DefaultDict,
     Dict,
+    Generator,
     Optional,
+    Set,
     Tuple,
     List,
     Type,
     Deque,
+    cast,
 )
 
 import attr
+import numpy as np
+from loguru import logger
 
 try:
     from direct.gui.OnscreenText import OnscreenText
     from direct.showbase.ShowBase import ShowBase, Loader
-    from panda3d.core import LPoint3, NodePath
+    from panda3d.core import (
+        Geom,
+        GeomNode,
+        GeomTriangles,
+        GeomVertexArrayFormat,
+        GeomVertexData,
+        GeomVertexFormat,
+        LPoint3,
+        NodePath,
+    )
 except ImportError:
 
     class ShowBase:  # type: ignore
@@ -34,6 +51,7 @@ from rogue.components import (
     TypeComponent,
     SizeComponent,
 )
+from rogue.systems.common.changes import ChangeSet, ChangeTracker, Coordinates, RenderedState
 from rogue.systems.common.traits import NoReturnSystemTrait
 from rogue.types import TypeEnum
 
@@ -68,11 +86,8 @@ EQUIPMENT_COLOR = (0, 255, 0, 1)
 class Model:
     model_file_name: Optional[Path] = None
 
-    def __init__(self, color: RgbaColor, y_axis: int, x_axis: int):
-        self.model = loader.loadModel(self.model_file_name)  # noqa: F821
-        self.model.reparentTo(render)  # noqa: F821
-        self.set_color(color)
-        self.set_position(y_axis=y_axis, x_axis=x_axis)
+    def __init__(self, model: "NodePath"):
+        self.model = model
 
     def set_position(self, y_axis: int, x_axis: int) -> None:
         self.model.setPos(get_square_position(y_axis=y_axis, x_axis=x_axis))
@@ -101,8 +116,136 @@ class OrcModel(Model):
     model_file_name = get_full_path_to_asset(Path("panda3d") / "ice_monster.egg.pz")
 
 
-class SquareModel(Model):
-    model_file_name = get_full_path_to_asset(Path("panda3d") / "square.egg.pz")
+class ModelPool:
+    """
+    Loads the asset of every model class once and instances it under a separate node for every model.
+    Released models are detached from the scene graph and handed out again before any new model is created.
+    """
+
+    def __init__(self) -> None:
+        self._assets: Dict[Type[Model], NodePath] = {}
+        self._free_models: DefaultDict[Type[Model], List[Model]] = defaultdict(list)
+        self.number_of_hits = 0
+        self.number_of_misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        number_of_requests = self.number_of_hits + self.number_of_misses
+        if number_of_requests == 0:
+            return 0.0
+        return self.number_of_hits / number_of_requests
+
+    def _get_asset(self, model_class: Type[Model]) -> "NodePath":
+        asset = self._assets.get(model_class)
+        if asset is None:
+            asset = loader.loadModel(model_class.model_file_name)  # noqa: F821
+            self._assets[model_class] = asset
+        return asset
+
+    def acquire(self, *, model_class: Type[Model], color: RgbaColor, y_axis: int, x_axis: int) -> Model:
+        free_models = self._free_models[model_class]
+        if len(free_models) > 0:
+            self.number_of_hits += 1
+            model = free_models.pop()
+            model.model.reparentTo(render)  # noqa: F821
+        else:
+            self.number_of_misses += 1
+            node_path = render.attachNewNode(model_class.__name__)  # noqa: F821
+            self._get_asset(model_class).instanceTo(node_path)
+            model = model_class(node_path)
+        model.set_color(color)
+        model.set_position(y_axis=y_axis, x_axis=x_axis)
+        return model
+
+    def release(self, model: Model) -> None:
+        model.model.detachNode()
+        self._free_models[type(model)].append(model)
+
+    def summary(self) -> str:
+        number_of_free_models = sum(len(free_models) for free_models in self._free_models.values())
+        return (
+            f"Model pool: {self.number_of_hits} hits, {self.number_of_misses} misses "
+            f"(hit rate {self.hit_rate:.1%}), {len(self._assets)} assets, {number_of_free_models} free models"
+        )
+
+    def log_summary_at_exit(self) -> None:
+        atexit.register(lambda: logger.info(self.summary()))
+
+
+def _to_vertex_color(color: RgbaColor) -> Tuple[int, int, int, int]:
+    # NodePath.setColor clamps every channel to [0, 1], match the colors it produced
+    red, green, blue, alpha = (round(min(max(channel, 0), 1) * 255) for channel in color)
+    return red, green, blue, alpha
+
+
+class Floor:
+    """
+    Every square of the grid as a quad of a single GeomNode, colored through a vertex color column.
+    Changed colors are written to the vertex data once per frame, by flush.
+    """
+
+    def __init__(self, *, height: int, width: int, color: RgbaColor):
+        self.height = height
+        self.width = width
+        number_of_squares = height * width
+
+        # Same geometry as the square model: a unit quad centered on the square's position
+        y_axes, x_axes = np.divmod(np.arange(number_of_squares, dtype=np.float32), width)
+        corners = np.array([[-0.5, 0.5], [-0.5, -0.5], [0.5, -0.5], [0.5, 0.5]], dtype=np.float32)
+        vertices = np.zeros((number_of_squares, 4, 3), dtype=np.float32)
+        vertices[:, :, 0] = x_axes[:, np.newaxis] + corners[:, 0]
+        vertices[:, :, 1] = y_axes[:, np.newaxis] + corners[:, 1]
+
+        first_vertices = np.arange(number_of_squares, dtype=np.uint32)[:, np.newaxis] * 4
+        triangles = first_vertices + np.array([0, 1, 2, 0, 2, 3], dtype=np.uint32)
+
+        self.colors = np.empty((number_of_squares, 4, 4), dtype=np.uint8)
+        self.colors[:] = _to_vertex_color(color)
+
+        vertex_format = GeomVertexFormat()
+        vertex_format.addArray(GeomVertexArrayFormat("vertex", 3, Geom.NT_float32, Geom.C_point))
+        vertex_format.addArray(GeomVertexArrayFormat("color", 4, Geom.NT_uint8, Geom.C_color))
+        vertex_data = GeomVertexData("floor", GeomVertexFormat.registerFormat(vertex_format), Geom.UH_dynamic)
+        vertex_data.uncleanSetNumRows(number_of_squares * 4)
+        memoryview(vertex_data.modifyArray(0)).cast("B")[:] = vertices.tobytes()
+        memoryview(vertex_data.modifyArray(1)).cast("B")[:] = self.colors.tobytes()
+
+        primitive = GeomTriangles(Geom.UH_static)
+        primitive.setIndexType(Geom.NT_uint32)
+        primitive_vertices = primitive.modifyVertices()
+        primitive_vertices.uncleanSetNumRows(triangles.size)
+        memoryview(primitive_vertices).cast("B")[:] = triangles.tobytes()
+
+        geom = Geom(vertex_data)
+        geom.addPrimitive(primitive)
+        geom_node = GeomNode("floor")
+        geom_node.addGeom(geom)
+        self.vertex_data = vertex_data
+        self.node_path = render.attachNewNode(geom_node)  # noqa: F821
+        self.dirty_squares: Set[int] = set()
+
+    def set_color(self, *, y_axis: int, x_axis: int, color: RgbaColor) -> None:
+        square = y_axis * self.width + x_axis
+        self.colors[square] = _to_vertex_color(color)
+        self.dirty_squares.add(square)
+
+    def get_color(self, *, y_axis: int, x_axis: int) -> Tuple[int, int, int, int]:
+        red, green, blue, alpha = self.colors[y_axis * self.width + x_axis, 0].tolist()
+        return red, green, blue, alpha
+
+    def flush(self) -> None:
+        if len(self.dirty_squares) == 0:
+            return
+
+        colors = memoryview(self.vertex_data.modifyArray(1)).cast("B")
+        square_size = self.colors[0].nbytes
+        # Copying every color at once is faster than a copy per square when a large part of the floor changed
+        if len(self.dirty_squares) * 8 > len(self.colors):
+            colors[:] = self.colors.tobytes()
+        else:
+            for square in self.dirty_squares:
+                colors[square * square_size : (square + 1) * square_size] = self.colors[square].tobytes()
+        self.dirty_squares.clear()
 
 
 def _type_to_appearance(item_type: TypeEnum) -> Tuple[Optional[Type[Model]], RgbaColor]:
@@ -127,30 +270,30 @@ def _type_to_appearance(item_type: TypeEnum) -> Tuple[Optional[Type[Model]], Rgb
     return symbol, color
 
 
-def _render_room(
-    *, squares: List[List[SquareModel]], position_component: PositionComponent, size_component: SizeComponent
-) -> None:
+def _get_room_background(
+    *, position_component: PositionComponent, size_component: SizeComponent
+) -> Generator[Tuple[Coordinates, RgbaColor], None, None]:
     height, width = size_component.height, size_component.width
 
     # Left Wall
     x_axis = position_component.x_axis
     for y_axis in range(position_component.y_axis, position_component.y_axis + height):
-        squares[y_axis][x_axis].set_color(BLACK)
+        yield (y_axis, x_axis), BLACK
 
     # Right Wall
     x_axis = position_component.x_axis + width
     for y_axis in range(position_component.y_axis, position_component.y_axis + height):
-        squares[y_axis][x_axis].set_color(BLACK)
+        yield (y_axis, x_axis), BLACK
 
     # Top Wall
     y_axis = position_component.y_axis
     for x_axis in range(position_component.x_axis, position_component.x_axis + width):
-        squares[y_axis][x_axis].set_color(BLACK)
+        yield (y_axis, x_axis), BLACK
 
     # Bottom Wall
     y_axis = position_component.y_axis + height
     for x_axis in range(position_component.x_axis, position_component.x_axis + width + 1):
-        squares[y_axis][x_axis].set_color(BLACK)
+        yield (y_axis, x_axis), BLACK
 
     # Inside of the Room
     y_axis_start = position_component.y_axis + 1
@@ -159,7 +302,32 @@ def _render_room(
     y_axis_end = y_axis_start + height - 1
     x_axis_end = x_axis_start + width - 1
     for y_axis, x_axis in itertools.product(range(y_axis_start, y_axis_end), range(x_axis_start, x_axis_end)):
-        squares[y_axis][x_axis].set_color(WHITE)
+        yield (y_axis, x_axis), WHITE
+
+
+def _render_room(
+    *,
+    floor: Floor,
+    background: Dict[Coordinates, RgbaColor],
+    position_component: PositionComponent,
+    size_component: SizeComponent,
+) -> None:
+    for (y_axis, x_axis), color in _get_room_background(
+        position_component=position_component, size_component=size_component
+    ):
+        floor.set_color(y_axis=y_axis, x_axis=x_axis, color=color)
+        background[y_axis, x_axis] = color
+
+
+def _get_position_component(
+    *, ecdb: EntityComponentDatabase[ComponentUnion], entity: Entity
+) -> Optional[PositionComponent]:
+    try:
+        return cast(
+            Optional[PositionComponent], get_component(ecdb=ecdb, entity=entity, component_type=PositionComponent)
+        )
+    except KeyError:
+        return None
 
 
 # Function for getting the proper position for a given square
@@ -168,7 +336,7 @@ def get_square_position(*, y_axis: int, x_axis: int) -> "LPoint3":
 
 
 class PandaApp(ShowBase):  # type: ignore
-    def __init__(self, *, height: int, width: int):
+    def __init__(self, *, height: int, width: int, change_tracker: Optional[ChangeTracker] = None):
         # Initialize the ShowBase class from which we inherit, which will
         # create a window and set up everything we need for rendering into it.
         ShowBase.__init__(self)
@@ -182,29 +350,130 @@ class PandaApp(ShowBase):  # type: ignore
         camera.setPosHpr(width // 2 - 5, height // 2 - 50, 25, 0, -35, 0)  # noqa: F821
 
         # Initialize Squares
-        self.squares = [
-            [SquareModel(color=HIGHLIGHT, y_axis=y_axis, x_axis=x_axis) for x_axis in range(width)]
-            for y_axis in range(height)
-        ]
+        self.floor = Floor(height=height, width=width, color=HIGHLIGHT)
+        self.model_pool = ModelPool()
         self.models: Dict[Entity, Model] = {}
+        self.interpolated_entities: Set[Entity] = set()
+        # Redraw only what changed since the previous frame, actions have to be recorded by change_tracker
+        self.change_tracker = change_tracker
+        # The entities that changed in the last tick, the only ones that can be interpolated. None when unknown
+        self.changed_entities: Optional[AbstractSet[Entity]] = None
+        self.last_ecdb: Optional[EntityComponentDatabase[ComponentUnion]] = None
+        self.background: Dict[Coordinates, RgbaColor] = {}
         self.taskMgr.step()
 
-    def step(self, ecdb: EntityComponentDatabase[ComponentUnion]) -> None:
+    def step(
+        self,
+        ecdb: EntityComponentDatabase[ComponentUnion],
+        previous_ecdb: Optional[EntityComponentDatabase[ComponentUnion]] = None,
+        alpha: float = 1.0,
+    ) -> None:
+        changed_entities: Optional[AbstractSet[Entity]] = None
+        if self.change_tracker is None:
+            self._render_all(ecdb=ecdb)
+        else:
+            change_set = self.change_tracker.compute_change_set(ecdb=ecdb)
+            if change_set.is_full:
+                self._render_all(ecdb=ecdb)
+            else:
+                self._render_changes(change_tracker=self.change_tracker, change_set=change_set)
+                changed_entities = change_set.changed
+
+        if ecdb is not self.last_ecdb:
+            # First frame of a tick
+            self.changed_entities = changed_entities
+            self.last_ecdb = ecdb
+        elif self.changed_entities is not None and changed_entities is not None:
+            self.changed_entities = self.changed_entities | changed_entities
+        else:
+            self.changed_entities = None
+
+        if previous_ecdb is not None:
+            self._interpolate_models(previous_ecdb=previous_ecdb, ecdb=ecdb, alpha=alpha)
+
+        self.floor.flush()
+        self.taskMgr.step()
+
+    def _interpolate_models(
+        self,
+        *,
+        previous_ecdb: EntityComponentDatabase[ComponentUnion],
+        ecdb: EntityComponentDatabase[ComponentUnion],
+        alpha: float,
+    ) -> None:
+        """
+        Place the models that moved between `previous_ecdb` and `ecdb` at `alpha` of the way.
+        Only makes a difference when they are different versions of the ECDB, as with the immutable backend.
+        """
+
+        interpolated_entities: Set[Entity] = set()
+        if previous_ecdb is not ecdb and alpha < 1.0:
+            entities = self.models.keys() if self.changed_entities is None else self.changed_entities
+            for entity in entities:
+                model = self.models.get(entity)
+                if model is None:
+                    continue
+                previous_position_component = _get_position_component(ecdb=previous_ecdb, entity=entity)
+                position_component = _get_position_component(ecdb=ecdb, entity=entity)
+                if previous_position_component is None or position_component is None:
+                    continue
+                if previous_position_component == position_component:
+                    continue
+                y_axis = previous_position_component.y_axis * (1.0 - alpha) + position_component.y_axis * alpha
+                x_axis = previous_position_component.x_axis * (1.0 - alpha) + position_component.x_axis * alpha
+                model.model.setPos(LPoint3(x_axis, y_axis, 0))
+                interpolated_entities.add(entity)
+
+        # Put the models that were interpolated by the previous frame, but not by this one, where they are
+        for entity in self.interpolated_entities - interpolated_entities:
+            interpolated_model = self.models.get(entity)
+            position_component = _get_position_component(ecdb=ecdb, entity=entity)
+            if interpolated_model is not None and position_component is not None:
+                interpolated_model.set_position(y_axis=position_component.y_axis, x_axis=position_component.x_axis)
+        self.interpolated_entities = interpolated_entities
+
+    def _render_model(
+        self, *, entity: Entity, model_class: Type[Model], color: RgbaColor, y_axis: int, x_axis: int
+    ) -> None:
+        model = self.models.get(entity)
+        if model is not None and type(model) is model_class:
+            model.set_color(color)
+            model.set_position(y_axis=y_axis, x_axis=x_axis)
+            return
+
+        if model is not None:
+            self.model_pool.release(model)
+        self.models[entity] = self.model_pool.acquire(
+            model_class=model_class, color=color, y_axis=y_axis, x_axis=x_axis
+        )
+
+    def _release_model(self, *, entity: Entity) -> None:
+        model = self.models.pop(entity, None)
+        if model is not None:
+            self.model_pool.release(model)
+
+    def _render_all(self, *, ecdb: EntityComponentDatabase[ComponentUnion]) -> None:
 
         dynamic_entities: Deque[Tuple[Entity, PositionComponent, TypeComponent]] = deque(maxlen=None)
 
         component_types: List[Type[ComponentUnion]] = [PositionComponent, TypeComponent]
         for entity, (position_component, type_component) in query(ecdb=ecdb, component_types=component_types):
-            size_component = get_component(ecdb=ecdb, entity=entity, component_types=SizeComponent)
+            size_component = get_component(ecdb=ecdb, entity=entity, component_type=SizeComponent)
 
             # Visualize rooms
             if size_component is not None:
-                _render_room(squares=self.squares, position_component=position_component, size_component=size_component)
+                _render_room(
+                    floor=self.floor,
+                    background=self.background,
+                    position_component=position_component,
+                    size_component=size_component,
+                )
             else:
                 # Defer dynamic entities to make sure all static ones already rendered
                 dynamic_entities.append((entity, position_component, type_component))
 
         # Visualize dynamic entities
+        rendered_entities: Set[Entity] = set()
         while len(dynamic_entities) > 0:
             entity, position_component, type_component = dynamic_entities.popleft()
             entity_type = type_component.entity_type
@@ -212,26 +481,70 @@ class PandaApp(ShowBase):  # type: ignore
 
             y_axis, x_axis = position_component.y_axis, position_component.x_axis
             if model_class is None:
-                self.squares[y_axis][x_axis].set_color(color)
+                self.floor.set_color(y_axis=y_axis, x_axis=x_axis, color=color)
             else:
-                if entity in self.models:
-                    model = self.models[entity]
-                    model.set_position(y_axis=y_axis, x_axis=x_axis)
-                else:
-                    model = model_class(color=color, y_axis=y_axis, x_axis=x_axis)
-                    self.models[entity] = model
-
-        self.taskMgr.step()
+                self._render_model(entity=entity, model_class=model_class, color=color, y_axis=y_axis, x_axis=x_axis)
+                rendered_entities.add(entity)
+
+        # Return the models of the entities that are no longer rendered to the pool
+        for entity in [entity for entity in self.models if entity not in rendered_entities]:
+            self._release_model(entity=entity)
+
+    def _render_changes(self, *, change_tracker: ChangeTracker, change_set: ChangeSet) -> None:
+
+        for entity in change_set.removed:
+            self._release_model(entity=entity)
+
+        for entity in change_set.added | change_set.changed:
+            position_component, type_component = cast(RenderedState, change_tracker.get_rendered_state(entity))
+            if type_component.entity_type == TypeEnum.Room:
+                continue
+            model_class, color = _type_to_appearance(type_component.entity_type)
+            if model_class is not None:
+                self._render_model(
+                    entity=entity,
+                    model_class=model_class,
+                    color=color,
+                    y_axis=position_component.y_axis,
+                    x_axis=position_component.x_axis,
+                )
+
+        # Squares are colored by the rooms and by the entities without a model
+        for y_axis, x_axis in change_set.dirty_cells:
+            color = self.background.get((y_axis, x_axis), HIGHLIGHT)
+            for entity in change_tracker.get_entities_at((y_axis, x_axis)):
+                _, type_component = cast(RenderedState, change_tracker.get_rendered_state(entity))
+                if type_component.entity_type == TypeEnum.Room:
+                    continue
+                model_class, entity_color = _type_to_appearance(type_component.entity_type)
+                if model_class is None:
+                    color = entity_color
+            self.floor.set_color(y_axis=y_axis, x_axis=x_axis, color=color)
 
 
 @attr.s(frozen=True, kw_only=True)
 class Panda3dRenderSystem(NoReturnSystemTrait):
+    WRITTEN_COMPONENT_TYPES = frozenset()
+
     app: PandaApp = attr.ib()
+    change_tracker: Optional[ChangeTracker] = attr.ib(default=None, cmp=False)
 
     @classmethod
-    def create_from_height_and_width(cls, *, height: int, width: int) -> "Panda3dRenderSystem":
-        app = PandaApp(height=height, width=width)
-        return Panda3dRenderSystem(app=app)
+    def create_from_height_and_width(
+        cls, *, height: int, width: int, track_changes: bool = False
+    ) -> "Panda3dRenderSystem":
+        change_tracker = ChangeTracker() if track_changes else None
+        app = PandaApp(height=height, width=width, change_tracker=change_tracker)
+        return Panda3dRenderSystem(app=app, change_tracker=change_tracker)
 
     def __call__(self, *, ecdb: EntityComponentDatabase[ComponentUnion]) -> None:
         self.app.step(ecdb=ecdb)
+
+    def render_interpolated(
+        self,
+        *,
+        previous_ecdb: EntityComponentDatabase[ComponentUnion],
+        ecdb: EntityComponentDatabase[ComponentUnion],
+        alpha: float,
+    ) -> None:
+        self.app.step(ecdb=ecdb, previous_ecdb=previous_ecdb, alpha=alpha)
@@ -5,7 +5,11 @@ from typing import (
 from collections import deque
 
 import attr
-import pygame
+
+try:
+    import pygame
+except ImportError:
+    pygame = None  # type: ignore
 
 from rogue.generic.ecs import EntityComponentDatabase
 from rogue.components import (
@@ -18,12 +22,21 @@ from rogue.systems.common.actions import (
 )
 from rogue.systems.common.traits import YieldChangesSystemTrait
 from rogue.exceptions import QuitGameException, IgnoreTimeStepException
-from rogue.systems.control_systems.functions import get_hero_entity, maybe_equip_next_weapon, maybe_drink_potion
+from rogue.systems.control_systems.functions import (
+    HERO_CONTROL_READ_COMPONENT_TYPES,
+    HERO_CONTROL_WRITTEN_COMPONENT_TYPES,
+    get_hero_entity,
+    maybe_equip_next_weapon,
+    maybe_drink_potion,
+)
 
 
 @attr.s(frozen=True, kw_only=True, hash=False, cmp=False)
 class PygameHeroControlSystem(YieldChangesSystemTrait):
-    events: Deque[pygame.event.Event] = attr.ib(default=deque())
+    READ_COMPONENT_TYPES = HERO_CONTROL_READ_COMPONENT_TYPES
+    WRITTEN_COMPONENT_TYPES = HERO_CONTROL_WRITTEN_COMPONENT_TYPES
+
+    events: Deque["pygame.event.Event"] = attr.ib(default=deque())
 
     @classmethod
     def create(cls) -> "PygameHeroControlSystem":
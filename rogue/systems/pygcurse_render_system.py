@@ -1,180 +1,223 @@
-from collections import deque
 from typing import (
     cast,
-    Tuple,
+    Dict,
+    Iterable,
+    Optional,
+    Set,
     List,
     Type,
-    Deque,
 )
 
 import attr
-import pygcurse
+
+try:
+    import pygcurse
+except ImportError:
+    pygcurse = None  # type: ignore
 
 from rogue.generic.ecs import (
     EntityComponentDatabase,
-    get_component,
     query,
-    Entity,
 )
 from rogue.components import (
     ComponentUnion,
     PositionComponent,
     TypeComponent,
-    SizeComponent,
-    InventoryComponent,
-    MoneyComponent,
-    EquipmentComponent,
-    HealthComponent,
+)
+from rogue.systems.common.changes import ChangeSet, ChangeTracker, Coordinates, RenderedState
+from rogue.systems.common.glyphs import (
+    DEFAULT_COLOR,
+    EMPTY,
+    HERO_INFO_WIDTH,
+    HERO_INFO_HEIGHT,
+    STATIC_TYPES,
+    Glyph,
+    LevelKey,
+    HeroInfoLines,
+    type_to_appearance,
+    get_level_key,
+    get_static_cells,
+    get_hero_info_lines,
 )
 from rogue.systems.common.traits import NoReturnSystemTrait
-from rogue.types import TypeEnum, TYPE_ENUM_TO_STRING
-
-DEFAULT_COLOR = "grey"
-HERO_COLOR = "purple"
-ENEMY_COLOR = "red"
-WEAPON_COLOR = "green"
-GOLD_COLOR = "gold"
-POTION_COLOR = "blue"
-HEALTH_COLOR = "green"
-INVENTORY_COLOR = "purple"
-EQUIPMENT_COLOR = "red"
-
-
-EMPTY = " "
-VERTICAL_WALL = "|"
-HORIZONTAL_WALL = "-"
-ROOM_FLOOR = "."
-
-
-def _type_to_appearance(item_type: TypeEnum) -> Tuple[str, str]:
-    item_type_to_appearance = {
-        TypeEnum.Hero: ("#", HERO_COLOR),
-        # Enemies
-        TypeEnum.Hobgoblin: ("H", ENEMY_COLOR),
-        TypeEnum.IceMonster: ("I", ENEMY_COLOR),
-        TypeEnum.Orc: ("O", ENEMY_COLOR),
-        # Weapons
-        TypeEnum.Dagger: ("D", WEAPON_COLOR),
-        TypeEnum.Sword: ("S", WEAPON_COLOR),
-        TypeEnum.Mace: ("M", WEAPON_COLOR),
-        TypeEnum.DoubleSword: ("&", WEAPON_COLOR),
-        # Items
-        TypeEnum.Gold: ("$", GOLD_COLOR),
-        TypeEnum.Potion: ("!", POTION_COLOR),
-        # Doors
-        TypeEnum.Door: ("+", DEFAULT_COLOR),
-    }
-    symbol, color = item_type_to_appearance[item_type]
-    return symbol, color
-
-
-def _render_room(
-    *, window: pygcurse.PygcurseWindow, position_component: PositionComponent, size_component: SizeComponent
-) -> None:
-    height, width = size_component.height, size_component.width
-
-    # Left Wall
-    start_pos = position_component.x_axis, position_component.y_axis + 1
-    end_pos = position_component.x_axis, position_component.y_axis + height - 1
-    window.drawline(char=VERTICAL_WALL, start_pos=start_pos, end_pos=end_pos, fgcolor=DEFAULT_COLOR)
-
-    # Right Wall
-    start_pos = position_component.x_axis + width, position_component.y_axis + 1
-    end_pos = position_component.x_axis + width, position_component.y_axis + height - 1
-    window.drawline(char=VERTICAL_WALL, start_pos=start_pos, end_pos=end_pos, fgcolor=DEFAULT_COLOR)
-
-    # Top Wall
-    start_pos = position_component.x_axis, position_component.y_axis
-    end_pos = position_component.x_axis + width, position_component.y_axis
-    window.drawline(char=HORIZONTAL_WALL, start_pos=start_pos, end_pos=end_pos, fgcolor=DEFAULT_COLOR)
-
-    # Bottom Wall
-    start_pos = position_component.x_axis, position_component.y_axis + height
-    end_pos = position_component.x_axis + width, position_component.y_axis + height
-    window.drawline(char=HORIZONTAL_WALL, start_pos=start_pos, end_pos=end_pos, fgcolor=DEFAULT_COLOR)
-
-    # Inside of the Room
-    y_axis = position_component.y_axis + 1
-    x_axis = position_component.x_axis + 1
-    window.fill(char=ROOM_FLOOR, region=(x_axis, y_axis, width - 1, height - 1), fgcolor=DEFAULT_COLOR)
-
-
-def _render_hero_info(
-    *, window: pygcurse.PygcurseWindow, ecdb: EntityComponentDatabase[ComponentUnion], entity: Entity
-) -> None:
-    x_offset = window.width - 30
-    money_component = cast(MoneyComponent, get_component(ecdb=ecdb, entity=entity, component_type=MoneyComponent))
-    health_component = cast(HealthComponent, get_component(ecdb=ecdb, entity=entity, component_type=HealthComponent))
-    inventory_component = cast(
-        InventoryComponent, get_component(ecdb=ecdb, entity=entity, component_type=InventoryComponent)
-    )
-    equipment_component = cast(
-        EquipmentComponent, get_component(ecdb=ecdb, entity=entity, component_type=EquipmentComponent)
-    )
-
-    window.fill(char=EMPTY, region=(x_offset, 0, window.width, 25))
-
-    line = 0
-
-    window.write(text=f"Gold:   {money_component.amount}", x=x_offset, y=line, fgcolor=GOLD_COLOR)
-    line += 1
-
-    window.write(text=f"Health: {health_component.amount}", x=x_offset, y=line, fgcolor=HEALTH_COLOR)
-    line += 1
-
-    window.write(text="Inventory:", x=x_offset, y=line, fgcolor=INVENTORY_COLOR)
-    line += 1
-
-    for item in inventory_component.entities:
-        type_component = cast(TypeComponent, get_component(ecdb=ecdb, entity=item, component_type=TypeComponent))
-        window.write(
-            text=f"    {TYPE_ENUM_TO_STRING[type_component.entity_type]}", x=x_offset, y=line, fgcolor=INVENTORY_COLOR
-        )
-        line += 1
+from rogue.query_functions import get_entity_of_unique_type
+from rogue.types import TypeEnum
 
-    window.write(text="Equipment:", x=x_offset, y=line, fgcolor=EQUIPMENT_COLOR)
-    line += 1
 
-    for item in equipment_component.entities:
-        type_component = cast(TypeComponent, get_component(ecdb=ecdb, entity=item, component_type=TypeComponent))
-        window.write(
-            text=f"    {TYPE_ENUM_TO_STRING[type_component.entity_type]}", x=x_offset, y=line, fgcolor=EQUIPMENT_COLOR
-        )
-        line += 1
+@attr.s(frozen=True, kw_only=True)
+class StaticLayer:
+    """
+    Rooms and doors of a level, rendered once to an offscreen surface
+    """
+
+    level_key: LevelKey = attr.ib()
+    surface: "pygcurse.PygcurseSurface" = attr.ib()
+    cells: Dict[Coordinates, Glyph] = attr.ib()
+
+    @classmethod
+    def create(cls, *, window: "pygcurse.PygcurseWindow", level_key: LevelKey) -> "StaticLayer":
+        cells = get_static_cells(level_key=level_key)
+        surface = pygcurse.PygcurseSurface(width=window.width, height=window.height, font=window.font)
+        surface.autoupdate = False
+        surface.fill(char=EMPTY, fgcolor=DEFAULT_COLOR)
+        for (y_axis, x_axis), (symbol, color) in cells.items():
+            surface.putchar(symbol, x=x_axis, y=y_axis, fgcolor=color)
+        return cls(level_key=level_key, surface=surface, cells=cells)
+
+    def get_cell(self, coordinates: Coordinates) -> Glyph:
+        return self.cells.get(coordinates, (EMPTY, DEFAULT_COLOR))
+
+
+def _get_hero_info_x_offset(window: "pygcurse.PygcurseWindow") -> int:
+    return int(window.width) - HERO_INFO_WIDTH
+
+
+def _render_hero_info(*, window: "pygcurse.PygcurseWindow", lines: HeroInfoLines) -> None:
+    x_offset = _get_hero_info_x_offset(window)
+    window.fill(char=EMPTY, region=(x_offset, 0, window.width, HERO_INFO_HEIGHT))
+    for line, (text, color) in enumerate(lines):
+        window.write(text=text, x=x_offset, y=line, fgcolor=color)
+
+
+class RenderCache:
+    """
+    What is on the window: the static layer of the level, the cells covered by dynamic entities and the hero info
+    """
+
+    def __init__(self) -> None:
+        self.static_layer: Optional[StaticLayer] = None
+        self.dynamic_cells: Set[Coordinates] = set()
+        self.hero_info_lines: Optional[HeroInfoLines] = None
 
 
 @attr.s(frozen=True, kw_only=True)
 class PygcurseRenderSystem(NoReturnSystemTrait):
-    window: pygcurse.PygcurseWindow = attr.ib()
+    """
+    Draws into the window with autoupdate disabled and updates the window once per frame.
+    The static layer is pasted only when the level changes, otherwise only the cells of the dynamic entities and
+    the hero info, when it changed, are redrawn.
+    """
+
+    WRITTEN_COMPONENT_TYPES = frozenset()
+
+    window: "pygcurse.PygcurseWindow" = attr.ib()
+    # Redraw only the cells that changed since the previous frame, actions have to be recorded by change_tracker
+    change_tracker: Optional[ChangeTracker] = attr.ib(default=None, cmp=False)
+    cache: RenderCache = attr.ib(factory=RenderCache, cmp=False)
 
     @classmethod
-    def create_from_height_and_width(cls, *, height: int, width: int) -> "PygcurseRenderSystem":
+    def create_from_height_and_width(
+        cls, *, height: int, width: int, track_changes: bool = False
+    ) -> "PygcurseRenderSystem":
         window = pygcurse.PygcurseWindow(width=width, height=height)
-        return PygcurseRenderSystem(window=window)
+        window.autoupdate = False
+        change_tracker = ChangeTracker() if track_changes else None
+        return PygcurseRenderSystem(window=window, change_tracker=change_tracker)
 
     def __call__(self, *, ecdb: EntityComponentDatabase[ComponentUnion]) -> None:
-
-        dynamic_entities: Deque[Tuple[Entity, PositionComponent, TypeComponent]] = deque(maxlen=None)
-
-        component_types: List[Type[ComponentUnion]] = [PositionComponent, TypeComponent]
-        for entity, (position_component, type_component) in query(ecdb=ecdb, component_types=component_types):
-            size_component = get_component(ecdb=ecdb, entity=entity, component_type=SizeComponent)
-
-            # Visualize rooms
-            if size_component is not None:
-                _render_room(window=self.window, position_component=position_component, size_component=size_component)
+        if self.change_tracker is None:
+            self._render_all(ecdb=ecdb)
+        else:
+            change_set = self.change_tracker.compute_change_set(ecdb=ecdb)
+            if change_set.is_full or self._changes_level(change_tracker=self.change_tracker, change_set=change_set):
+                self._render_all(ecdb=ecdb)
             else:
-                # Defer dynamic entities to make sure all static ones already rendered
-                dynamic_entities.append((entity, position_component, type_component))
-
-        # Visualize dynamic entities
-        while len(dynamic_entities) > 0:
-            entity, position_component, type_component = dynamic_entities.popleft()
+                self._render_changes(ecdb=ecdb, change_tracker=self.change_tracker, change_set=change_set)
+        self.window.update()
+
+    def _render_static_layer(self, *, ecdb: EntityComponentDatabase[ComponentUnion]) -> bool:
+        """
+        Paste the static layer of the level on the window if the level changed. Returns whether it was pasted.
+        """
+
+        level_key = get_level_key(ecdb=ecdb)
+        static_layer = self.cache.static_layer
+        if static_layer is not None and static_layer.level_key == level_key:
+            return False
+
+        static_layer = StaticLayer.create(window=self.window, level_key=level_key)
+        static_layer.surface.paste(None, self.window, None)
+        self.cache.static_layer = static_layer
+        self.cache.dynamic_cells.clear()
+        self.cache.hero_info_lines = None
+        return True
+
+    def _is_under_hero_info(self, coordinates: Coordinates) -> bool:
+        y_axis, x_axis = coordinates
+        return x_axis >= _get_hero_info_x_offset(self.window) and y_axis < HERO_INFO_HEIGHT
+
+    def _restore_cells(self, cells: Iterable[Coordinates]) -> bool:
+        """
+        Redraw `cells` from the static layer. Returns whether any of them is under the hero info.
+        """
+
+        static_layer = cast(StaticLayer, self.cache.static_layer)
+        overlaps_hero_info = False
+        for y_axis, x_axis in cells:
+            symbol, color = static_layer.get_cell((y_axis, x_axis))
+            self.window.putchar(symbol, x=x_axis, y=y_axis, fgcolor=color)
+            overlaps_hero_info |= self._is_under_hero_info((y_axis, x_axis))
+        return overlaps_hero_info
+
+    def _render_hero_info(self, *, ecdb: EntityComponentDatabase[ComponentUnion], force: bool) -> None:
+        try:
+            entity = get_entity_of_unique_type(ecdb=ecdb, entity_type=TypeEnum.Hero)
+        except KeyError:
+            return
+        lines = get_hero_info_lines(ecdb=ecdb, entity=entity)
+        if force or lines != self.cache.hero_info_lines:
+            _render_hero_info(window=self.window, lines=lines)
+            self.cache.hero_info_lines = lines
+
+    def _render_all(self, *, ecdb: EntityComponentDatabase[ComponentUnion]) -> None:
+
+        force_hero_info = self._render_static_layer(ecdb=ecdb)
+        force_hero_info |= self._restore_cells(self.cache.dynamic_cells)
+        self.cache.dynamic_cells.clear()
+
+        # Visualize dynamic entities, in the order of their ids so that the entity with the highest id is on top,
+        # as in _render_changes
+        component_types: List[Type[ComponentUnion]] = [PositionComponent, TypeComponent]
+        entities_and_components = sorted(
+            query(ecdb=ecdb, component_types=component_types),
+            key=lambda entity_and_components: entity_and_components[0].unique_id,
+        )
+        for _, components in entities_and_components:
+            position_component, type_component = cast(RenderedState, components)
             entity_type = type_component.entity_type
-            symbol, color = _type_to_appearance(entity_type)
-            self.window.putchar(
-                symbol, x=position_component.x_axis, y=position_component.y_axis, fgcolor=color,
-            )
-
-            if entity_type == TypeEnum.Hero:
-                _render_hero_info(window=self.window, ecdb=ecdb, entity=entity)
+            if entity_type in STATIC_TYPES:
+                continue
+            symbol, color = type_to_appearance(entity_type)
+            y_axis, x_axis = position_component.y_axis, position_component.x_axis
+            self.window.putchar(symbol, x=x_axis, y=y_axis, fgcolor=color)
+            self.cache.dynamic_cells.add((y_axis, x_axis))
+            force_hero_info |= self._is_under_hero_info((y_axis, x_axis))
+
+        self._render_hero_info(ecdb=ecdb, force=force_hero_info)
+
+    def _changes_level(self, *, change_tracker: ChangeTracker, change_set: ChangeSet) -> bool:
+        for entity in change_set.added | change_set.changed:
+            _, type_component = cast(RenderedState, change_tracker.get_rendered_state(entity))
+            if type_component.entity_type in STATIC_TYPES:
+                return True
+        return False
+
+    def _render_changes(
+        self, *, ecdb: EntityComponentDatabase[ComponentUnion], change_tracker: ChangeTracker, change_set: ChangeSet
+    ) -> None:
+
+        force_hero_info = self._restore_cells(change_set.dirty_cells)
+        for coordinates in change_set.dirty_cells:
+            self.cache.dynamic_cells.discard(coordinates)
+            # The entity with the highest id is on top, as in _render_all
+            for entity in reversed(change_tracker.get_entities_at(coordinates)):
+                _, type_component = cast(RenderedState, change_tracker.get_rendered_state(entity))
+                if type_component.entity_type in STATIC_TYPES:
+                    continue
+                symbol, color = type_to_appearance(type_component.entity_type)
+                y_axis, x_axis = coordinates
+                self.window.putchar(symbol, x=x_axis, y=y_axis, fgcolor=color)
+                self.cache.dynamic_cells.add(coordinates)
+                break
+
+        self._render_hero_info(ecdb=ecdb, force=force_hero_info)
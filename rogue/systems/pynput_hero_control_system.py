@@ -1,7 +1,17 @@
-from typing import Generator
+import queue
+import threading
+import time
+from typing import Any, Dict, Generator, Optional
 
 import attr
-from pynput import keyboard
+
+# pynput needs a display on Linux, the other systems stay importable without one
+try:
+    from pynput import keyboard
+
+    KEYBOARD_IMPORT_ERROR: Optional[ImportError] = None
+except ImportError as error:
+    KEYBOARD_IMPORT_ERROR = error
 
 from rogue.generic.ecs import EntityComponentDatabase
 from rogue.components import (
@@ -14,18 +24,114 @@ from rogue.systems.common.actions import (
 )
 from rogue.systems.common.traits import YieldChangesSystemTrait
 from rogue.exceptions import QuitGameException, IgnoreTimeStepException
-from rogue.systems.control_systems.functions import get_hero_entity, maybe_equip_next_weapon, maybe_drink_potion
+from rogue.systems.control_systems.functions import (
+    HERO_CONTROL_READ_COMPONENT_TYPES,
+    HERO_CONTROL_WRITTEN_COMPONENT_TYPES,
+    get_hero_entity,
+    maybe_equip_next_weapon,
+    maybe_drink_potion,
+)
+
+# Keys pressed while the game doesn't keep up, the oldest ones are dropped beyond that
+MAX_QUEUED_KEYS = 16
+
+
+class KeyboardListener:
+    """
+    Listens to the keyboard on a background thread, between start() and stop() or within a with block, and queues
+    the pressed keys, so that no key pressed between two ticks is lost. At most `max_queued_keys` keys are queued,
+    a new key replaces the oldest one when the queue is full.
+
+    Holding a key makes the OS repeat its press. With `repeat_interval` None only the first press is queued,
+    otherwise a repeated press is queued if at least `repeat_interval` seconds passed since the last queued one.
+    """
+
+    def __init__(self, *, repeat_interval: Optional[float] = 0.0, max_queued_keys: int = MAX_QUEUED_KEYS):
+        self.repeat_interval = repeat_interval
+        # A queue rather than a bounded deque, get_key() waits on it for up to a timeout
+        self.keys: "queue.Queue[Any]" = queue.Queue(maxsize=max_queued_keys)
+        # Only used by the listener thread
+        self._last_press_times: Dict[Any, float] = {}
+        self._listener: Optional["keyboard.Listener"] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._listener is None:
+                self._listener = keyboard.Listener(on_press=self._on_press, on_release=self._on_release)
+                self._listener.start()
+
+    def stop(self) -> None:
+        with self._lock:
+            if self._listener is not None:
+                self._listener.stop()
+                self._listener = None
+
+    def __enter__(self) -> "KeyboardListener":
+        self.start()
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.stop()
+
+    def _on_press(self, key: Any) -> None:
+        now = time.monotonic()
+        last_press_time = self._last_press_times.get(key)
+        if last_press_time is not None:
+            if self.repeat_interval is None or now - last_press_time < self.repeat_interval:
+                return
+        self._last_press_times[key] = now
+        # Only the listener thread puts keys, the queue has room after the oldest key is dropped
+        while True:
+            try:
+                self.keys.put_nowait(key)
+                return
+            except queue.Full:
+                try:
+                    self.keys.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def _on_release(self, key: Any) -> None:
+        self._last_press_times.pop(key, None)
+
+    def get_key(self, *, timeout: float) -> Optional[Any]:
+        """
+        Return the next queued key without blocking. If there is none, wait for up to `timeout` seconds for one.
+        """
+
+        try:
+            return self.keys.get_nowait()
+        except queue.Empty:
+            pass
+        if timeout <= 0:
+            return None
+        try:
+            return self.keys.get(timeout=timeout)
+        except queue.Empty:
+            return None
 
 
 @attr.s(frozen=True, kw_only=True, hash=False, cmp=False)
 class PynputHeroControlSystem(YieldChangesSystemTrait):
+    READ_COMPONENT_TYPES = HERO_CONTROL_READ_COMPONENT_TYPES
+    WRITTEN_COMPONENT_TYPES = HERO_CONTROL_WRITTEN_COMPONENT_TYPES
+
     upwards: int = attr.ib()
     downwards: int = attr.ib()
+    # How long to wait for a key when none is queued, the time step is ignored if none arrives
     timeout: float = attr.ib()
+    listener: KeyboardListener = attr.ib()
 
     @classmethod
-    def create(cls, upwards: int = 1, downwards: int = -1, timeout: float = 0.25) -> "PynputHeroControlSystem":
-        return cls(upwards=upwards, downwards=downwards, timeout=timeout)
+    def create(
+        cls, upwards: int = 1, downwards: int = -1, timeout: float = 0.25, repeat_interval: Optional[float] = 0.0
+    ) -> "PynputHeroControlSystem":
+        if KEYBOARD_IMPORT_ERROR is not None:
+            raise ImportError(f"The keyboard can't be read without pynput: {KEYBOARD_IMPORT_ERROR}")
+        # Started by the game, for as long as it runs
+        listener = KeyboardListener(repeat_interval=repeat_interval)
+        return cls(upwards=upwards, downwards=downwards, timeout=timeout, listener=listener)
 
     def __hash__(self) -> int:
         return 0
@@ -34,38 +140,37 @@ class PynputHeroControlSystem(YieldChangesSystemTrait):
 
         hero_entity = get_hero_entity(ecdb=ecdb)
 
-        with keyboard.Events() as events:
-            event = events.get(timeout=self.timeout)
-            print(event)
-            if isinstance(event, keyboard.Events.Press):
-
-                hero_velocity_y, hero_velocity_x = 0, 0
-
-                if event.key == keyboard.Key.esc:
-                    raise QuitGameException
-
-                if event.key == keyboard.Key.left:
-                    hero_velocity_x = -1
-                elif event.key == keyboard.Key.right:
-                    hero_velocity_x = 1
-                elif event.key == keyboard.Key.up:
-                    hero_velocity_y = self.upwards
-                elif event.key == keyboard.Key.down:
-                    hero_velocity_y = self.downwards
-                elif event.key == keyboard.KeyCode.from_char("e"):
-                    yield from maybe_equip_next_weapon(ecdb=ecdb, entity=hero_entity)
-                    return
-                elif event.key == keyboard.KeyCode.from_char("p"):
-                    yield from maybe_drink_potion(ecdb=ecdb, entity=hero_entity)
-                    return
-                else:
-                    raise IgnoreTimeStepException
-
-                if hero_velocity_y != 0 or hero_velocity_x != 0:
-                    velocity_component = VelocityComponent.create_from_attributes(
-                        y_axis=hero_velocity_y, x_axis=hero_velocity_x
-                    )
-                    yield AddComponentAction(entity=hero_entity, component=velocity_component)
-                    return
-            else:
-                raise IgnoreTimeStepException
+        # One key per time step, the rest stay queued for the next time steps
+        key = self.listener.get_key(timeout=self.timeout)
+        if key is None:
+            raise IgnoreTimeStepException
+
+        hero_velocity_y, hero_velocity_x = 0, 0
+
+        if key == keyboard.Key.esc:
+            self.listener.stop()
+            raise QuitGameException
+
+        if key == keyboard.Key.left:
+            hero_velocity_x = -1
+        elif key == keyboard.Key.right:
+            hero_velocity_x = 1
+        elif key == keyboard.Key.up:
+            hero_velocity_y = self.upwards
+        elif key == keyboard.Key.down:
+            hero_velocity_y = self.downwards
+        elif key == keyboard.KeyCode.from_char("e"):
+            yield from maybe_equip_next_weapon(ecdb=ecdb, entity=hero_entity)
+            return
+        elif key == keyboard.KeyCode.from_char("p"):
+            yield from maybe_drink_potion(ecdb=ecdb, entity=hero_entity)
+            return
+        else:
+            raise IgnoreTimeStepException
+
+        if hero_velocity_y != 0 or hero_velocity_x != 0:
+            velocity_component = VelocityComponent.create_from_attributes(
+                y_axis=hero_velocity_y, x_axis=hero_velocity_x
+            )
+            yield AddComponentAction(entity=hero_entity, component=velocity_component)
+            return
@@ -0,0 +1,80 @@
+from collections import deque
+from typing import Deque, Generator
+
+import attr
+
+from rogue.generic.ecs import EntityComponentDatabase
+from rogue.components import (
+    ComponentUnion,
+    VelocityComponent,
+)
+from rogue.systems.common.actions import (
+    ActionUnion,
+    AddComponentAction,
+)
+from rogue.systems.common.traits import YieldChangesSystemTrait
+from rogue.systems.control_systems.functions import (
+    HERO_CONTROL_READ_COMPONENT_TYPES,
+    HERO_CONTROL_WRITTEN_COMPONENT_TYPES,
+    get_hero_entity,
+    maybe_equip_next_weapon,
+    maybe_drink_potion,
+)
+from rogue.exceptions import IgnoreTimeStepException
+from rogue.types import HeroCommandEnum
+
+
+@attr.s(frozen=True, kw_only=True, hash=False, cmp=False)
+class ScriptedHeroControlSystem(YieldChangesSystemTrait):
+    """
+    Controls the hero with the commands queued in `commands` instead of the keyboard, one command per time step.
+    The hero waits when no command is queued, unless the system is `turn_based`: the time step is then ignored, so
+    that the other entities only move when the hero does, like with the keyboard controls.
+    """
+
+    READ_COMPONENT_TYPES = HERO_CONTROL_READ_COMPONENT_TYPES
+    WRITTEN_COMPONENT_TYPES = HERO_CONTROL_WRITTEN_COMPONENT_TYPES
+
+    upwards: int = attr.ib()
+    downwards: int = attr.ib()
+    commands: Deque[HeroCommandEnum] = attr.ib()
+    turn_based: bool = attr.ib()
+
+    @classmethod
+    def create(cls, *, upwards: int = -1, downwards: int = 1, turn_based: bool = False) -> "ScriptedHeroControlSystem":
+        return cls(upwards=upwards, downwards=downwards, commands=deque(), turn_based=turn_based)
+
+    def __hash__(self) -> int:
+        return 0
+
+    def __call__(self, *, ecdb: EntityComponentDatabase[ComponentUnion]) -> Generator[ActionUnion, None, None]:
+
+        if len(self.commands) == 0:
+            if self.turn_based:
+                raise IgnoreTimeStepException
+            return
+        command = self.commands.popleft()
+
+        hero_entity = get_hero_entity(ecdb=ecdb)
+        hero_velocity_y, hero_velocity_x = 0, 0
+
+        if command == HeroCommandEnum.Left:
+            hero_velocity_x = -1
+        elif command == HeroCommandEnum.Right:
+            hero_velocity_x = 1
+        elif command == HeroCommandEnum.Up:
+            hero_velocity_y = self.upwards
+        elif command == HeroCommandEnum.Down:
+            hero_velocity_y = self.downwards
+        elif command == HeroCommandEnum.EquipNextWeapon:
+            yield from maybe_equip_next_weapon(ecdb=ecdb, entity=hero_entity)
+            return
+        elif command == HeroCommandEnum.DrinkPotion:
+            yield from maybe_drink_potion(ecdb=ecdb, entity=hero_entity)
+            return
+
+        if hero_velocity_y != 0 or hero_velocity_x != 0:
+            velocity_component = VelocityComponent.create_from_attributes(
+                y_axis=hero_velocity_y, x_axis=hero_velocity_x
+            )
+            yield AddComponentAction(entity=hero_entity, component=velocity_component)
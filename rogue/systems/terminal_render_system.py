@@ -0,0 +1,291 @@
+"""
+Render system for ANSI terminals, e.g. over SSH, without pygame.
+
+The screen is kept in two buffers of code points and color indices: the front buffer holds what the terminal shows,
+the back buffer the next frame. A frame emits the cursor moves, colors and symbols of the cells that differ between
+the two buffers only, with a single write.
+"""
+
+import os
+import sys
+from typing import (
+    cast,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
+
+import attr
+import numpy as np
+
+from rogue.generic.ecs import (
+    EntityComponentDatabase,
+    query,
+)
+from rogue.components import (
+    ComponentUnion,
+    PositionComponent,
+    TypeComponent,
+)
+from rogue.systems.common.changes import ChangeSet, ChangeTracker, Coordinates, RenderedState
+from rogue.systems.common.glyphs import (
+    DEFAULT_COLOR,
+    EMPTY,
+    HERO_COLOR,
+    ENEMY_COLOR,
+    WEAPON_COLOR,
+    GOLD_COLOR,
+    POTION_COLOR,
+    HEALTH_COLOR,
+    INVENTORY_COLOR,
+    EQUIPMENT_COLOR,
+    HERO_INFO_WIDTH,
+    HERO_INFO_HEIGHT,
+    STATIC_TYPES,
+    LevelKey,
+    HeroInfoLines,
+    type_to_appearance,
+    get_level_key,
+    get_static_cells,
+    get_hero_info_lines,
+)
+from rogue.systems.common.traits import NoReturnSystemTrait
+from rogue.query_functions import get_entity_of_unique_type
+from rogue.types import TypeEnum
+
+# Parameters of the select graphic rendition sequences, the 8 basic colors are the shortest and the most portable
+COLOR_TO_ANSI: Dict[str, str] = {
+    DEFAULT_COLOR: "37",
+    HERO_COLOR: "35",
+    ENEMY_COLOR: "31",
+    WEAPON_COLOR: "32",
+    GOLD_COLOR: "33",
+    POTION_COLOR: "34",
+    HEALTH_COLOR: "32",
+    INVENTORY_COLOR: "35",
+    EQUIPMENT_COLOR: "31",
+}
+PALETTE: Tuple[str, ...] = tuple(COLOR_TO_ANSI)
+COLOR_TO_INDEX: Dict[str, int] = {color: index for index, color in enumerate(PALETTE)}
+
+HIDE_CURSOR = "\x1b[?25l"
+SHOW_CURSOR = "\x1b[?25h"
+CLEAR_SCREEN = "\x1b[2J"
+RESET_COLOR = "\x1b[0m"
+# Longest gap on a row that is rewritten rather than skipped with a cursor forward sequence
+MAX_REWRITTEN_GAP = 3
+
+DYNAMIC_COMPONENT_TYPES: List[Type[ComponentUnion]] = [PositionComponent, TypeComponent]
+
+
+def _move_cursor(*, y_axis: int, x_axis: int) -> str:
+    return f"\x1b[{y_axis + 1};{x_axis + 1}H"
+
+
+def _set_color(color_index: int) -> str:
+    return f"\x1b[{COLOR_TO_ANSI[PALETTE[color_index]]}m"
+
+
+class ScreenBuffer:
+    def __init__(self, *, height: int, width: int):
+        self.symbols = np.full((height, width), ord(EMPTY), dtype=np.uint32)
+        self.colors = np.full((height, width), COLOR_TO_INDEX[DEFAULT_COLOR], dtype=np.uint8)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        height, width = self.symbols.shape
+        return height, width
+
+    def contains(self, coordinates: Coordinates) -> bool:
+        height, width = self.shape
+        y_axis, x_axis = coordinates
+        return 0 <= y_axis < height and 0 <= x_axis < width
+
+    def put(self, coordinates: Coordinates, *, symbol: str, color: str) -> None:
+        if self.contains(coordinates):
+            self.symbols[coordinates] = ord(symbol)
+            self.colors[coordinates] = COLOR_TO_INDEX[color]
+
+    def copy_from(self, other: "ScreenBuffer") -> None:
+        self.symbols[:] = other.symbols
+        self.colors[:] = other.colors
+
+
+class TerminalBuffers:
+    """
+    The static layer of the level, the map (static layer and dynamic entities), the frame about to be emitted and
+    the frame shown by the terminal
+    """
+
+    def __init__(self, *, height: int, width: int):
+        self.level_key: Optional[LevelKey] = None
+        self.static = ScreenBuffer(height=height, width=width)
+        self.map = ScreenBuffer(height=height, width=width)
+        self.back = ScreenBuffer(height=height, width=width)
+        self.front = ScreenBuffer(height=height, width=width)
+        self.is_initialized = False
+        self.number_of_frames = 0
+        self.number_of_bytes = 0
+
+
+def render_diff(*, front: ScreenBuffer, back: ScreenBuffer, color_index: Optional[int] = None) -> str:
+    """
+    Escape sequences and symbols that turn `front` into `back` on a terminal whose current color is `color_index`
+    (None when unknown)
+    """
+
+    _, width = back.shape
+    ys, xs = np.nonzero((front.symbols != back.symbols) | (front.colors != back.colors))
+    output: List[str] = []
+    # Unknown after the last column, the terminal may have wrapped
+    cursor: Optional[Coordinates] = None
+    for y_axis, x_axis in zip(ys.tolist(), xs.tolist()):
+        if cursor is not None and cursor[0] == y_axis and cursor[1] <= x_axis:
+            gap = x_axis - cursor[1]
+            if 0 < gap <= MAX_REWRITTEN_GAP and np.all(back.colors[y_axis, cursor[1] : x_axis] == color_index):
+                output.append("".join(map(chr, back.symbols[y_axis, cursor[1] : x_axis].tolist())))
+            elif gap > 0:
+                output.append(f"\x1b[{gap}C")
+        else:
+            output.append(_move_cursor(y_axis=y_axis, x_axis=x_axis))
+
+        cell_color_index = int(back.colors[y_axis, x_axis])
+        if cell_color_index != color_index:
+            output.append(_set_color(cell_color_index))
+            color_index = cell_color_index
+        output.append(chr(back.symbols[y_axis, x_axis]))
+        cursor = (y_axis, x_axis + 1) if x_axis + 1 < width else None
+    return "".join(output)
+
+
+def _write_all(file_descriptor: int, data: bytes) -> None:
+    view = memoryview(data)
+    while len(view) > 0:
+        view = view[os.write(file_descriptor, view) :]
+
+
+@attr.s(frozen=True, kw_only=True)
+class TerminalRenderSystem(NoReturnSystemTrait):
+    """
+    Draws the map with the hero info at the top right. The map is redrawn fully when the level changes and,
+    with `change_tracker`, only at the cells that changed since the previous frame otherwise.
+    """
+
+    WRITTEN_COMPONENT_TYPES = frozenset()
+
+    file_descriptor: int = attr.ib()
+    buffers: TerminalBuffers = attr.ib(cmp=False)
+    # Redraw only the cells that changed since the previous frame, actions have to be recorded by change_tracker
+    change_tracker: Optional[ChangeTracker] = attr.ib(default=None, cmp=False)
+
+    @classmethod
+    def create_from_height_and_width(
+        cls, *, height: int, width: int, track_changes: bool = False, file_descriptor: Optional[int] = None
+    ) -> "TerminalRenderSystem":
+        return TerminalRenderSystem(
+            file_descriptor=sys.stdout.fileno() if file_descriptor is None else file_descriptor,
+            buffers=TerminalBuffers(height=height, width=width),
+            change_tracker=ChangeTracker() if track_changes else None,
+        )
+
+    def __call__(self, *, ecdb: EntityComponentDatabase[ComponentUnion]) -> None:
+        if self.change_tracker is None:
+            self._render_map(ecdb=ecdb)
+        else:
+            change_set = self.change_tracker.compute_change_set(ecdb=ecdb)
+            if change_set.is_full or self._changes_level(change_tracker=self.change_tracker, change_set=change_set):
+                self._render_map(ecdb=ecdb)
+            else:
+                self._render_cells(change_tracker=self.change_tracker, cells=change_set.dirty_cells)
+
+        self.buffers.back.copy_from(self.buffers.map)
+        self._render_hero_info(ecdb=ecdb)
+        self._emit_frame()
+
+    def close(self) -> None:
+        """
+        Restore the color and the cursor and move the cursor below the screen
+        """
+
+        height, _ = self.buffers.front.shape
+        output = RESET_COLOR + _move_cursor(y_axis=height, x_axis=0) + SHOW_CURSOR
+        _write_all(self.file_descriptor, output.encode())
+
+    def _render_static_layer(self, *, ecdb: EntityComponentDatabase[ComponentUnion]) -> None:
+        level_key = get_level_key(ecdb=ecdb)
+        if level_key == self.buffers.level_key:
+            return
+
+        static = self.buffers.static
+        static.symbols.fill(ord(EMPTY))
+        static.colors.fill(COLOR_TO_INDEX[DEFAULT_COLOR])
+        for coordinates, (symbol, color) in get_static_cells(level_key=level_key).items():
+            static.put(coordinates, symbol=symbol, color=color)
+        self.buffers.level_key = level_key
+
+    def _render_map(self, *, ecdb: EntityComponentDatabase[ComponentUnion]) -> None:
+        self._render_static_layer(ecdb=ecdb)
+        self.buffers.map.copy_from(self.buffers.static)
+        for _, components in query(ecdb=ecdb, component_types=DYNAMIC_COMPONENT_TYPES):
+            position_component, type_component = cast(RenderedState, components)
+            if type_component.entity_type in STATIC_TYPES:
+                continue
+            symbol, color = type_to_appearance(type_component.entity_type)
+            self.buffers.map.put((position_component.y_axis, position_component.x_axis), symbol=symbol, color=color)
+
+    def _changes_level(self, *, change_tracker: ChangeTracker, change_set: ChangeSet) -> bool:
+        for entity in change_set.added | change_set.changed:
+            _, type_component = cast(RenderedState, change_tracker.get_rendered_state(entity))
+            if type_component.entity_type in STATIC_TYPES:
+                return True
+        return False
+
+    def _render_cells(self, *, change_tracker: ChangeTracker, cells: Iterable[Coordinates]) -> None:
+        static, map_buffer = self.buffers.static, self.buffers.map
+        for coordinates in cells:
+            if not map_buffer.contains(coordinates):
+                continue
+            map_buffer.symbols[coordinates] = static.symbols[coordinates]
+            map_buffer.colors[coordinates] = static.colors[coordinates]
+            # The entity with the highest id is on top, as in a full redraw
+            for entity in reversed(change_tracker.get_entities_at(coordinates)):
+                _, type_component = cast(RenderedState, change_tracker.get_rendered_state(entity))
+                if type_component.entity_type in STATIC_TYPES:
+                    continue
+                symbol, color = type_to_appearance(type_component.entity_type)
+                map_buffer.put(coordinates, symbol=symbol, color=color)
+                break
+
+    def _render_hero_info(self, *, ecdb: EntityComponentDatabase[ComponentUnion]) -> None:
+        back = self.buffers.back
+        _, width = back.shape
+        x_offset = max(0, width - HERO_INFO_WIDTH)
+        try:
+            entity = get_entity_of_unique_type(ecdb=ecdb, entity_type=TypeEnum.Hero)
+        except KeyError:
+            return
+        lines: HeroInfoLines = get_hero_info_lines(ecdb=ecdb, entity=entity)
+        back.symbols[:HERO_INFO_HEIGHT, x_offset:] = ord(EMPTY)
+        back.colors[:HERO_INFO_HEIGHT, x_offset:] = COLOR_TO_INDEX[DEFAULT_COLOR]
+        for y_axis, (text, color) in enumerate(lines[:HERO_INFO_HEIGHT]):
+            for x_axis, symbol in enumerate(text[: width - x_offset], start=x_offset):
+                back.put((y_axis, x_axis), symbol=symbol, color=color)
+
+    def _emit_frame(self) -> None:
+        output = ""
+        if not self.buffers.is_initialized:
+            # The front buffer starts blank, as the cleared screen
+            output = HIDE_CURSOR + RESET_COLOR + CLEAR_SCREEN
+            self.buffers.is_initialized = True
+        # The color is set again in every frame, in case something else wrote to the terminal in between
+        output += render_diff(front=self.buffers.front, back=self.buffers.back)
+        self.buffers.front.copy_from(self.buffers.back)
+        self.buffers.number_of_frames += 1
+        if len(output) == 0:
+            return
+        data = output.encode()
+        _write_all(self.file_descriptor, data)
+        self.buffers.number_of_bytes += len(data)
@@ -1,4 +1,4 @@
-from enum import Enum, auto
+from enum import Enum, IntEnum, auto
 
 
 import pyrsistent
@@ -36,3 +36,17 @@ WEAPON_TYPES = pyrsistent.s(TypeEnum.Dagger, TypeEnum.Mace, TypeEnum.Sword, Type
 
 ITEM_TYPES = pyrsistent.s(TypeEnum.Gold, TypeEnum.Potion)
 ITEM_TYPES = ITEM_TYPES.update(WEAPON_TYPES)
+
+
+class HeroCommandEnum(IntEnum):
+    """
+    Commands of the hero for scripted or learned control, the values are stable so they can index an action space
+    """
+
+    Wait = 0
+    Up = 1
+    Down = 2
+    Left = 3
+    Right = 4
+    EquipNextWeapon = 5
+    DrinkPotion = 6
@@ -0,0 +1,59 @@
+from rogue.cli.game import create_game_systems, run_game
+from rogue.generic.ecs import get_component
+from rogue.components import PositionComponent
+from rogue.io.checksums import compute_ecdb_checksums
+from rogue.io.generators import generate_room_config
+from rogue.io.loaders import load_rogue_ecdb_from_room_config
+from rogue.systems import ScriptedHeroControlSystem
+from rogue.systems.common.changes import ChangeTracker
+from rogue.systems.control_systems.functions import get_hero_entity
+from rogue.types import HeroCommandEnum
+
+
+def test_run_game_processes_the_systems_and_records_the_changes() -> None:
+    ecdb = load_rogue_ecdb_from_room_config(generate_room_config(number_of_rooms=2, seed=0))
+    hero = get_hero_entity(ecdb=ecdb)
+    hero_position = get_component(ecdb=ecdb, entity=hero, component_type=PositionComponent)
+    hero_control_system = ScriptedHeroControlSystem.create()
+    hero_control_system.commands.append(HeroCommandEnum.Right)
+    systems = create_game_systems(hero_control_system=hero_control_system, seed=0)
+    change_tracker = ChangeTracker()
+    change_tracker.compute_change_set(ecdb=ecdb)
+
+    rendered_ecdbs = []
+    run_game(
+        ecdb=ecdb,
+        systems=systems,
+        render=lambda previous_ecdb, ecdb, alpha: rendered_ecdbs.append(ecdb),
+        tick_rate=1000.0,
+        fps=1000.0,
+        threads=1,
+        profile=False,
+        change_tracker=change_tracker,
+        should_stop=lambda: len(rendered_ecdbs) >= 10,
+    )
+
+    ecdb = rendered_ecdbs[-1]
+    assert len(hero_control_system.commands) == 0
+    assert get_component(ecdb=ecdb, entity=hero, component_type=PositionComponent) != hero_position
+    assert hero in change_tracker.compute_change_set(ecdb=ecdb).changed
+
+
+def test_run_game_ignores_the_ticks_without_a_command_when_turn_based() -> None:
+    ecdb = load_rogue_ecdb_from_room_config(generate_room_config(number_of_rooms=2, seed=0))
+    checksums = compute_ecdb_checksums(ecdb=ecdb)
+    systems = create_game_systems(hero_control_system=ScriptedHeroControlSystem.create(turn_based=True), seed=0)
+
+    rendered_ecdbs = []
+    run_game(
+        ecdb=ecdb,
+        systems=systems,
+        render=lambda previous_ecdb, ecdb, alpha: rendered_ecdbs.append(ecdb),
+        tick_rate=1000.0,
+        fps=1000.0,
+        threads=1,
+        profile=False,
+        should_stop=lambda: len(rendered_ecdbs) >= 10,
+    )
+
+    assert compute_ecdb_checksums(ecdb=rendered_ecdbs[-1]) == checksums
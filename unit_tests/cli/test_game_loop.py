@@ -0,0 +1,64 @@
+from typing import List, Tuple
+
+import pytest
+
+from rogue.cli.game_loop import FixedTimestepLoop
+from rogue.exceptions import IgnoreTimeStepException
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def test_fixed_timestep_loop_decouples_ticks_from_frames() -> None:
+    clock = FakeClock()
+    loop: FixedTimestepLoop[int] = FixedTimestepLoop(tick_rate=10.0, fps=40.0, clock=clock, sleep=clock.sleep)
+    frames: List[Tuple[int, int, float]] = []
+
+    def render(previous_state: int, state: int, alpha: float) -> None:
+        frames.append((previous_state, state, alpha))
+
+    final_state = loop.run(state=0, tick=lambda state: state + 1, render=render, should_stop=lambda: clock.now >= 0.99)
+
+    assert final_state == 10
+    assert loop.statistics.number_of_ticks == 10
+    assert loop.statistics.number_of_frames == 40
+    assert all(state == previous_state + 1 for previous_state, state, _ in frames)
+    assert [alpha for _, _, alpha in frames[:4]] == pytest.approx([0.0, 0.25, 0.5, 0.75])
+
+
+def test_fixed_timestep_loop_drops_ticks_it_cannot_catch_up() -> None:
+    clock = FakeClock()
+    loop: FixedTimestepLoop[int] = FixedTimestepLoop(
+        tick_rate=10.0, fps=10.0, max_ticks_per_frame=2, clock=clock, sleep=clock.sleep
+    )
+
+    def slow_tick(state: int) -> int:
+        clock.now += 0.35
+        return state + 1
+
+    loop.run(state=0, tick=slow_tick, render=lambda *_: None, should_stop=lambda: clock.now >= 2.0)
+
+    assert loop.statistics.number_of_dropped_ticks > 0
+    assert loop.statistics.number_of_late_ticks > 0
+    assert loop.statistics.number_of_skipped_frames > 0
+
+
+def test_fixed_timestep_loop_counts_ignored_ticks() -> None:
+    clock = FakeClock()
+    loop: FixedTimestepLoop[int] = FixedTimestepLoop(tick_rate=10.0, fps=10.0, clock=clock, sleep=clock.sleep)
+
+    def ignored_tick(state: int) -> int:
+        raise IgnoreTimeStepException
+
+    final_state = loop.run(state=0, tick=ignored_tick, render=lambda *_: None, should_stop=lambda: clock.now >= 0.49)
+
+    assert final_state == 0
+    assert loop.statistics.number_of_ignored_ticks == loop.statistics.number_of_ticks == 5
@@ -0,0 +1,32 @@
+from click.testing import CliRunner
+
+from rogue.cli.rogue import rogue
+
+
+def test_simulate_records_a_deterministic_run(tmp_path) -> None:
+    outputs = []
+    for index in range(2):
+        record = tmp_path / f"run_{index}.log"
+        result = CliRunner().invoke(
+            rogue,
+            [
+                "simulate",
+                "configs/sample_room_config.yaml",
+                "--ticks",
+                "20",
+                "--seed",
+                "3",
+                "--threads",
+                str(index),
+                "--record",
+                str(record),
+                "--no_level_cache",
+            ],
+        )
+        assert result.exit_code == 0, result.output
+        assert "Ticks:        20 (0 skipped)" in result.output
+        assert record.stat().st_size > 0
+        outputs.append([line for line in result.output.splitlines() if line.startswith("Checksum")])
+
+    assert len(outputs[0]) > 0
+    assert outputs[0] == outputs[1]
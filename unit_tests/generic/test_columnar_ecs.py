@@ -0,0 +1,219 @@
+import numpy as np
+import pytest
+
+from rogue.generic.columnar_ecs import (
+    Entity,
+    create_ecdb,
+    add_entity,
+    remove_entity,
+    add_component,
+    get_component,
+    get_components,
+    get_unique_entity,
+    remove_component,
+    query,
+    query_columns,
+    add_component_columns,
+    add_entities,
+    add_components,
+    query_components,
+    query_entities_by_component_value,
+    create_systems,
+    add_system,
+    process_systems,
+)
+from rogue.components import (
+    PositionComponent,
+    VelocityComponent,
+    SizeComponent,
+    TypeComponent,
+    InventoryComponent,
+    MoneyComponent,
+)
+from rogue.types import TypeEnum
+
+
+def _create_sample_ecdb():
+    ecdb = create_ecdb()
+    ecdb, _ = add_entity(
+        ecdb=ecdb,
+        components=[
+            PositionComponent.create_from_attributes(y_axis=1, x_axis=2),
+            TypeComponent.create_from_attributes(entity_type=TypeEnum.Room),
+        ],
+    )
+    ecdb, _ = add_entity(
+        ecdb=ecdb,
+        components=[
+            PositionComponent.create_from_attributes(y_axis=3, x_axis=4),
+            VelocityComponent.create_from_attributes(y_axis=1, x_axis=-1),
+            TypeComponent.create_from_attributes(entity_type=TypeEnum.Orc),
+            InventoryComponent.create_from_attributes(entities=[]),
+        ],
+    )
+    return ecdb
+
+
+def test_add_get_and_remove_components():
+    ecdb = _create_sample_ecdb()
+
+    orc = Entity(unique_id=1)
+    assert get_component(ecdb=ecdb, entity=orc, component_type=PositionComponent) == PositionComponent(
+        y_axis=3, x_axis=4
+    )
+    assert get_component(ecdb=ecdb, entity=orc, component_type=TypeComponent) == TypeComponent(entity_type=TypeEnum.Orc)
+
+    ecdb = add_component(ecdb=ecdb, entity=orc, component=PositionComponent(y_axis=5, x_axis=6))
+    assert get_component(ecdb=ecdb, entity=orc, component_type=PositionComponent) == PositionComponent(
+        y_axis=5, x_axis=6
+    )
+
+    ecdb = remove_component(ecdb=ecdb, entity=orc, component_type=PositionComponent)
+    assert get_component(ecdb=ecdb, entity=orc, component_type=PositionComponent) is None
+
+    ecdb = remove_entity(ecdb=ecdb, entity=orc)
+    with pytest.raises(KeyError):
+        get_component(ecdb=ecdb, entity=orc, component_type=TypeComponent)
+
+
+def test_query():
+    ecdb = _create_sample_ecdb()
+
+    assert list(query(ecdb=ecdb, component_types=[PositionComponent, VelocityComponent])) == [
+        (Entity(unique_id=1), (PositionComponent(y_axis=3, x_axis=4), VelocityComponent(y_axis=1, x_axis=-1)))
+    ]
+    assert [entity for entity, _ in query(ecdb=ecdb, component_types=[PositionComponent])] == [
+        Entity(unique_id=0),
+        Entity(unique_id=1),
+    ]
+    assert [
+        entity
+        for entity, _ in query(
+            ecdb=ecdb, filter_function=lambda components: components[TypeComponent].entity_type == TypeEnum.Room
+        )
+    ] == [Entity(unique_id=0)]
+
+
+def test_query_columns_and_add_component_columns():
+    ecdb = _create_sample_ecdb()
+
+    unique_ids, (position_columns, velocity_columns) = query_columns(
+        ecdb=ecdb, component_types=[PositionComponent, VelocityComponent]
+    )
+    np.testing.assert_array_equal(unique_ids, [1])
+
+    ecdb = add_component_columns(
+        ecdb=ecdb,
+        unique_ids=unique_ids,
+        component_type=PositionComponent,
+        columns={
+            "y_axis": position_columns["y_axis"] + velocity_columns["y_axis"],
+            "x_axis": position_columns["x_axis"] + velocity_columns["x_axis"],
+        },
+    )
+    assert get_component(ecdb=ecdb, entity=Entity(unique_id=1), component_type=PositionComponent) == (
+        PositionComponent(y_axis=4, x_axis=3)
+    )
+
+
+def test_query_columns_of_a_type_without_components_does_not_change_the_ecdb():
+    ecdb = _create_sample_ecdb()
+
+    unique_ids, (money_columns,) = query_columns(ecdb=ecdb, component_types=[MoneyComponent])
+    assert len(unique_ids) == 0
+    assert len(money_columns["amount"]) == 0
+    assert MoneyComponent not in ecdb._numeric_columns
+
+
+def test_query_entities_by_component_value_follows_changes():
+    ecdb = _create_sample_ecdb()
+    room, orc = Entity(unique_id=0), Entity(unique_id=1)
+
+    def query_types(*entity_types):
+        return query_entities_by_component_value(ecdb=ecdb, component_type=TypeComponent, values=entity_types)
+
+    assert query_types(TypeEnum.Orc) == [orc]
+    assert query_types(TypeEnum.Orc, TypeEnum.Room) == [room, orc]
+
+    ecdb = add_component(ecdb=ecdb, entity=orc, component=TypeComponent(entity_type=TypeEnum.Hobgoblin))
+    assert query_types(TypeEnum.Orc) == []
+    assert query_types(TypeEnum.Hobgoblin) == [orc]
+
+    ecdb = remove_component(ecdb=ecdb, entity=room, component_type=TypeComponent)
+    assert query_types(TypeEnum.Room) == []
+
+    ecdb = remove_entity(ecdb=ecdb, entity=orc)
+    assert query_types(TypeEnum.Hobgoblin) == []
+
+    with pytest.raises(TypeError):
+        query_entities_by_component_value(ecdb=ecdb, component_type=PositionComponent, values=[0])
+
+
+def test_get_unique_entity_and_get_components():
+    ecdb = _create_sample_ecdb()
+    orc = get_unique_entity(ecdb=ecdb, component_type=TypeComponent, value=TypeEnum.Orc)
+    assert orc == Entity(unique_id=1)
+    assert get_components(ecdb=ecdb, entity=orc, component_types=[PositionComponent, SizeComponent]) == (
+        PositionComponent(y_axis=3, x_axis=4),
+        None,
+    )
+
+    ecdb, _ = add_entity(ecdb=ecdb, components=[TypeComponent(entity_type=TypeEnum.Orc)])
+    with pytest.raises(KeyError):
+        get_unique_entity(ecdb=ecdb, component_type=TypeComponent, value=TypeEnum.Orc)
+
+    ecdb = remove_entity(ecdb=ecdb, entity=orc)
+    assert get_unique_entity(ecdb=ecdb, component_type=TypeComponent, value=TypeEnum.Orc) == Entity(unique_id=2)
+
+
+def test_numeric_columns_hold_values_beyond_32_bits():
+    ecdb = _create_sample_ecdb()
+
+    orc = Entity(unique_id=1)
+    ecdb = add_component(ecdb=ecdb, entity=orc, component=MoneyComponent(amount=1 << 40))
+    assert get_component(ecdb=ecdb, entity=orc, component_type=MoneyComponent) == MoneyComponent(amount=1 << 40)
+
+
+def test_add_entity_beyond_initial_capacity():
+    ecdb = create_ecdb()
+    for index in range(5000):
+        ecdb, entity = add_entity(ecdb=ecdb, components=[PositionComponent(y_axis=index, x_axis=-index)])
+    assert get_component(ecdb=ecdb, entity=entity, component_type=PositionComponent) == PositionComponent(
+        y_axis=4999, x_axis=-4999
+    )
+
+
+def test_add_entities_and_add_components():
+    ecdb = _create_sample_ecdb()
+    ecdb, unique_ids = add_entities(ecdb=ecdb, number_of_entities=3)
+    assert unique_ids.tolist() == [2, 3, 4]
+
+    orc, goblin = TypeComponent(entity_type=TypeEnum.Orc), TypeComponent(entity_type=TypeEnum.Hobgoblin)
+    ecdb = add_components(ecdb=ecdb, unique_ids=unique_ids, components=[orc, goblin, orc])
+    assert query_entities_by_component_value(ecdb=ecdb, component_type=TypeComponent, values=[TypeEnum.Orc]) == [
+        Entity(unique_id=1),
+        Entity(unique_id=2),
+        Entity(unique_id=4),
+    ]
+    unique_ids, components = query_components(ecdb=ecdb, component_type=TypeComponent)
+    assert unique_ids.tolist() == [0, 1, 2, 3, 4]
+    assert components[2:] == [orc, goblin, orc]
+
+
+def test_process_systems_runs_systems_in_priority_order():
+    calls = []
+
+    def process_system(*, ecdb, system):
+        calls.append(system)
+        yield system
+
+    def process_action(ecdb, action):
+        calls.append(f"apply {action}")
+        return ecdb
+
+    systems = create_systems()
+    systems = add_system(systems=systems, priority=1, system="second")
+    systems = add_system(systems=systems, priority=0, system="first")
+    process_systems(ecdb=create_ecdb(), systems=systems, process_system=process_system, process_action=process_action)
+
+    assert calls == ["first", "apply first", "second", "apply second"]
@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+
+from rogue.generic.ecs import (
+    Entity,
+    create_ecdb,
+    add_entity,
+    get_component,
+    query,
+)
+from rogue.generic import portable_ecs
+from rogue.generic.portable_ecs import (
+    get_unique_entity,
+    query_entities_by_component_value,
+    add_entities,
+    add_components,
+    get_next_unique_id,
+    add_component_columns,
+)
+from rogue.components import TypeComponent, PositionComponent
+from rogue.types import TypeEnum
+
+
+def _create_ecdb(*, entity_types):
+    ecdb = create_ecdb()
+    for entity_type in entity_types:
+        ecdb, _ = add_entity(ecdb=ecdb, components=[TypeComponent.create_from_attributes(entity_type=entity_type)])
+    return ecdb
+
+
+def test_get_unique_entity_validates_the_entity_found_in_another_database():
+    ecdb = _create_ecdb(entity_types=[TypeEnum.Hero, TypeEnum.Orc])
+    other_ecdb = _create_ecdb(entity_types=[TypeEnum.Orc, TypeEnum.Hero])
+
+    assert get_unique_entity(ecdb=ecdb, component_type=TypeComponent, value=TypeEnum.Hero) == Entity(unique_id=0)
+    assert get_unique_entity(ecdb=other_ecdb, component_type=TypeComponent, value=TypeEnum.Hero) == Entity(unique_id=1)
+    assert get_unique_entity(ecdb=ecdb, component_type=TypeComponent, value=TypeEnum.Hero) == Entity(unique_id=0)
+
+
+def test_get_unique_entity_scans_only_when_the_entity_changes(monkeypatch):
+    number_of_scans = 0
+
+    def counting_query(**kwargs):
+        nonlocal number_of_scans
+        number_of_scans += 1
+        return query(**kwargs)
+
+    monkeypatch.setattr(portable_ecs, "query", counting_query)
+    ecdb = _create_ecdb(entity_types=[TypeEnum.Orc, TypeEnum.Hero])
+    get_unique_entity(ecdb=ecdb, component_type=TypeComponent, value=TypeEnum.Orc)
+    number_of_scans = 0
+
+    # Every version of the database is a new object with the immutable backend
+    for _ in range(3):
+        ecdb = _create_ecdb(entity_types=[TypeEnum.Orc, TypeEnum.Hero])
+        assert get_unique_entity(ecdb=ecdb, component_type=TypeComponent, value=TypeEnum.Orc) == Entity(unique_id=0)
+    assert number_of_scans == 0
+
+    ecdb = _create_ecdb(entity_types=[TypeEnum.Hero, TypeEnum.Orc])
+    assert get_unique_entity(ecdb=ecdb, component_type=TypeComponent, value=TypeEnum.Orc) == Entity(unique_id=1)
+    assert number_of_scans == 1
+
+
+def test_query_entities_by_component_value_scans_the_database():
+    ecdb = _create_ecdb(entity_types=[TypeEnum.Hero, TypeEnum.Orc, TypeEnum.Gold, TypeEnum.Orc])
+
+    entities = query_entities_by_component_value(
+        ecdb=ecdb, component_type=TypeComponent, values=[TypeEnum.Orc, TypeEnum.Gold]
+    )
+
+    assert sorted(entity.unique_id for entity in entities) == [1, 2, 3]
+    with pytest.raises(TypeError):
+        query_entities_by_component_value(ecdb=ecdb, component_type=PositionComponent, values=[0])
+
+
+def test_get_unique_entity_scans_the_database_without_a_cached_entity(monkeypatch):
+    monkeypatch.setattr(portable_ecs, "_UNIQUE_ENTITIES", {})
+    ecdb = _create_ecdb(entity_types=[TypeEnum.Orc, TypeEnum.Hero])
+
+    assert get_unique_entity(ecdb=ecdb, component_type=TypeComponent, value=TypeEnum.Hero) == Entity(unique_id=1)
+    with pytest.raises(KeyError):
+        get_unique_entity(ecdb=ecdb, component_type=TypeComponent, value=TypeEnum.Gold)
+
+
+def test_bulk_operations_add_every_entity_and_component():
+    ecdb = _create_ecdb(entity_types=[TypeEnum.Hero])
+
+    ecdb, unique_ids = add_entities(ecdb=ecdb, number_of_entities=3)
+    ecdb = add_components(
+        ecdb=ecdb,
+        unique_ids=unique_ids,
+        components=[TypeComponent.create_from_attributes(entity_type=TypeEnum.Gold) for _ in unique_ids],
+    )
+    ecdb = add_component_columns(
+        ecdb=ecdb,
+        unique_ids=unique_ids[1:],
+        component_type=PositionComponent,
+        columns={"y_axis": np.array([1, 2]), "x_axis": np.array([3, 4])},
+    )
+
+    assert unique_ids.tolist() == [1, 2, 3]
+    for unique_id in unique_ids.tolist():
+        type_component = get_component(ecdb=ecdb, entity=Entity(unique_id=unique_id), component_type=TypeComponent)
+        assert type_component.entity_type == TypeEnum.Gold
+    position = get_component(ecdb=ecdb, entity=Entity(unique_id=3), component_type=PositionComponent)
+    assert (position.y_axis, position.x_axis) == (2, 4)
+    _, entity = add_entity(ecdb=ecdb, components=[])
+    assert entity == Entity(unique_id=4)
+
+
+def test_get_next_unique_id_is_the_id_of_the_next_entity():
+    ecdb = _create_ecdb(entity_types=[TypeEnum.Hero, TypeEnum.Orc])
+
+    next_unique_id = get_next_unique_id(ecdb=ecdb)
+
+    assert next_unique_id >= 2
+    _, entity = add_entity(ecdb=ecdb, components=[])
+    assert entity.unique_id == next_unique_id
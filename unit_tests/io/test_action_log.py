@@ -0,0 +1,29 @@
+import numpy as np
+
+from rogue.io.action_log import ActionLogRecorder, ActionLogReplayer
+from rogue.io.checksums import compute_ecdb_checksums
+from rogue.io.generators import generate_room_config
+from rogue.simulation import World
+from rogue.types import HeroCommandEnum
+
+
+def test_replayer_reconstructs_every_tick(tmp_path) -> None:
+    world = World(room_config=generate_room_config(number_of_rooms=3, seed=0), seed=0, max_episode_ticks=100)
+    log_file_name = tmp_path / "actions.log"
+    commands = np.random.default_rng(0).integers(0, len(HeroCommandEnum), size=30)
+
+    checksums = [compute_ecdb_checksums(ecdb=world.ecdb)]
+    with open(log_file_name, "wb") as log_file:
+        recorder = ActionLogRecorder(output_file=log_file, ecdb=world.ecdb, keyframe_interval=8)
+        world.process_action = recorder.wrap_process_action(world.process_action)
+        for command in commands:
+            world.step(command=HeroCommandEnum(command))
+            recorder.end_tick(ecdb=world.ecdb)
+            checksums.append(compute_ecdb_checksums(ecdb=world.ecdb))
+
+    with ActionLogReplayer(input_file_name=log_file_name) as replayer:
+        assert replayer.number_of_ticks == len(commands)
+        for tick in (len(commands), 17, 8, 0, 3):
+            assert compute_ecdb_checksums(ecdb=replayer.seek(tick=tick)) == checksums[tick]
+        for tick, ecdb in replayer.replay(start_tick=5):
+            assert compute_ecdb_checksums(ecdb=ecdb) == checksums[tick]
@@ -0,0 +1,51 @@
+import importlib.util
+import os
+import pathlib
+import shutil
+
+from rogue.io import loaders
+from rogue.io.checksums import compute_ecdb_checksums
+from rogue.io.level_cache import LevelCache, compute_level_key
+from rogue.io.loaders import load_rogue_ecdb_from_input_yaml
+
+
+def test_level_cache_is_filled_on_a_miss(tmp_path) -> None:
+    input_file_name = tmp_path / "room_config.yaml"
+    shutil.copy(pathlib.Path("configs") / "sample_room_config.yaml", input_file_name)
+    level_cache = LevelCache(directory=tmp_path / "levels")
+    key = compute_level_key(input_file_name=input_file_name)
+
+    ecdb = load_rogue_ecdb_from_input_yaml(input_file_name, level_cache=level_cache)
+    level_cache.wait()
+    cached_ecdb = level_cache.load(key=key)
+    assert cached_ecdb is not None
+    assert compute_ecdb_checksums(ecdb=cached_ecdb) == compute_ecdb_checksums(ecdb=ecdb)
+
+    with open(input_file_name, "a") as input_file:
+        input_file.write("# edited\n")
+    assert compute_level_key(input_file_name=input_file_name) != key
+
+
+def test_level_cache_evicts_least_recently_used_levels(tmp_path) -> None:
+    level_cache = LevelCache(directory=tmp_path, max_size=20)
+    for index, key in enumerate(["a", "b", "c"]):
+        file_name = level_cache.get_file_name(key=key)
+        file_name.write_bytes(bytes(10))
+        os.utime(file_name, (index, index))
+
+    level_cache.evict()
+
+    assert sorted(file_name.name for file_name in tmp_path.iterdir()) == ["b.snap", "c.snap"]
+
+
+def test_level_key_changes_with_the_code_of_the_loaders(tmp_path, monkeypatch) -> None:
+    input_file_name = pathlib.Path("configs") / "sample_room_config.yaml"
+    key = compute_level_key(input_file_name=input_file_name)
+
+    loaders_file_name = tmp_path / "loaders.py"
+    shutil.copy(loaders.__file__, loaders_file_name)
+    with open(loaders_file_name, "a") as loaders_file:
+        loaders_file.write("# edited\n")
+    edited_spec = importlib.util.spec_from_file_location(loaders.__name__, loaders_file_name)
+    monkeypatch.setattr(loaders, "__spec__", edited_spec)
+    assert compute_level_key(input_file_name=input_file_name) != key
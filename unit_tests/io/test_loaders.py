@@ -1,10 +1,12 @@
 import pathlib
 
+import pytest
 from pyrsistent import pmap
 
 from rogue.generic.ecs import (
-    EntityComponentDatabase,
     Entity,
+    create_ecdb,
+    add_entity,
 )
 from rogue.components import (
     PositionComponent,
@@ -16,117 +18,137 @@ from rogue.components import (
     InventoryComponent,
     EquipmentComponent,
 )
-from rogue.io.loaders import load_rogue_ecdb_from_input_yaml
+from rogue.io.checksums import compute_ecdb_checksums
+from rogue.io.loaders import (
+    iterate_room_config,
+    load_room_config,
+    load_rogue_ecdb_from_input_yaml,
+    load_rogue_ecdb_from_room_config,
+)
 from rogue.types import TypeEnum
 
 
 def test_load_rogue_ecdb_from_input_yaml(input_file_name=pathlib.Path("configs") / "sample_room_config.yaml",):
-    expected_ecdb = EntityComponentDatabase(
-        _last_unique_id=13,
-        _entities=pmap(
-            {
-                Entity(unique_id=0): pmap(
-                    {
-                        PositionComponent: PositionComponent.create_from_attributes(y_axis=15, x_axis=20),
-                        SizeComponent: SizeComponent.create_from_attributes(height=10, width=20),
-                        TypeComponent: TypeComponent.create_from_attributes(entity_type=TypeEnum.Room),
-                    }
-                ),
-                Entity(unique_id=1): pmap(
-                    {
-                        TypeComponent: TypeComponent.create_from_attributes(entity_type=TypeEnum.Sword),
-                        PositionComponent: PositionComponent.create_from_attributes(y_axis=16, x_axis=23),
-                    }
-                ),
-                Entity(unique_id=2): pmap(
-                    {
-                        TypeComponent: TypeComponent.create_from_attributes(entity_type=TypeEnum.Hobgoblin),
-                        PositionComponent: PositionComponent.create_from_attributes(y_axis=18, x_axis=25),
-                        VelocityComponent: VelocityComponent.create_from_attributes(y_axis=0, x_axis=0),
-                        HealthComponent: HealthComponent.create_from_attributes(amount=100),
-                        InventoryComponent: InventoryComponent.create_from_attributes(entities=[]),
-                        EquipmentComponent: EquipmentComponent.create_from_attributes(entities=[]),
-                    }
-                ),
-                Entity(unique_id=3): pmap(
-                    {
-                        TypeComponent: TypeComponent.create_from_attributes(entity_type=TypeEnum.Hero),
-                        PositionComponent: PositionComponent.create_from_attributes(y_axis=22, x_axis=28),
-                        VelocityComponent: VelocityComponent.create_from_attributes(y_axis=0, x_axis=0),
-                        HealthComponent: HealthComponent.create_from_attributes(amount=100),
-                        MoneyComponent: MoneyComponent.create_from_attributes(amount=0),
-                        InventoryComponent: InventoryComponent.create_from_attributes(entities=[]),
-                        EquipmentComponent: EquipmentComponent.create_from_attributes(entities=[]),
-                    }
-                ),
-                Entity(unique_id=4): pmap(
-                    {
-                        TypeComponent: TypeComponent.create_from_attributes(entity_type=TypeEnum.Potion),
-                        PositionComponent: PositionComponent.create_from_attributes(y_axis=21, x_axis=24),
-                        HealthComponent: HealthComponent.create_from_attributes(amount=50),
-                    }
-                ),
-                Entity(unique_id=5): pmap(
-                    {
-                        TypeComponent: TypeComponent.create_from_attributes(entity_type=TypeEnum.Gold),
-                        PositionComponent: PositionComponent.create_from_attributes(y_axis=20, x_axis=23),
-                        MoneyComponent: MoneyComponent.create_from_attributes(amount=50),
-                    }
-                ),
-                Entity(unique_id=6): pmap(
-                    {
-                        TypeComponent: TypeComponent.create_from_attributes(entity_type=TypeEnum.Door),
-                        PositionComponent: PositionComponent.create_from_attributes(y_axis=15, x_axis=28),
-                    }
-                ),
-                Entity(unique_id=7): pmap(
-                    {
-                        TypeComponent: TypeComponent.create_from_attributes(entity_type=TypeEnum.Door),
-                        PositionComponent: PositionComponent.create_from_attributes(y_axis=25, x_axis=39),
-                    }
-                ),
-                Entity(unique_id=8): pmap(
-                    {
-                        TypeComponent: TypeComponent.create_from_attributes(entity_type=TypeEnum.Dagger),
-                        PositionComponent: PositionComponent.create_from_attributes(y_axis=24, x_axis=35),
-                    }
-                ),
-                Entity(unique_id=9): pmap(
-                    {
-                        TypeComponent: TypeComponent.create_from_attributes(entity_type=TypeEnum.Mace),
-                        PositionComponent: PositionComponent.create_from_attributes(y_axis=24, x_axis=22),
-                    }
-                ),
-                Entity(unique_id=10): pmap(
-                    {
-                        TypeComponent: TypeComponent.create_from_attributes(entity_type=TypeEnum.DoubleSword),
-                        PositionComponent: PositionComponent.create_from_attributes(y_axis=24, x_axis=30),
-                    }
-                ),
-                Entity(unique_id=11): pmap(
-                    {
-                        TypeComponent: TypeComponent.create_from_attributes(entity_type=TypeEnum.IceMonster),
-                        PositionComponent: PositionComponent.create_from_attributes(y_axis=21, x_axis=32),
-                        VelocityComponent: VelocityComponent.create_from_attributes(y_axis=0, x_axis=0),
-                        HealthComponent: HealthComponent.create_from_attributes(amount=100),
-                        InventoryComponent: InventoryComponent.create_from_attributes(entities=[]),
-                        EquipmentComponent: EquipmentComponent.create_from_attributes(entities=[]),
-                    }
-                ),
-                Entity(unique_id=12): pmap(
-                    {
-                        TypeComponent: TypeComponent.create_from_attributes(entity_type=TypeEnum.Orc),
-                        PositionComponent: PositionComponent.create_from_attributes(y_axis=17, x_axis=34),
-                        VelocityComponent: VelocityComponent.create_from_attributes(y_axis=0, x_axis=0),
-                        HealthComponent: HealthComponent.create_from_attributes(amount=100),
-                        InventoryComponent: InventoryComponent.create_from_attributes(entities=[]),
-                        EquipmentComponent: EquipmentComponent.create_from_attributes(entities=[]),
-                    }
-                ),
-            }
-        ),
+    # The components of the entities, in the order of their ids
+    expected_entities = pmap(
+        {
+            Entity(unique_id=0): pmap(
+                {
+                    PositionComponent: PositionComponent.create_from_attributes(y_axis=15, x_axis=20),
+                    SizeComponent: SizeComponent.create_from_attributes(height=10, width=20),
+                    TypeComponent: TypeComponent.create_from_attributes(entity_type=TypeEnum.Room),
+                }
+            ),
+            Entity(unique_id=1): pmap(
+                {
+                    TypeComponent: TypeComponent.create_from_attributes(entity_type=TypeEnum.Sword),
+                    PositionComponent: PositionComponent.create_from_attributes(y_axis=16, x_axis=23),
+                }
+            ),
+            Entity(unique_id=2): pmap(
+                {
+                    TypeComponent: TypeComponent.create_from_attributes(entity_type=TypeEnum.Hobgoblin),
+                    PositionComponent: PositionComponent.create_from_attributes(y_axis=18, x_axis=25),
+                    VelocityComponent: VelocityComponent.create_from_attributes(y_axis=0, x_axis=0),
+                    HealthComponent: HealthComponent.create_from_attributes(amount=100),
+                    InventoryComponent: InventoryComponent.create_from_attributes(entities=[]),
+                    EquipmentComponent: EquipmentComponent.create_from_attributes(entities=[]),
+                }
+            ),
+            Entity(unique_id=3): pmap(
+                {
+                    TypeComponent: TypeComponent.create_from_attributes(entity_type=TypeEnum.Hero),
+                    PositionComponent: PositionComponent.create_from_attributes(y_axis=22, x_axis=28),
+                    VelocityComponent: VelocityComponent.create_from_attributes(y_axis=0, x_axis=0),
+                    HealthComponent: HealthComponent.create_from_attributes(amount=100),
+                    MoneyComponent: MoneyComponent.create_from_attributes(amount=0),
+                    InventoryComponent: InventoryComponent.create_from_attributes(entities=[]),
+                    EquipmentComponent: EquipmentComponent.create_from_attributes(entities=[]),
+                }
+            ),
+            Entity(unique_id=4): pmap(
+                {
+                    TypeComponent: TypeComponent.create_from_attributes(entity_type=TypeEnum.Potion),
+                    PositionComponent: PositionComponent.create_from_attributes(y_axis=21, x_axis=24),
+                    HealthComponent: HealthComponent.create_from_attributes(amount=50),
+                }
+            ),
+            Entity(unique_id=5): pmap(
+                {
+                    TypeComponent: TypeComponent.create_from_attributes(entity_type=TypeEnum.Gold),
+                    PositionComponent: PositionComponent.create_from_attributes(y_axis=20, x_axis=23),
+                    MoneyComponent: MoneyComponent.create_from_attributes(amount=50),
+                }
+            ),
+            Entity(unique_id=6): pmap(
+                {
+                    TypeComponent: TypeComponent.create_from_attributes(entity_type=TypeEnum.Door),
+                    PositionComponent: PositionComponent.create_from_attributes(y_axis=15, x_axis=28),
+                }
+            ),
+            Entity(unique_id=7): pmap(
+                {
+                    TypeComponent: TypeComponent.create_from_attributes(entity_type=TypeEnum.Door),
+                    PositionComponent: PositionComponent.create_from_attributes(y_axis=25, x_axis=39),
+                }
+            ),
+            Entity(unique_id=8): pmap(
+                {
+                    TypeComponent: TypeComponent.create_from_attributes(entity_type=TypeEnum.Dagger),
+                    PositionComponent: PositionComponent.create_from_attributes(y_axis=24, x_axis=35),
+                }
+            ),
+            Entity(unique_id=9): pmap(
+                {
+                    TypeComponent: TypeComponent.create_from_attributes(entity_type=TypeEnum.Mace),
+                    PositionComponent: PositionComponent.create_from_attributes(y_axis=24, x_axis=22),
+                }
+            ),
+            Entity(unique_id=10): pmap(
+                {
+                    TypeComponent: TypeComponent.create_from_attributes(entity_type=TypeEnum.DoubleSword),
+                    PositionComponent: PositionComponent.create_from_attributes(y_axis=24, x_axis=30),
+                }
+            ),
+            Entity(unique_id=11): pmap(
+                {
+                    TypeComponent: TypeComponent.create_from_attributes(entity_type=TypeEnum.IceMonster),
+                    PositionComponent: PositionComponent.create_from_attributes(y_axis=21, x_axis=32),
+                    VelocityComponent: VelocityComponent.create_from_attributes(y_axis=0, x_axis=0),
+                    HealthComponent: HealthComponent.create_from_attributes(amount=100),
+                    InventoryComponent: InventoryComponent.create_from_attributes(entities=[]),
+                    EquipmentComponent: EquipmentComponent.create_from_attributes(entities=[]),
+                }
+            ),
+            Entity(unique_id=12): pmap(
+                {
+                    TypeComponent: TypeComponent.create_from_attributes(entity_type=TypeEnum.Orc),
+                    PositionComponent: PositionComponent.create_from_attributes(y_axis=17, x_axis=34),
+                    VelocityComponent: VelocityComponent.create_from_attributes(y_axis=0, x_axis=0),
+                    HealthComponent: HealthComponent.create_from_attributes(amount=100),
+                    InventoryComponent: InventoryComponent.create_from_attributes(entities=[]),
+                    EquipmentComponent: EquipmentComponent.create_from_attributes(entities=[]),
+                }
+            ),
+        }
     )
+    expected_ecdb = create_ecdb()
+    for _, components in sorted(expected_entities.items(), key=lambda item: item[0].unique_id):
+        expected_ecdb, _ = add_entity(ecdb=expected_ecdb, components=list(components.values()))
 
     ecdb = load_rogue_ecdb_from_input_yaml(input_file_name)
 
-    assert ecdb == expected_ecdb
+    # The databases of the backends are compared by content
+    assert compute_ecdb_checksums(ecdb=ecdb) == compute_ecdb_checksums(ecdb=expected_ecdb)
+
+
+def test_iterate_room_config(input_file_name=pathlib.Path("configs") / "sample_room_config.yaml"):
+    assert list(iterate_room_config(input_file_name=input_file_name)) == load_room_config(
+        input_file_name=input_file_name
+    )
+
+
+def test_load_rogue_ecdb_from_room_config_rejects_items_outside_of_their_room():
+    room_config = [{"coordinates": "0, 0", "size": "5, 5", "items": [{"type": "Sword", "coordinates": "5, 2"}]}]
+    with pytest.raises(ValueError):
+        load_rogue_ecdb_from_room_config(room_config)
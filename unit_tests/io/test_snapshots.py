@@ -0,0 +1,37 @@
+import pyrsistent
+
+from rogue.components import InventoryComponent
+from rogue.generic.ecs import Entity, add_entity, add_component, remove_entity
+from rogue.io.checksums import compute_ecdb_checksums
+from rogue.io.generators import generate_room_config
+from rogue.io.loaders import load_rogue_ecdb_from_room_config
+from rogue.io.snapshots import load_ecdb, save_ecdb
+
+
+def test_load_ecdb_restores_saved_ecdb(tmp_path) -> None:
+    ecdb = load_rogue_ecdb_from_room_config(generate_room_config(number_of_rooms=3, seed=0))
+    ecdb = remove_entity(ecdb=ecdb, entity=Entity(unique_id=5))
+    ecdb = add_component(
+        ecdb=ecdb,
+        entity=Entity(unique_id=0),
+        component=InventoryComponent(entities=pyrsistent.pset([Entity(unique_id=3), Entity(unique_id=7)])),
+    )
+    snapshot_file_name = tmp_path / "world.snap"
+
+    save_ecdb(ecdb=ecdb, output_file_name=snapshot_file_name)
+    loaded_ecdb = load_ecdb(input_file_name=snapshot_file_name)
+
+    assert compute_ecdb_checksums(ecdb=loaded_ecdb) == compute_ecdb_checksums(ecdb=ecdb)
+
+
+def test_load_ecdb_does_not_reuse_the_ids_of_removed_entities(tmp_path) -> None:
+    ecdb = load_rogue_ecdb_from_room_config(generate_room_config(number_of_rooms=3, seed=0))
+    ecdb, last_entity = add_entity(ecdb=ecdb, components=[])
+    ecdb = remove_entity(ecdb=ecdb, entity=last_entity)
+    snapshot_file_name = tmp_path / "world.snap"
+
+    save_ecdb(ecdb=ecdb, output_file_name=snapshot_file_name)
+    loaded_ecdb = load_ecdb(input_file_name=snapshot_file_name)
+
+    _, entity = add_entity(ecdb=loaded_ecdb, components=[])
+    assert entity.unique_id == last_entity.unique_id + 1
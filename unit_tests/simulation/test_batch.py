@@ -0,0 +1,25 @@
+import numpy as np
+
+from rogue.io.generators import generate_room_config
+from rogue.simulation import BatchSimulation
+from rogue.types import HeroCommandEnum
+
+
+def test_batch_simulation_does_not_depend_on_the_number_of_processes() -> None:
+    room_config = generate_room_config(number_of_rooms=2, seed=0)
+    rng = np.random.default_rng(0)
+    all_commands = rng.integers(0, len(HeroCommandEnum), size=(30, 5))
+
+    results = []
+    for number_of_processes in (0, 2):
+        with BatchSimulation(
+            room_config=room_config, number_of_worlds=5, number_of_processes=number_of_processes, max_episode_ticks=10
+        ) as batch_simulation:
+            results.append([batch_simulation.step(commands=commands) for commands in all_commands])
+
+    for result, other_result in zip(*results):
+        np.testing.assert_array_equal(result.rewards, other_result.rewards)
+        np.testing.assert_array_equal(result.dones, other_result.dones)
+        np.testing.assert_array_equal(result.episode_returns, other_result.episode_returns)
+    # Every episode ends after 10 ticks and the worlds restart
+    assert all(result.dones.all() for result in results[0][9::10])
@@ -0,0 +1,52 @@
+import numpy as np
+
+from rogue.generic.ecs import query
+from rogue.components import PositionComponent, TypeComponent
+from rogue.io.generators import generate_room_config
+from rogue.simulation import RogueEnvironment, TYPE_TO_CODE
+from rogue.simulation.environment import STATIC_TYPES, render_static_grid
+
+
+def _render_grid(*, environment: RogueEnvironment) -> np.ndarray:
+    grid = np.zeros(environment.grid_shape, dtype=np.uint8)
+    render_static_grid(ecdb=environment.world.ecdb, grid=grid)
+    entities = query(ecdb=environment.world.ecdb, component_types=[PositionComponent, TypeComponent])
+    for _, (position_component, type_component) in sorted(entities, key=lambda entity: entity[0].unique_id):
+        if type_component.entity_type not in STATIC_TYPES:
+            grid[position_component.y_axis, position_component.x_axis] = TYPE_TO_CODE[type_component.entity_type]
+    return grid
+
+
+def test_environment_updates_the_observation_in_place() -> None:
+    environment = RogueEnvironment(room_config=generate_room_config(number_of_rooms=2, seed=0), max_episode_ticks=50)
+    observation, _ = environment.reset(seed=0)
+    grid, hero_stats = observation["grid"], observation["hero"]
+    np.testing.assert_array_equal(grid, _render_grid(environment=environment))
+
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        observation, _, terminated, truncated, _ = environment.step(int(rng.integers(0, 7)))
+        assert observation["grid"] is grid and observation["hero"] is hero_stats
+        np.testing.assert_array_equal(grid, _render_grid(environment=environment))
+        if terminated or truncated:
+            environment.reset()
+
+
+def test_environment_reset_with_a_seed_is_reproducible() -> None:
+    environment = RogueEnvironment(room_config=generate_room_config(number_of_rooms=2, seed=0), max_episode_ticks=50)
+    actions = np.random.default_rng(0).integers(0, 7, size=30).tolist()
+
+    episodes = []
+    for _ in range(2):
+        observation, _ = environment.reset(seed=1)
+        observations = [(observation["grid"].copy(), observation["hero"].copy())]
+        for action in actions:
+            observation, _, _, _, _ = environment.step(action)
+            observations.append((observation["grid"].copy(), observation["hero"].copy()))
+        episodes.append(observations)
+
+    for (grid, hero_stats), (other_grid, other_hero_stats) in zip(*episodes):
+        np.testing.assert_array_equal(grid, other_grid)
+        np.testing.assert_array_equal(hero_stats, other_hero_stats)
+    # The enemies moved
+    assert not all(np.array_equal(grid, episodes[0][0][0]) for grid, _ in episodes[0])
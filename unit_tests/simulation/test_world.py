@@ -0,0 +1,23 @@
+import random
+
+from rogue.io.checksums import compute_ecdb_checksums
+from rogue.io.generators import generate_room_config
+from rogue.simulation import World
+from rogue.types import HeroCommandEnum
+
+
+def test_world_does_not_depend_on_the_global_random_state() -> None:
+    room_config = generate_room_config(number_of_rooms=2, seed=0)
+
+    checksums = []
+    for random_seed in (0, 1):
+        random.seed(random_seed)
+        world = World(room_config=room_config, seed=0)
+        initial_checksums = compute_ecdb_checksums(ecdb=world.ecdb)
+        for _ in range(20):
+            world.step(command=HeroCommandEnum.Wait)
+        checksums.append(compute_ecdb_checksums(ecdb=world.ecdb))
+
+    assert checksums[0] == checksums[1]
+    # The enemies moved
+    assert checksums[0]["PositionComponent"] != initial_checksums["PositionComponent"]
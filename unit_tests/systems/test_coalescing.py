@@ -0,0 +1,103 @@
+import numpy as np
+
+from rogue.generic.ecs import create_ecdb, add_entity
+from rogue.components import PositionComponent, TypeComponent
+from rogue.systems.common.actions import (
+    AddComponentAction,
+    AddComponentColumnsAction,
+    RemoveEntityAction,
+)
+from rogue.systems.common.coalescing import ActionCoalescer
+from rogue.types import TypeEnum
+
+
+def _create_ecdb():
+    ecdb = create_ecdb()
+    ecdb, orc = add_entity(
+        ecdb=ecdb,
+        components=[
+            PositionComponent.create_from_attributes(y_axis=0, x_axis=0),
+            TypeComponent.create_from_attributes(entity_type=TypeEnum.Orc),
+        ],
+    )
+    ecdb, goblin = add_entity(
+        ecdb=ecdb,
+        components=[
+            PositionComponent.create_from_attributes(y_axis=1, x_axis=1),
+            TypeComponent.create_from_attributes(entity_type=TypeEnum.Hobgoblin),
+        ],
+    )
+    return ecdb, orc, goblin
+
+
+def _create_move_columns_action(*, entity, y_axis, x_axis):
+    return AddComponentColumnsAction(
+        unique_ids=np.array([entity.unique_id]),
+        component_type=PositionComponent,
+        columns={"y_axis": np.array([y_axis]), "x_axis": np.array([x_axis])},
+    )
+
+
+def test_coalesce_keeps_writes_before_columns_before_them():
+    ecdb, orc, _ = _create_ecdb()
+    write = AddComponentAction(entity=orc, component=PositionComponent.create_from_attributes(y_axis=2, x_axis=2))
+    columns_action = _create_move_columns_action(entity=orc, y_axis=3, x_axis=3)
+
+    actions = ActionCoalescer().coalesce(ecdb=ecdb, actions=[write, columns_action])
+
+    assert actions == [write, columns_action]
+
+
+def test_coalesce_keeps_writes_after_columns_even_if_identical_to_the_ecdb():
+    ecdb, orc, _ = _create_ecdb()
+    columns_action = _create_move_columns_action(entity=orc, y_axis=3, x_axis=3)
+    # Identical to the position in the ECDB, but not to the one set by the columns
+    write = AddComponentAction(entity=orc, component=PositionComponent.create_from_attributes(y_axis=0, x_axis=0))
+
+    actions = ActionCoalescer().coalesce(ecdb=ecdb, actions=[columns_action, write])
+
+    assert actions == [columns_action, write]
+
+
+def test_coalesce_keeps_writes_before_a_removed_entity_before_it():
+    ecdb, orc, goblin = _create_ecdb()
+    write = AddComponentAction(entity=orc, component=PositionComponent.create_from_attributes(y_axis=2, x_axis=2))
+    remove_action = RemoveEntityAction(entity=goblin)
+
+    actions = ActionCoalescer().coalesce(ecdb=ecdb, actions=[write, remove_action])
+
+    assert actions == [write, remove_action]
+
+
+def test_coalesce_keeps_writes_after_a_removed_entity_after_it():
+    ecdb, orc, goblin = _create_ecdb()
+    remove_action = RemoveEntityAction(entity=goblin)
+    write = AddComponentAction(entity=orc, component=PositionComponent.create_from_attributes(y_axis=2, x_axis=2))
+    identical_write = AddComponentAction(
+        entity=goblin, component=PositionComponent.create_from_attributes(y_axis=1, x_axis=1)
+    )
+
+    actions = ActionCoalescer().coalesce(ecdb=ecdb, actions=[remove_action, write, identical_write])
+
+    # The write to the removed entity is kept, applying it reports the error
+    assert actions == [remove_action, write, identical_write]
+
+
+def test_coalesce_drops_overwritten_identical_and_removed_writes():
+    ecdb, orc, goblin = _create_ecdb()
+    coalescer = ActionCoalescer()
+
+    actions = coalescer.coalesce(
+        ecdb=ecdb,
+        actions=[
+            AddComponentAction(entity=orc, component=PositionComponent.create_from_attributes(y_axis=5, x_axis=5)),
+            AddComponentAction(entity=orc, component=PositionComponent.create_from_attributes(y_axis=0, x_axis=0)),
+            AddComponentAction(entity=goblin, component=PositionComponent.create_from_attributes(y_axis=2, x_axis=2)),
+            RemoveEntityAction(entity=goblin),
+        ],
+    )
+
+    assert actions == [RemoveEntityAction(entity=goblin)]
+    assert coalescer.number_of_overwritten_actions == 1
+    assert coalescer.number_of_identical_actions == 1
+    assert coalescer.number_of_actions_on_removed_entities == 1
@@ -0,0 +1,53 @@
+from rogue.generic.ecs import create_ecdb, add_entity
+from rogue.components import (
+    PositionComponent,
+    VelocityComponent,
+    SizeComponent,
+    TypeComponent,
+    InventoryComponent,
+)
+from rogue.systems import CollisionDetectionSystem
+from rogue.systems.common.actions import RemoveEntityAction
+from rogue.types import TypeEnum
+
+
+def test_enemy_defeated_earlier_in_the_tick_does_not_move() -> None:
+    ecdb = create_ecdb()
+    ecdb, _ = add_entity(
+        ecdb=ecdb,
+        components=[
+            PositionComponent.create_from_attributes(y_axis=0, x_axis=0),
+            SizeComponent.create_from_attributes(height=10, width=10),
+            TypeComponent.create_from_attributes(entity_type=TypeEnum.Room),
+        ],
+    )
+    ecdb, hero = add_entity(
+        ecdb=ecdb,
+        components=[
+            PositionComponent.create_from_attributes(y_axis=5, x_axis=3),
+            VelocityComponent.create_from_attributes(y_axis=0, x_axis=1),
+            TypeComponent.create_from_attributes(entity_type=TypeEnum.Hero),
+            InventoryComponent.create_from_attributes(entities=[]),
+        ],
+    )
+    # The enemy moves onto the sword, but the hero, resolved first, defeats it
+    ecdb, enemy = add_entity(
+        ecdb=ecdb,
+        components=[
+            PositionComponent.create_from_attributes(y_axis=5, x_axis=4),
+            VelocityComponent.create_from_attributes(y_axis=0, x_axis=1),
+            TypeComponent.create_from_attributes(entity_type=TypeEnum.Orc),
+            InventoryComponent.create_from_attributes(entities=[]),
+        ],
+    )
+    ecdb, _ = add_entity(
+        ecdb=ecdb,
+        components=[
+            PositionComponent.create_from_attributes(y_axis=5, x_axis=5),
+            TypeComponent.create_from_attributes(entity_type=TypeEnum.Sword),
+        ],
+    )
+
+    actions = list(CollisionDetectionSystem.create()(ecdb=ecdb))
+
+    assert actions == [RemoveEntityAction(entity=enemy)]
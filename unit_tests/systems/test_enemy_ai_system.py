@@ -0,0 +1,33 @@
+import numpy as np
+
+from rogue.io.generators import generate_room_config
+from rogue.io.loaders import load_rogue_ecdb_from_room_config
+from rogue.systems import process_system, EnemyAISystem
+
+
+class _CountingRng:
+    def __init__(self, *, seed):
+        self.rng = np.random.default_rng(seed)
+        self.number_of_draws = 0
+
+    def integers(self, *args, **kwargs):
+        self.number_of_draws += 1
+        return self.rng.integers(*args, **kwargs)
+
+
+def test_batched_enemy_ai_is_deterministic_with_one_draw_per_tick() -> None:
+    ecdb = load_rogue_ecdb_from_room_config(generate_room_config(number_of_rooms=4, seed=0))
+    rngs = [_CountingRng(seed=7), _CountingRng(seed=7)]
+    systems = [EnemyAISystem(batched=True, rng=rng) for rng in rngs]
+
+    velocities = [[], []]
+    for _ in range(3):
+        for system, system_velocities in zip(systems, velocities):
+            (action,) = process_system(ecdb=ecdb, system=system)
+            assert len(action.unique_ids) > 1
+            system_velocities.append(
+                (action.unique_ids.tolist(), action.columns["y_axis"].tolist(), action.columns["x_axis"].tolist())
+            )
+
+    assert velocities[0] == velocities[1]
+    assert [rng.number_of_draws for rng in rngs] == [3, 3]
@@ -0,0 +1,75 @@
+from typing import ClassVar, FrozenSet, Generator, Type
+
+import attr
+
+from rogue.generic.ecs import Entity, create_ecdb, add_entity, create_systems, add_system, process_systems
+from rogue.components import ComponentUnion, HealthComponent, MoneyComponent
+from rogue.systems import process_system, process_action
+from rogue.systems.common.actions import ActionUnion, AddComponentAction
+from rogue.systems.common.instrumentation import SystemsProfiler
+from rogue.systems.common.scheduling import SystemScheduler
+from rogue.systems.common.system import batch_actions_of_systems
+from rogue.systems.common.traits import YieldChangesSystemTrait
+
+
+@attr.s(frozen=True, kw_only=True)
+class _MoneySystem(YieldChangesSystemTrait):
+    READ_COMPONENT_TYPES: ClassVar[FrozenSet[Type[ComponentUnion]]] = frozenset()
+    WRITTEN_COMPONENT_TYPES: ClassVar[FrozenSet[Type[ComponentUnion]]] = frozenset([MoneyComponent])
+
+    def __call__(self, *, ecdb) -> Generator[ActionUnion, None, None]:
+        for unique_id in range(3):
+            yield AddComponentAction(
+                entity=Entity(unique_id=unique_id), component=MoneyComponent.create_from_attributes(amount=unique_id)
+            )
+
+
+@attr.s(frozen=True, kw_only=True)
+class _HealthSystem(YieldChangesSystemTrait):
+    READ_COMPONENT_TYPES: ClassVar[FrozenSet[Type[ComponentUnion]]] = frozenset()
+    WRITTEN_COMPONENT_TYPES: ClassVar[FrozenSet[Type[ComponentUnion]]] = frozenset([HealthComponent])
+
+    def __call__(self, *, ecdb) -> Generator[ActionUnion, None, None]:
+        for unique_id in range(2):
+            yield AddComponentAction(
+                entity=Entity(unique_id=unique_id), component=HealthComponent.create_from_attributes(amount=unique_id)
+            )
+
+
+def _profile_tick(*, batched: bool, threads: int) -> SystemsProfiler:
+    ecdb = create_ecdb()
+    for _ in range(3):
+        ecdb, _ = add_entity(ecdb=ecdb, components=[])
+    systems = create_systems()
+    systems = add_system(systems=systems, priority=0, system=_MoneySystem())
+    systems = add_system(systems=systems, priority=0, system=_HealthSystem())
+
+    profiler = SystemsProfiler()
+    tick_process_system, tick_process_action = profiler.wrap(
+        process_system=process_system, process_action=process_action
+    )
+    if batched:
+        tick_process_system = batch_actions_of_systems(tick_process_system)
+    if threads > 0:
+        scheduler = SystemScheduler(number_of_threads=threads)
+        scheduler.process_systems(
+            ecdb=ecdb, systems=systems, process_system=tick_process_system, process_action=tick_process_action
+        )
+        scheduler.shutdown()
+    else:
+        process_systems(
+            ecdb=ecdb, systems=systems, process_system=tick_process_system, process_action=tick_process_action
+        )
+    profiler.end_tick()
+    return profiler
+
+
+def test_profiler_counts_the_mutations_of_every_system() -> None:
+    for batched in (False, True):
+        for threads in (0, 2):
+            profiler = _profile_tick(batched=batched, threads=threads)
+
+            (money_statistics,) = profiler.get_statistics(system_name="_MoneySystem")
+            (health_statistics,) = profiler.get_statistics(system_name="_HealthSystem")
+            assert (money_statistics.number_of_actions, money_statistics.number_of_mutations) == (3, 3)
+            assert (health_statistics.number_of_actions, health_statistics.number_of_mutations) == (2, 2)
@@ -0,0 +1,26 @@
+from rogue.io.checksums import compute_ecdb_checksums
+from rogue.io.generators import generate_room_config
+from rogue.io.loaders import load_rogue_ecdb_from_room_config
+from rogue.systems import process_system, process_action, EnemyAISystem, MovementSystem
+
+
+def _load_moving_ecdb():
+    ecdb = load_rogue_ecdb_from_room_config(generate_room_config(number_of_rooms=4, seed=0))
+    for action in list(process_system(ecdb=ecdb, system=EnemyAISystem.create(batched=True, seed=0))):
+        ecdb = process_action(ecdb, action)
+    return ecdb
+
+
+def test_columnar_movement_moves_like_the_per_entity_movement() -> None:
+    column_ecdb = _load_moving_ecdb()
+    entity_ecdb = _load_moving_ecdb()
+    checksums = compute_ecdb_checksums(ecdb=column_ecdb)
+
+    for action in list(MovementSystem._move_columns(ecdb=column_ecdb)):
+        column_ecdb = process_action(column_ecdb, action)
+    for action in list(MovementSystem._move_entities(ecdb=entity_ecdb)):
+        entity_ecdb = process_action(entity_ecdb, action)
+
+    column_checksums = compute_ecdb_checksums(ecdb=column_ecdb)
+    assert column_checksums["PositionComponent"] != checksums["PositionComponent"]
+    assert column_checksums == compute_ecdb_checksums(ecdb=entity_ecdb)
@@ -0,0 +1,47 @@
+import pytest
+
+from rogue.io.loaders import load_rogue_ecdb_from_room_config
+from rogue.components import PositionComponent
+from rogue.systems import process_action, PygcurseRenderSystem
+from rogue.systems.common.actions import AddComponentAction
+from rogue.generic.ecs import Entity
+
+pytest.importorskip("pygcurse")
+
+
+def _get_chars(render_system):
+    window = render_system.window
+    return [[window.getchar(x_axis, y_axis) for x_axis in range(window.width)] for y_axis in range(window.height)]
+
+
+def test_pygcurse_render_system_draws_overlapping_entities_in_the_same_order_when_tracking_changes(monkeypatch):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    room_config = [
+        {
+            "coordinates": "0, 0",
+            "size": "10, 10",
+            "items": [
+                {"type": "Hero", "coordinates": "2, 2"},
+                {"type": "Gold", "coordinates": "5, 5", "amount": 10},
+                {"type": "Sword", "coordinates": "5, 5"},
+            ],
+        }
+    ]
+    ecdb = load_rogue_ecdb_from_room_config(room_config)
+    sword = Entity(unique_id=3)
+
+    render_system = PygcurseRenderSystem.create_from_height_and_width(height=20, width=40, track_changes=True)
+    tracked_process_action = render_system.change_tracker.wrap_process_action(process_action)
+    render_system(ecdb=ecdb)
+    assert render_system.window.getchar(5, 5) == "S"
+
+    # Move the sword away from the gold and back
+    for y_axis in [6, 5]:
+        action = AddComponentAction(entity=sword, component=PositionComponent(y_axis=y_axis, x_axis=5))
+        ecdb = tracked_process_action(ecdb, action)
+        render_system(ecdb=ecdb)
+
+    other_render_system = PygcurseRenderSystem.create_from_height_and_width(height=20, width=40)
+    other_render_system(ecdb=ecdb)
+    assert render_system.window.getchar(5, 5) == "S"
+    assert _get_chars(render_system) == _get_chars(other_render_system)
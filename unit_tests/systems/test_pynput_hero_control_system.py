@@ -0,0 +1,31 @@
+import pytest
+
+from rogue.systems import PynputHeroControlSystem
+from rogue.systems import pynput_hero_control_system
+from rogue.systems.pynput_hero_control_system import KeyboardListener
+
+
+def test_keyboard_listener_keeps_the_latest_keys():
+    listener = KeyboardListener(repeat_interval=None, max_queued_keys=4)
+    for key in range(10):
+        listener._on_press(key)
+
+    keys = []
+    while True:
+        key = listener.get_key(timeout=0.0)
+        if key is None:
+            break
+        keys.append(key)
+    assert keys == [6, 7, 8, 9]
+
+
+@pytest.mark.skipif(pynput_hero_control_system.KEYBOARD_IMPORT_ERROR is not None, reason="pynput can't be imported")
+def test_create_does_not_start_listening():
+    hero_control_system = PynputHeroControlSystem.create()
+    assert hero_control_system.listener._listener is None
+
+
+def test_create_raises_without_pynput(monkeypatch):
+    monkeypatch.setattr(pynput_hero_control_system, "KEYBOARD_IMPORT_ERROR", ImportError("no display"))
+    with pytest.raises(ImportError, match="without pynput: no display"):
+        PynputHeroControlSystem.create()
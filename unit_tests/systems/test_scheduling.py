@@ -0,0 +1,59 @@
+from rogue.generic.ecs import create_systems, add_system, process_systems
+from rogue.io.generators import generate_room_config
+from rogue.io.loaders import load_rogue_ecdb_from_room_config
+from rogue.io.checksums import compute_ecdb_checksums
+from rogue.systems import (
+    process_system,
+    process_action,
+    EnemyAISystem,
+    MovementSystem,
+    CollisionDetectionSystem,
+    PygameHeroControlSystem,
+)
+from rogue.systems.common.scheduling import SystemScheduler, plan_stages
+
+
+def test_plan_stages() -> None:
+    hero_control_system = PygameHeroControlSystem.create()
+    enemy_ai_system = EnemyAISystem.create()
+    movement_system = MovementSystem.create()
+    collision_detection_system = CollisionDetectionSystem.create()
+
+    assert plan_stages(systems=[hero_control_system, enemy_ai_system, movement_system]) == [
+        [hero_control_system, enemy_ai_system],
+        [movement_system],
+    ]
+    assert plan_stages(systems=[enemy_ai_system, collision_detection_system, enemy_ai_system]) == [
+        [enemy_ai_system],
+        [collision_detection_system],
+        [enemy_ai_system],
+    ]
+
+
+def test_scheduler_matches_sequential_processing() -> None:
+    def create_rogue_systems():
+        systems = create_systems()
+        systems = add_system(systems=systems, priority=0, system=EnemyAISystem.create(batched=True, seed=0))
+        systems = add_system(systems=systems, priority=0, system=EnemyAISystem.create(batched=True, seed=1))
+        systems = add_system(systems=systems, priority=1, system=CollisionDetectionSystem.create())
+        systems = add_system(systems=systems, priority=2, system=MovementSystem.create())
+        return systems
+
+    room_config = generate_room_config(number_of_rooms=4, seed=0)
+
+    ecdb = load_rogue_ecdb_from_room_config(room_config)
+    systems = create_rogue_systems()
+    for _ in range(20):
+        ecdb = process_systems(ecdb=ecdb, systems=systems, process_system=process_system, process_action=process_action)
+    expected_checksums = compute_ecdb_checksums(ecdb=ecdb)
+
+    ecdb = load_rogue_ecdb_from_room_config(room_config)
+    systems = create_rogue_systems()
+    scheduler = SystemScheduler(number_of_threads=2)
+    for _ in range(20):
+        ecdb = scheduler.process_systems(
+            ecdb=ecdb, systems=systems, process_system=process_system, process_action=process_action
+        )
+    scheduler.shutdown()
+
+    assert compute_ecdb_checksums(ecdb=ecdb) == expected_checksums
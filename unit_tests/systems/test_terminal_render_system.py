@@ -0,0 +1,57 @@
+import tempfile
+
+from rogue.generic.ecs import create_systems, add_system, process_systems
+from rogue.io.generators import generate_room_config
+from rogue.io.loaders import load_rogue_ecdb_from_room_config
+from rogue.systems import (
+    process_system,
+    process_action,
+    MovementSystem,
+    ScriptedHeroControlSystem,
+    TerminalRenderSystem,
+)
+from rogue.systems.terminal_render_system import CLEAR_SCREEN
+from rogue.types import HeroCommandEnum
+
+
+def test_terminal_render_system_writes_changed_cells() -> None:
+    ecdb = load_rogue_ecdb_from_room_config(generate_room_config(number_of_rooms=2, seed=0))
+    hero_control_system = ScriptedHeroControlSystem.create()
+    systems = create_systems()
+    systems = add_system(systems=systems, priority=0, system=hero_control_system)
+    systems = add_system(systems=systems, priority=1, system=MovementSystem.create())
+
+    with tempfile.TemporaryFile() as output_file, tempfile.TemporaryFile() as other_output_file:
+        render_system = TerminalRenderSystem.create_from_height_and_width(
+            height=60, width=120, track_changes=True, file_descriptor=output_file.fileno()
+        )
+        tracked_process_action = render_system.change_tracker.wrap_process_action(process_action)
+
+        render_system(ecdb=ecdb)
+        first_frame_size = output_file.tell()
+        output_file.seek(0)
+        assert CLEAR_SCREEN in output_file.read().decode()
+
+        # Render a frame without changes
+        render_system(ecdb=ecdb)
+        assert output_file.tell() == first_frame_size
+
+        for command in [HeroCommandEnum.Right, HeroCommandEnum.Down, HeroCommandEnum.Left]:
+            hero_control_system.commands.append(command)
+            ecdb = process_systems(
+                ecdb=ecdb, systems=systems, process_system=process_system, process_action=tracked_process_action
+            )
+            frame_start = output_file.tell()
+            render_system(ecdb=ecdb)
+            output_file.seek(frame_start)
+            frame = output_file.read().decode()
+            assert CLEAR_SCREEN not in frame
+            # The two cells of the hero and the changed hero info at most
+            assert 0 < len(frame) < first_frame_size // 10
+
+        other_render_system = TerminalRenderSystem.create_from_height_and_width(
+            height=60, width=120, file_descriptor=other_output_file.fileno()
+        )
+        other_render_system(ecdb=ecdb)
+        assert (other_render_system.buffers.front.symbols == render_system.buffers.front.symbols).all()
+        assert (other_render_system.buffers.front.colors == render_system.buffers.front.colors).all()